@@ -0,0 +1,53 @@
+"""
+Administrative runtime endpoints
+"""
+from fastapi import APIRouter, Depends
+
+from app.core.password_hashing import password_hasher
+from app.core.principal_cache import principal_cache
+from app.core.security import require_admin
+from app.core.token_cache import token_cache
+from app.db.pool_metrics import pool_metrics
+from app.db.replicas import replica_router
+from app.services.activity_log import activity_recorder
+from app.services.notification_fanout import notification_fanout
+from app.services.notifications import notification_broker
+from app.services.project_queries import project_list_queries
+from app.services.realtime import project_hub
+from app.services.scheduler import scheduler
+from app.services.token_revocation import revocation_list
+from app.services.warmup import warmup
+
+router = APIRouter()
+
+
+@router.get("/stats")
+async def get_runtime_stats(user_id: int = Depends(require_admin)):
+    """In-process cache, queue and connection statistics of this worker"""
+    return {
+        "db_pool": pool_metrics.stats(),
+        "db_replicas": replica_router.stats(),
+        "token_cache": token_cache.stats(),
+        "principal_cache": principal_cache.stats(),
+        "token_revocation": revocation_list.stats(),
+        "password_hashing": password_hasher.stats(),
+        "project_list_statements": project_list_queries.stats(),
+        "activity_log": activity_recorder.stats(),
+        "notification_fanout": notification_fanout.stats(),
+        "notification_streams": notification_broker.stats(),
+        "live_updates": project_hub.stats(),
+        "jobs": scheduler.stats(),
+        "warmup": warmup.stats(),
+    }
+
+
+@router.get("/db-pool")
+async def get_db_pool_stats(user_id: int = Depends(require_admin)):
+    """Connection pool saturation, checkout waits and connection churn"""
+    return pool_metrics.stats()
+
+
+@router.get("/db-replicas")
+async def get_db_replica_stats(user_id: int = Depends(require_admin)):
+    """Replica lag, sessions in use and reads served, plus reads kept on the primary"""
+    return replica_router.stats()
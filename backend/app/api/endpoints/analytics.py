@@ -3,12 +3,15 @@ Analytics endpoints
 """
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, desc
-from typing import List
+from sqlalchemy import select, func, desc, case
+from sqlalchemy.orm import selectinload
+from typing import List, Optional
 import logging
 
-from app.db.session import get_db
+from app.db.replicas import get_read_db
+from app.core.responses import json_response
 from app.core.security import get_current_user_id
+from app.core.sql_profiler import query_budget
 from app.schemas.schemas import (
     ProjectStats,
     HeatMapData,
@@ -28,9 +31,10 @@ router = APIRouter()
 
 
 @router.get("/dashboard", response_model=ProjectStats)
+@query_budget(4)  # 3 aggregates + principal lookup
 async def get_dashboard_stats(
     user_id: int = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get dashboard statistics"""
     # Total projects
@@ -56,7 +60,7 @@ async def get_dashboard_stats(
     in_progress = by_status.get("in_progress", 0)
     completion_rate = (completed / total * 100) if total > 0 else 0
 
-    return ProjectStats(
+    return json_response(ProjectStats(
         total=total,
         by_status=by_status,
         by_province=by_province,
@@ -64,14 +68,14 @@ async def get_dashboard_stats(
         pending=pending,
         in_progress=in_progress,
         completion_rate=round(completion_rate, 2)
-    )
+    ))
 
 
 @router.get("/heatmap", response_model=List[HeatMapData])
 async def get_heatmap_data(
     status: ProjectStatus = None,
     user_id: int = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get heat map data (coordinates with counts)"""
     query = select(
@@ -100,14 +104,14 @@ async def get_heatmap_data(
         for row in result.all()
     ]
 
-    return heatmap_data
+    return json_response(heatmap_data)
 
 
 @router.get("/trends", response_model=List[TrendData])
 async def get_trends(
     months: int = Query(12, ge=1, le=36),
     user_id: int = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get trend analysis over time"""
     months_ago = datetime.utcnow() - timedelta(days=30 * months)
@@ -117,7 +121,7 @@ async def get_trends(
         select(
             func.date_trunc('month', ProjectModel.created_at).label('month'),
             func.count().label('new_projects'),
-            func.sum(func.case((ProjectModel.status == ProjectStatus.DONE, 1), else_=0)).label('completed_projects')
+            func.sum(case((ProjectModel.status == ProjectStatus.DONE, 1), else_=0)).label('completed_projects')
         )
         .where(ProjectModel.created_at >= months_ago)
         .group_by(func.date_trunc('month', ProjectModel.created_at))
@@ -135,40 +139,64 @@ async def get_trends(
             total=cumulative_total
         ))
 
-    return trends
+    return json_response(trends)
 
 
 @router.get("/activity-feed", response_model=List[ActivityFeedItem])
 async def get_activity_feed(
     limit: int = Query(50, ge=1, le=200),
+    before: Optional[int] = Query(None, ge=1, description="Return entries older than this id"),
+    since: Optional[int] = Query(None, ge=0, description="Return entries newer than this id"),
     user_id: int = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get activity feed"""
-    result = await db.execute(
-        select(ActivityLogModel)
-        .order_by(desc(ActivityLogModel.created_at))
-        .limit(limit)
-    )
+    """Get activity feed, newest first.
 
-    activities = result.scalars().all()
+    Page backwards with ``before`` (the ``X-Feed-Oldest-Id`` header of the
+    previous page) and poll for new entries with ``since`` (the
+    ``X-Feed-Latest-Id`` header).
+    """
+    query = select(ActivityLogModel).options(selectinload(ActivityLogModel.user))
 
-    return [ActivityFeedItem.model_validate(a) for a in activities]
+    if before is not None:
+        query = query.where(ActivityLogModel.id < before)
+    if since is not None:
+        query = query.where(ActivityLogModel.id > since)
+
+    # When polling, take the entries right after the cursor so none are skipped
+    polling = since is not None and before is None
+    order = ActivityLogModel.id.asc() if polling else ActivityLogModel.id.desc()
+
+    result = await db.execute(query.order_by(order).limit(limit))
+    activities = result.scalars().all()
+    if polling:
+        activities = list(reversed(activities))
+
+    headers = {}
+    if activities:
+        headers["X-Feed-Latest-Id"] = str(activities[0].id)
+        headers["X-Feed-Oldest-Id"] = str(activities[-1].id)
+    elif since is not None:
+        headers["X-Feed-Latest-Id"] = str(since)
+
+    return json_response(
+        [ActivityFeedItem.model_validate(a) for a in activities], headers=headers
+    )
 
 
 @router.get("/province-performance", response_model=List[dict])
 async def get_province_performance(
     user_id: int = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get performance metrics by province"""
     result = await db.execute(
         select(
             ProjectModel.province,
             func.count().label('total'),
-            func.sum(func.case((ProjectModel.status == ProjectStatus.DONE, 1), else_=0)).label('completed'),
-            func.sum(func.case((ProjectModel.status == ProjectStatus.PENDING, 1), else_=0)).label('pending'),
-            func.sum(func.case((ProjectModel.status == ProjectStatus.IN_PROGRESS, 1), else_=0)).label('in_progress')
+            func.sum(case((ProjectModel.status == ProjectStatus.DONE, 1), else_=0)).label('completed'),
+            func.sum(case((ProjectModel.status == ProjectStatus.PENDING, 1), else_=0)).label('pending'),
+            func.sum(case((ProjectModel.status == ProjectStatus.IN_PROGRESS, 1), else_=0)).label('in_progress')
         )
         .group_by(ProjectModel.province)
         .order_by(desc('total'))
@@ -189,21 +217,21 @@ async def get_province_performance(
             "completion_rate": round(completion_rate, 2)
         })
 
-    return performance
+    return json_response(performance)
 
 
 @router.get("/district-performance", response_model=List[dict])
 async def get_district_performance(
     province: str = Query(None, description="Filter by province"),
     user_id: int = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get performance metrics by district"""
     query = select(
         ProjectModel.district,
         func.count().label('total'),
-        func.sum(func.case((ProjectModel.status == ProjectStatus.DONE, 1), else_=0)).label('completed'),
-        func.sum(func.case((ProjectModel.status == ProjectStatus.PENDING, 1), else_=0)).label('pending')
+        func.sum(case((ProjectModel.status == ProjectStatus.DONE, 1), else_=0)).label('completed'),
+        func.sum(case((ProjectModel.status == ProjectStatus.PENDING, 1), else_=0)).label('pending')
     ).group_by(ProjectModel.district)
 
     if province:
@@ -227,14 +255,14 @@ async def get_district_performance(
             "completion_rate": round(completion_rate, 2)
         })
 
-    return performance
+    return json_response(performance)
 
 
 @router.get("/completion-rate")
 async def get_completion_rate(
     period: str = Query("all", description="all, 7d, 30d, 90d, 1y"),
     user_id: int = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get completion rate statistics"""
     query = select(ProjectModel)
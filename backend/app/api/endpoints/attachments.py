@@ -4,11 +4,15 @@ File attachment endpoints
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import List
+from typing import List, Tuple
+import hashlib
 import os
 import uuid
 from datetime import datetime
 
+import aiofiles
+import aiofiles.os
+
 from app.db.session import get_db
 from app.core.security import get_current_user_id
 from app.core.config import get_settings
@@ -22,6 +26,41 @@ settings = get_settings()
 router = APIRouter()
 
 
+def _file_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"File size exceeds maximum allowed size of {settings.MAX_FILE_SIZE} bytes"
+    )
+
+
+async def _store_upload(file: UploadFile, file_path: str) -> Tuple[int, str]:
+    """Copy the upload in chunks, returning its size and SHA-256.
+
+    Chunks go to a temporary file next to ``file_path`` that is renamed into
+    place once complete, so a failed or oversized upload leaves nothing
+    behind and readers never see a partial file.
+    """
+    temp_path = f"{file_path}.part"
+    digest = hashlib.sha256()
+    file_size = 0
+    try:
+        async with aiofiles.open(temp_path, "wb") as out:
+            while chunk := await file.read(settings.UPLOAD_CHUNK_SIZE):
+                file_size += len(chunk)
+                if file_size > settings.MAX_FILE_SIZE:
+                    raise _file_too_large()
+                digest.update(chunk)
+                await out.write(chunk)
+        await aiofiles.os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            await aiofiles.os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    return file_size, digest.hexdigest()
+
+
 @router.get("/project/{project_id}", response_model=List[Attachment])
 async def get_project_attachments(
     project_id: int,
@@ -65,16 +104,9 @@ async def upload_file(
             detail=f"File type {file.content_type} not allowed"
         )
 
-    # Read file content
-    content = await file.read()
-    file_size = len(content)
-
-    # Check file size
-    if file_size > settings.MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File size exceeds maximum allowed size of {settings.MAX_FILE_SIZE} bytes"
-        )
+    # Check file size before copying when the parser already knows it
+    if file.size is not None and file.size > settings.MAX_FILE_SIZE:
+        raise _file_too_large()
 
     # Generate unique filename
     file_extension = os.path.splitext(file.filename)[1]
@@ -82,12 +114,11 @@ async def upload_file(
 
     # Determine upload directory
     upload_dir = os.path.join(settings.UPLOAD_DIR, "projects", str(project_id))
-    os.makedirs(upload_dir, exist_ok=True)
+    await aiofiles.os.makedirs(upload_dir, exist_ok=True)
 
     # Save file
     file_path = os.path.join(upload_dir, unique_filename)
-    with open(file_path, "wb") as f:
-        f.write(content)
+    file_size, checksum = await _store_upload(file, file_path)
 
     # Create database record
     new_attachment = AttachmentModel(
@@ -97,13 +128,19 @@ async def upload_file(
         file_path=file_path,
         file_size=file_size,
         file_type=file.content_type,
+        checksum=checksum,
         description=description,
         uploaded_by=user_id
     )
 
     db.add(new_attachment)
-    await db.commit()
+    try:
+        await db.commit()
+    except Exception:
+        await aiofiles.os.remove(file_path)
+        raise
     await db.refresh(new_attachment)
+    await db.refresh(new_attachment, ["uploader"])
 
     logger.info(f"File uploaded to project {project_id} by user {user_id}: {file.filename}")
 
@@ -3,19 +3,25 @@ Authentication endpoints - Fixed for SQLAlchemy 2.0
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from datetime import datetime, timedelta
+from typing import Optional
 
 from app.db.session import get_db
 from app.core.security import (
-    verify_password,
-    get_password_hash,
     create_access_token,
     create_refresh_token,
     get_current_user,
+    get_current_user_id,
+    get_token_payload,
+    hash_refresh_token,
+    optional_security,
 )
 from app.core.config import get_settings
+from app.core.password_hashing import password_hasher
+from app.services.token_revocation import revoke_all_tokens, revoke_token
 from app.schemas.schemas import (
     LoginRequest,
     RegisterRequest,
@@ -52,7 +58,7 @@ async def register(user_data: RegisterRequest, db: AsyncSession = Depends(get_db
     new_user = UserModel(
         username=user_data.username,
         email=user_data.email,
-        password_hash=get_password_hash(user_data.password),
+        password_hash=await password_hasher.hash(user_data.password),
         full_name=user_data.full_name,
         role=user_data.role or UserRole.VIEWER,
     )
@@ -77,18 +83,18 @@ async def login(login_data: LoginRequest, db: AsyncSession = Depends(get_db)):
     if not user:
         raise HTTPException(status_code=401, detail="Incorrect username or password")
 
-    if not verify_password(login_data.password, str(user.password_hash)):
+    if not await password_hasher.verify(login_data.password, str(user.password_hash)):
         raise HTTPException(status_code=401, detail="Incorrect username or password")
 
     if not user.is_active:
         raise HTTPException(status_code=403, detail="User account is deactivated")
 
-    access_token = create_access_token(data={"sub": user.id})
-    refresh_token = create_refresh_token(data={"sub": user.id})
+    access_token = create_access_token(data={"sub": str(user.id)})
+    refresh_token = create_refresh_token(data={"sub": str(user.id)})
 
     session = SessionModel(
         user_id=user.id,
-        refresh_token=refresh_token,
+        refresh_token_hash=hash_refresh_token(refresh_token),
         expires_at=datetime.utcnow()
         + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
     )
@@ -121,7 +127,7 @@ async def refresh_token(refresh_token: str, db: AsyncSession = Depends(get_db)):
         if not user_id:
             raise HTTPException(status_code=401, detail="Invalid token payload")
 
-        result = await db.execute(select(UserModel).where(UserModel.id == user_id))
+        result = await db.execute(select(UserModel).where(UserModel.id == int(user_id)))
         user = result.scalar_one_or_none()
 
         if not user or not user.is_active:
@@ -129,21 +135,23 @@ async def refresh_token(refresh_token: str, db: AsyncSession = Depends(get_db)):
 
         result = await db.execute(
             select(SessionModel).where(
-                SessionModel.refresh_token == refresh_token,
+                SessionModel.refresh_token_hash == hash_refresh_token(refresh_token),
                 SessionModel.expires_at > datetime.utcnow(),
             )
         )
         old_session = result.scalar_one_or_none()
-        if old_session:
-            await db.delete(old_session)
-            await db.commit()
+        if not old_session:
+            # Logged out, rotated already or revoked with logout-all
+            raise HTTPException(status_code=401, detail="Session expired or revoked")
 
-        new_access_token = create_access_token(data={"sub": user.id})
-        new_refresh_token = create_refresh_token(data={"sub": user.id})
+        await db.delete(old_session)
+
+        new_access_token = create_access_token(data={"sub": str(user.id)})
+        new_refresh_token = create_refresh_token(data={"sub": str(user.id)})
 
         session = SessionModel(
             user_id=user.id,
-            refresh_token=new_refresh_token,
+            refresh_token_hash=hash_refresh_token(new_refresh_token),
             expires_at=datetime.utcnow()
             + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
         )
@@ -156,6 +164,8 @@ async def refresh_token(refresh_token: str, db: AsyncSession = Depends(get_db)):
             "token_type": "bearer",
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Token refresh error: {e}")
         raise HTTPException(status_code=401, detail="Invalid refresh token")
@@ -167,18 +177,43 @@ async def get_current_user_profile(user: UserModel = Depends(get_current_user)):
 
 
 @router.post("/logout", response_model=MessageResponse)
-async def logout(refresh_token: str, db: AsyncSession = Depends(get_db)):
+async def logout(
+    refresh_token: str,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    db: AsyncSession = Depends(get_db),
+):
     result = await db.execute(
-        select(SessionModel).where(SessionModel.refresh_token == refresh_token)
+        select(SessionModel).where(
+            SessionModel.refresh_token_hash == hash_refresh_token(refresh_token)
+        )
     )
     session = result.scalar_one_or_none()
     if session:
         await db.delete(session)
         await db.commit()
 
+    # Also revoke the access token the client is logging out with
+    if credentials:
+        try:
+            payload = get_token_payload(credentials.credentials)
+        except HTTPException:
+            payload = None
+        if payload:
+            await revoke_token(db, payload)
+
     return {"message": "Successfully logged out"}
 
 
+@router.post("/logout-all", response_model=MessageResponse)
+async def logout_all(
+    user_id: int = Depends(get_current_user_id), db: AsyncSession = Depends(get_db)
+):
+    """Revoke every token and session of the current user"""
+    await revoke_all_tokens(db, user_id)
+    logger.info(f"All sessions revoked for user {user_id}")
+    return {"message": "Logged out from all devices"}
+
+
 @router.post("/password-reset/request", response_model=MessageResponse)
 async def request_password_reset(
     request: PasswordResetRequest, db: AsyncSession = Depends(get_db)
@@ -4,19 +4,53 @@ Comments endpoints
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 from typing import List
 import logging
+import re
 
 from app.db.session import get_db
 from app.core.security import get_current_user_id
 from app.schemas.schemas import CommentCreate, CommentUpdate, Comment
-from app.models.models import Comment as CommentModel, Project
+from app.models.models import Comment as CommentModel, Project, User as UserModel
+from app.services.notification_fanout import notification_fanout
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+MENTION_PATTERN = re.compile(r"(?<![\w@])@([A-Za-z0-9_.-]{1,50})")
+
+# Everything the Comment response reads: the author and each reply with its author
+COMMENT_THREAD = (
+    selectinload(CommentModel.user),
+    selectinload(CommentModel.replies, recursion_depth=-1).selectinload(CommentModel.user),
+)
+
+
+async def _load_thread(db: AsyncSession, comment_id: int) -> CommentModel:
+    result = await db.execute(
+        select(CommentModel)
+        .where(CommentModel.id == comment_id)
+        .options(*COMMENT_THREAD)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one()
+
+
+async def _resolve_mentions(db: AsyncSession, content: str) -> List[int]:
+    """Ids of the active users @mentioned in a comment"""
+    usernames = set(MENTION_PATTERN.findall(content))
+    if not usernames:
+        return []
+    result = await db.execute(
+        select(UserModel.id).where(
+            UserModel.username.in_(usernames), UserModel.is_active.is_(True)
+        )
+    )
+    return sorted(result.scalars().all())
+
 
 @router.get("/project/{project_id}", response_model=List[Comment])
 async def get_project_comments(
@@ -29,6 +63,7 @@ async def get_project_comments(
         select(CommentModel)
         .where(CommentModel.project_id == project_id, CommentModel.parent_id.is_(None))
         .order_by(CommentModel.created_at.desc())
+        .options(*COMMENT_THREAD)
     )
     comments = result.scalars().all()
 
@@ -54,16 +89,20 @@ async def create_comment(
 
     new_comment = CommentModel(
         **comment_data.model_dump(),
-        user_id=user_id
+        user_id=user_id,
+        mentions=await _resolve_mentions(db, comment_data.content) or None
     )
 
     db.add(new_comment)
     await db.commit()
-    await db.refresh(new_comment)
+    response = Comment.model_validate(await _load_thread(db, new_comment.id))
 
     logger.info(f"Comment created for project {comment_data.project_id} by user {user_id}")
 
-    return Comment.model_validate(new_comment)
+    # Watchers are only told about comments the author saw succeed
+    notification_fanout.comment_added(user_id, response.project_id, response.id)
+
+    return response
 
 
 @router.put("/{comment_id}", response_model=Comment)
@@ -97,11 +136,11 @@ async def update_comment(
     comment.updated_at = datetime.utcnow()
 
     await db.commit()
-    await db.refresh(comment)
+    response = Comment.model_validate(await _load_thread(db, comment.id))
 
     logger.info(f"Comment {comment_id} updated by user {user_id}")
 
-    return Comment.model_validate(comment)
+    return response
 
 
 @router.delete("/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
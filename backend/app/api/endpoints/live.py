@@ -0,0 +1,92 @@
+"""
+Live update endpoints (WebSocket)
+"""
+from fastapi import APIRouter, WebSocket, HTTPException, Query, status
+from pydantic import BaseModel, Field, ValidationError
+from typing import List, Optional
+import asyncio
+import json
+import logging
+
+from app.core.security import authenticate_token
+from app.db.session import AsyncSessionLocal
+from app.services.realtime import HubClient, project_hub
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+class Subscription(BaseModel):
+    """Client subscription message"""
+
+    action: str = Field(..., description="subscribe or unsubscribe")
+    provinces: Optional[List[str]] = None
+    statuses: Optional[List[str]] = None
+    bbox: Optional[List[float]] = Field(
+        None, min_length=4, max_length=4, description="[min_lng, min_lat, max_lng, max_lat]"
+    )
+
+
+async def _read_messages(websocket: WebSocket, client: HubClient) -> None:
+    """Apply subscription messages until the client disconnects.
+
+    Replies are queued on the client, so only its writer sends on the socket.
+    """
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+        if client.closing:
+            continue
+        if message.get("text") is None:
+            client.close(status.WS_1003_UNSUPPORTED_DATA, "Binary frames are not supported")
+            continue
+
+        try:
+            subscription = Subscription.model_validate(json.loads(message["text"]))
+        except (ValueError, ValidationError) as e:
+            client.reply({"type": "error", "detail": str(e)})
+            continue
+
+        if subscription.action == "subscribe":
+            project_hub.subscribe(
+                client,
+                provinces=subscription.provinces,
+                statuses=subscription.statuses,
+                bbox=subscription.bbox,
+            )
+            client.reply({"type": "subscribed", **subscription.model_dump(exclude={"action"})})
+        elif subscription.action == "unsubscribe":
+            project_hub.unsubscribe(client)
+            client.reply({"type": "unsubscribed"})
+        else:
+            client.reply({"type": "error", "detail": f"Unknown action: {subscription.action}"})
+
+
+@router.websocket("/ws")
+async def project_updates(websocket: WebSocket, token: str = Query(...)):
+    """Stream project create/update/delete deltas matching the subscription"""
+    try:
+        async with AsyncSessionLocal() as db:
+            user_id = (await authenticate_token(token, db)).id
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    client = project_hub.connect(websocket)
+    reader = asyncio.create_task(_read_messages(websocket, client))
+    writer = asyncio.create_task(client.run_writer())
+
+    # The reader ends on disconnect; the writer once it has closed the socket
+    try:
+        await asyncio.wait((reader, writer), return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        project_hub.disconnect(client)
+        reader.cancel()
+        writer.cancel()
+        for result in await asyncio.gather(reader, writer, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.error(f"WebSocket handler failed: {result}")
+        logger.debug(f"WebSocket client of user {user_id} disconnected")
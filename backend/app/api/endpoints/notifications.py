@@ -1,22 +1,40 @@
 """
 Notification endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
-from typing import List
+from sqlalchemy import select, update, func
+from typing import List, Optional
 from datetime import datetime
+import asyncio
+import json
 import logging
+import time
 
-from app.db.session import get_db
-from app.core.security import get_current_user_id
+from app.db.session import get_db, AsyncSessionLocal
+from app.core.config import get_settings
+from app.core.responses import json_response
+from app.core.security import (
+    authenticate_token,
+    get_current_user_id,
+    get_token_payload,
+    optional_security,
+)
 from app.schemas.schemas import Notification, NotificationUpdate
 from app.models.models import Notification as NotificationModel
+from app.services import notifications as unread_counter
+from app.services.notifications import notification_broker
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
 router = APIRouter()
 
+# Notifications sent per query while catching a stream up
+STREAM_BATCH_SIZE = 100
+
 
 @router.get("", response_model=List[Notification])
 async def get_notifications(
@@ -38,7 +56,120 @@ async def get_notifications(
     result = await db.execute(query)
     notifications = result.scalars().all()
 
-    return [Notification.model_validate(n) for n in notifications]
+    return json_response([Notification.model_validate(n) for n in notifications])
+
+
+def _sse(event: str, data: str, event_id: Optional[int] = None) -> str:
+    """Format a Server-Sent Event"""
+    prefix = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{prefix}event: {event}\ndata: {data}\n\n"
+
+
+async def _still_authorized(token: str, payload: dict) -> bool:
+    """The stream's token has not expired or been revoked and its user is active"""
+    if payload["exp"] <= time.time():
+        return False
+    try:
+        async with AsyncSessionLocal() as db:
+            await authenticate_token(token, db)
+    except HTTPException:
+        return False
+    return True
+
+
+async def _notification_events(token: str, payload: dict, last_id: Optional[int]):
+    """Yield new notifications and unread counts as they change.
+
+    The token is checked again on every wakeup and heartbeat, and the stream
+    ends when it expires, is revoked or its user is deactivated.
+    """
+    user_id = int(payload["sub"])
+    subscriber = notification_broker.subscribe(user_id)
+    try:
+        yield f"retry: {settings.NOTIFICATION_STREAM_RETRY_MS}\n\n"
+
+        # Resume after Last-Event-ID, otherwise only stream what comes next
+        async with AsyncSessionLocal() as db:
+            if last_id is None:
+                result = await db.execute(
+                    select(func.max(NotificationModel.id)).where(
+                        NotificationModel.user_id == user_id
+                    )
+                )
+                last_id = result.scalar() or 0
+            else:
+                subscriber.has_new = True
+            count = await unread_counter.get_unread_count(db, user_id)
+        yield _sse("unread_count", json.dumps({"count": count}))
+
+        while True:
+            subscriber.wakeup.clear()
+
+            if not await _still_authorized(token, payload):
+                yield _sse("unauthorized", json.dumps({"detail": "Token expired or revoked"}))
+                return
+
+            if subscriber.has_new:
+                subscriber.has_new = False
+                async with AsyncSessionLocal() as db:
+                    result = await db.execute(
+                        select(NotificationModel)
+                        .where(
+                            NotificationModel.user_id == user_id,
+                            NotificationModel.id > last_id,
+                        )
+                        .order_by(NotificationModel.id)
+                        .limit(STREAM_BATCH_SIZE)
+                    )
+                    notifications = result.scalars().all()
+                    if len(notifications) == STREAM_BATCH_SIZE:
+                        subscriber.has_new = True
+                        subscriber.wakeup.set()
+                    count = await unread_counter.get_unread_count(db, user_id)
+
+                for notification in notifications:
+                    last_id = notification.id
+                    yield _sse(
+                        "notification",
+                        Notification.model_validate(notification).model_dump_json(),
+                        event_id=notification.id,
+                    )
+                subscriber.unread_count = count
+
+            if subscriber.unread_count is not None:
+                count, subscriber.unread_count = subscriber.unread_count, None
+                yield _sse("unread_count", json.dumps({"count": count}))
+
+            # Wake up no later than the token's expiry
+            timeout = min(settings.NOTIFICATION_STREAM_HEARTBEAT, payload["exp"] - time.time())
+            try:
+                await asyncio.wait_for(subscriber.wakeup.wait(), max(timeout, 0))
+            except asyncio.TimeoutError:
+                if payload["exp"] > time.time():
+                    yield ": keep-alive\n\n"
+    finally:
+        notification_broker.unsubscribe(user_id, subscriber)
+
+
+@router.get("/stream")
+async def stream_notifications(
+    token: Optional[str] = Query(None, description="Access token (EventSource cannot send headers)"),
+    last_event_id: Optional[int] = Header(None),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+):
+    """Server-Sent Events stream of new notifications and unread counts"""
+    token = credentials.credentials if credentials else token
+    if not token:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    # The stream itself never holds a pooled connection
+    async with AsyncSessionLocal() as db:
+        await authenticate_token(token, db)
+
+    return StreamingResponse(
+        _notification_events(token, get_token_payload(token), last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/{notification_id}", response_model=Notification)
@@ -62,7 +193,7 @@ async def get_notification(
             detail="Notification not found"
         )
 
-    return Notification.model_validate(notification)
+    return json_response(Notification.model_validate(notification))
 
 
 @router.put("/{notification_id}", response_model=Notification)
@@ -87,15 +218,22 @@ async def update_notification(
             detail="Notification not found"
         )
 
+    was_read = bool(notification.is_read)
     notification.is_read = notification_data.is_read
 
     if notification_data.is_read and not notification.read_at:
         notification.read_at = datetime.utcnow()
 
+    if was_read and not notification_data.is_read:
+        await unread_counter.increment_unread(db, {user_id: 1})
+    elif not was_read and notification_data.is_read:
+        await unread_counter.decrement_unread(db, user_id)
+
     await db.commit()
     await db.refresh(notification)
+    await unread_counter.publish_unread_count(db, user_id)
 
-    return Notification.model_validate(notification)
+    return json_response(Notification.model_validate(notification))
 
 
 @router.post("/mark-all-read", status_code=status.HTTP_204_NO_CONTENT)
@@ -109,7 +247,9 @@ async def mark_all_as_read(
         .where(NotificationModel.user_id == user_id, NotificationModel.is_read == False)
         .values(is_read=True, read_at=datetime.utcnow())
     )
+    await unread_counter.reset_unread(db, user_id)
     await db.commit()
+    await unread_counter.publish_unread_count(db, user_id)
 
     logger.info(f"All notifications marked as read for user {user_id}")
 
@@ -135,8 +275,12 @@ async def delete_notification(
             detail="Notification not found"
         )
 
+    if not notification.is_read:
+        await unread_counter.decrement_unread(db, user_id)
+
     await db.delete(notification)
     await db.commit()
+    await unread_counter.publish_unread_count(db, user_id)
 
     logger.info(f"Notification {notification_id} deleted by user {user_id}")
 
@@ -147,12 +291,6 @@ async def get_unread_count(
     db: AsyncSession = Depends(get_db)
 ):
     """Get count of unread notifications"""
-    result = await db.execute(
-        select(NotificationModel).where(
-            NotificationModel.user_id == user_id,
-            NotificationModel.is_read == False
-        )
-    )
-    count = len(result.scalars().all())
+    count = await unread_counter.get_unread_count(db, user_id)
 
-    return {"count": count}
+    return json_response({"count": count})
@@ -1,15 +1,43 @@
 """
 Project management endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_, and_
+from sqlalchemy import (
+    select,
+    func,
+    and_,
+    case,
+    delete,
+    exists,
+    insert,
+    literal,
+    true,
+    update,
+    Integer,
+)
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from typing import List, Optional
 import logging
 
+import aiofiles.os
+
+from app.db.replicas import get_read_db
 from app.db.session import get_db
+from app.services.notification_fanout import notification_fanout
+from app.services.project_queries import project_list_queries
+from app.services.realtime import (
+    project_hub,
+    project_delta,
+    PROJECT_CREATED,
+    PROJECT_UPDATED,
+    PROJECT_DELETED,
+)
+from app.core.responses import json_response
 from app.core.security import get_current_user_id, require_editor
+from app.core.sql_profiler import query_budget
 from app.schemas.schemas import (
     ProjectCreate,
     ProjectUpdate,
@@ -27,7 +55,11 @@ from app.models.models import (
     User as UserModel,
     ProjectHistory,
     ProjectStatus,
+    ProjectTag,
     Tag,
+    Attachment as AttachmentModel,
+    Comment as CommentModel,
+    NotificationType,
 )
 from datetime import datetime
 
@@ -35,8 +67,43 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Supported bulk actions mapped to the key they require in the request data
+BULK_ACTIONS = {
+    "delete": None,
+    "update_status": "status",
+    "assign": "assigned_to",
+    "add_tags": "tag_ids",
+}
+
+
+async def _link_tags(db: AsyncSession, project_id: int, tag_ids: List[int]) -> None:
+    """Attach the tags that still exist; ids deleted meanwhile are skipped
+    rather than failing the insert on the foreign key"""
+    await db.execute(
+        insert(ProjectTag).from_select(
+            ["project_id", "tag_id"],
+            select(literal(project_id, Integer), Tag.id).where(Tag.id.in_(tag_ids))
+        )
+    )
+
+
+def _is_id(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _invalid_bulk_data(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=detail)
+
+
+def _status_value(column):
+    """SQL expression rendering a status column as its enum value string"""
+    return case(
+        *[(column == project_status, project_status.value) for project_status in ProjectStatus]
+    )
+
 
 @router.get("", response_model=ProjectList)
+@query_budget(7)  # count, page, creator/assignee/tags/tag creators + principal lookup
 async def get_projects(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
@@ -49,71 +116,42 @@ async def get_projects(
     sort_by: str = "created_at",
     sort_desc: bool = True,
     user_id: int = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get paginated list of projects with filters"""
-    # Build query
-    query = select(ProjectModel)
-
-    # Apply filters
-    if status:
-        query = query.where(ProjectModel.status == status)
-    if province:
-        query = query.where(ProjectModel.province == province)
-    if municipality:
-        query = query.where(ProjectModel.municipality == municipality)
-    if district:
-        query = query.where(ProjectModel.district == district)
-    if assigned_to:
-        query = query.where(ProjectModel.assigned_to == assigned_to)
-
-    # Full-text search
-    if search:
-        search_pattern = f"%{search}%"
-        query = query.where(
-            or_(
-                ProjectModel.project_name.ilike(search_pattern),
-                ProjectModel.site_name.ilike(search_pattern),
-                ProjectModel.site_code.ilike(search_pattern),
-                ProjectModel.barangay.ilike(search_pattern)
-            )
-        )
+    count_query, query, params = project_list_queries.build(
+        {
+            "status": status,
+            "province": province,
+            "municipality": municipality,
+            "district": district,
+            "assigned_to": assigned_to,
+            "search": search,
+        },
+        sort_by,
+        sort_desc,
+        offset=(page - 1) * page_size,
+        limit=page_size,
+    )
 
     # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
+    total_result = await db.execute(count_query, params)
     total = total_result.scalar()
 
-    # Apply sorting
-    sort_column = getattr(ProjectModel, sort_by, ProjectModel.created_at)
-    if sort_desc:
-        query = query.order_by(sort_column.desc())
-    else:
-        query = query.order_by(sort_column.asc())
-
-    # Apply pagination
-    query = query.offset((page - 1) * page_size).limit(page_size)
-
-    # Eager load relationships
-    query = query.options(
-        selectinload(ProjectModel.creator),
-        selectinload(ProjectModel.assignee),
-        selectinload(ProjectModel.tags)
-    )
-
     # Execute query
-    result = await db.execute(query)
+    result = await db.execute(query, params)
     projects = result.scalars().all()
 
-    return {
-        "total": total,
-        "page": page,
-        "page_size": page_size,
-        "projects": [Project.model_validate(p) for p in projects]
-    }
+    return json_response(ProjectList(
+        total=total,
+        page=page,
+        page_size=page_size,
+        projects=[Project.model_validate(p) for p in projects]
+    ))
 
 
 @router.get("/{project_id}", response_model=ProjectWithHistory)
+@query_budget(8)  # project, creator/assignee/tags/tag creators, history, changers + principal
 async def get_project(
     project_id: int,
     user_id: int = Depends(get_current_user_id),
@@ -141,16 +179,16 @@ async def get_project(
     # Get project history
     history_result = await db.execute(
         select(ProjectHistory)
+        .options(selectinload(ProjectHistory.changer))
         .where(ProjectHistory.project_id == project_id)
         .order_by(ProjectHistory.created_at.desc())
         .limit(20)
     )
-    history = history_result.scalars().all()
+    # Attach the latest entries as the loaded history, so the response
+    # validates straight from the ORM object without a lazy load
+    set_committed_value(project, "history", history_result.scalars().all())
 
-    return ProjectWithHistory(
-        **Project.model_validate(project).model_dump(),
-        history=[ProjectHistoryItem.model_validate(h) for h in history]
-    )
+    return json_response(ProjectWithHistory.model_validate(project))
 
 
 @router.post("", response_model=Project, status_code=status.HTTP_201_CREATED)
@@ -181,14 +219,7 @@ async def create_project(
 
     # Add tags if provided
     if project_data.tags:
-        for tag_id in project_data.tags:
-            # Verify tag exists
-            tag_result = await db.execute(
-                select(Tag).where(Tag.id == tag_id)
-            )
-            tag = tag_result.scalar_one_or_none()
-            if tag:
-                new_project.tags.append(tag)
+        await _link_tags(db, new_project.id, project_data.tags)
 
     # Create history entry
     history = ProjectHistory(
@@ -207,7 +238,14 @@ async def create_project(
 
     logger.info(f"Project created: {new_project.site_code} by user {user_id}")
 
-    return Project.model_validate(new_project)
+    project_hub.publish(PROJECT_CREATED, project_delta(new_project))
+    notification_fanout.project_event(
+        NotificationType.NEW_PROJECT, user_id, [new_project.id]
+    )
+
+    return json_response(
+        Project.model_validate(new_project), status_code=status.HTTP_201_CREATED
+    )
 
 
 @router.put("/{project_id}", response_model=Project)
@@ -251,16 +289,13 @@ async def update_project(
     # Handle tags update
     if project_data.tags is not None:
         # Clear existing tags
-        project.tags.clear()
+        await db.execute(
+            delete(ProjectTag).where(ProjectTag.project_id == project.id)
+        )
 
         # Add new tags
-        for tag_id in project_data.tags:
-            tag_result = await db.execute(
-                select(Tag).where(Tag.id == tag_id)
-            )
-            tag = tag_result.scalar_one_or_none()
-            if tag:
-                project.tags.append(tag)
+        if project_data.tags:
+            await _link_tags(db, project.id, project_data.tags)
 
     project.updated_at = datetime.utcnow()
 
@@ -286,7 +321,19 @@ async def update_project(
 
     logger.info(f"Project updated: {project.site_code} by user {user_id}")
 
-    return Project.model_validate(project)
+    changes = sorted(update_data)
+    if project_data.tags is not None:
+        changes.append("tags")
+    project_hub.publish(PROJECT_UPDATED, project_delta(project, changes=changes))
+
+    if "status" in changed_fields and old_status != project.status:
+        notification_fanout.status_changed(user_id, [project.id], project.status)
+    if project.assigned_to and old_assigned_to != project.assigned_to:
+        notification_fanout.project_event(
+            NotificationType.PROJECT_ASSIGNED, user_id, [project.id]
+        )
+
+    return json_response(Project.model_validate(project))
 
 
 @router.delete("/{project_id}", response_model=MessageResponse)
@@ -309,6 +356,7 @@ async def delete_project(
         )
 
     site_code = project.site_code
+    delta = project_delta(project)
 
     # Delete project (cascade will handle related records)
     await db.delete(project)
@@ -316,6 +364,8 @@ async def delete_project(
 
     logger.info(f"Project deleted: {site_code} by user {user_id}")
 
+    project_hub.publish(PROJECT_DELETED, delta)
+
     return {"message": f"Project {site_code} deleted successfully"}
 
 
@@ -323,7 +373,7 @@ async def delete_project(
 async def get_projects_for_map(
     status: Optional[ProjectStatus] = None,
     user_id: int = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all projects for map display (no pagination)"""
     query = select(ProjectModel)
@@ -340,70 +390,234 @@ async def get_projects_for_map(
     result = await db.execute(query)
     projects = result.scalars().all()
 
-    return [Project.model_validate(p) for p in projects]
+    return json_response([Project.model_validate(p) for p in projects])
 
 
 @router.post("/bulk", response_model=BulkActionResponse)
 async def bulk_action(
     action_data: BulkActionRequest,
+    request: Request,
     user_id: int = Depends(require_editor),
     db: AsyncSession = Depends(get_db)
 ):
-    """Perform bulk actions on multiple projects"""
-    success_count = 0
-    failed_count = 0
-    errors = []
+    """Perform bulk actions on multiple projects using set-based statements"""
+    action = action_data.action
+    data = action_data.data or {}
 
-    # Get projects
+    if action not in BULK_ACTIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported bulk action: {action}"
+        )
+
+    required_key = BULK_ACTIONS[action]
+    if required_key and required_key not in data:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Bulk action '{action}' requires '{required_key}' in data"
+        )
+
+    new_status = None
+    if action == "update_status":
+        try:
+            new_status = ProjectStatus(data["status"])
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid status: {data['status']}"
+            )
+
+    if action == "assign" and data["assigned_to"] is not None:
+        assigned_to = data["assigned_to"]
+        if not _is_id(assigned_to):
+            raise _invalid_bulk_data("'assigned_to' must be a user id or null")
+        assignee_active = (await db.execute(
+            select(UserModel.is_active).where(UserModel.id == assigned_to)
+        )).scalar()
+        if not assignee_active:
+            raise _invalid_bulk_data(f"User {assigned_to} does not exist or is inactive")
+
+    if action == "add_tags":
+        tag_ids = data["tag_ids"]
+        if not isinstance(tag_ids, list) or not all(_is_id(tag_id) for tag_id in tag_ids):
+            raise _invalid_bulk_data("'tag_ids' must be a list of tag ids")
+
+    # Resolve which of the requested projects exist (one narrow query that
+    # also carries the fields broadcast to live subscribers)
+    requested_ids = set(action_data.project_ids)
     result = await db.execute(
-        select(ProjectModel).where(ProjectModel.id.in_(action_data.project_ids))
+        select(
+            ProjectModel.id,
+            ProjectModel.site_code,
+            ProjectModel.project_name,
+            ProjectModel.province,
+            ProjectModel.municipality,
+            ProjectModel.status,
+            ProjectModel.latitude,
+            ProjectModel.longitude,
+            ProjectModel.progress,
+            ProjectModel.assigned_to,
+        ).where(ProjectModel.id.in_(requested_ids))
     )
-    projects = result.scalars().all()
+    targets = result.all()
+    target_ids = [row.id for row in targets]
+
+    errors = [
+        f"Project {project_id}: not found"
+        for project_id in sorted(requested_ids.difference(target_ids))
+    ]
+
+    if not target_ids:
+        return BulkActionResponse(
+            success_count=0,
+            failed_count=len(errors),
+            errors=errors
+        )
 
-    for project in projects:
-        try:
-            if action_data.action == "delete":
-                await db.delete(project)
-
-            elif action_data.action == "update_status":
-                if action_data.data and "status" in action_data.data:
-                    project.status = ProjectStatus(action_data.data["status"])
-                    project.updated_at = datetime.utcnow()
-
-                    # Create history entry
-                    history = ProjectHistory(
-                        project_id=project.id,
-                        old_status=project.status.value,
-                        new_status=action_data.data["status"],
-                        changed_by=user_id,
-                        change_reason="Bulk status update"
-                    )
-                    db.add(history)
-
-            elif action_data.action == "assign":
-                if action_data.data and "assigned_to" in action_data.data:
-                    project.assigned_to = action_data.data["assigned_to"]
-                    project.updated_at = datetime.utcnow()
-
-            elif action_data.action == "add_tags":
-                if action_data.data and "tag_ids" in action_data.data:
-                    for tag_id in action_data.data["tag_ids"]:
-                        tag_result = await db.execute(
-                            select(Tag).where(Tag.id == tag_id)
+    in_target = ProjectModel.id.in_(target_ids)
+    now = datetime.utcnow()
+    attachment_paths = []
+
+    try:
+        if action == "delete":
+            attachment_paths = (await db.execute(
+                select(AttachmentModel.file_path)
+                .where(AttachmentModel.project_id.in_(target_ids))
+            )).scalars().all()
+
+            # Children are deleted explicitly rather than through ON DELETE
+            # CASCADE, which SQLite ignores without PRAGMA foreign_keys
+            for child in (ProjectHistory, ProjectTag, CommentModel, AttachmentModel):
+                await db.execute(
+                    delete(child)
+                    .where(child.project_id.in_(target_ids))
+                    .execution_options(synchronize_session=False)
+                )
+            await db.execute(
+                delete(ProjectModel)
+                .where(in_target)
+                .execution_options(synchronize_session=False)
+            )
+
+        elif action == "update_status":
+            # Record history from the pre-update rows with one INSERT ... SELECT
+            await db.execute(
+                insert(ProjectHistory).from_select(
+                    ["project_id", "old_status", "new_status", "changed_by", "change_reason"],
+                    select(
+                        ProjectModel.id,
+                        _status_value(ProjectModel.status),
+                        literal(new_status.value),
+                        literal(user_id),
+                        literal("Bulk status update")
+                    ).where(in_target)
+                )
+            )
+            await db.execute(
+                update(ProjectModel)
+                .where(in_target)
+                .values(status=new_status, updated_at=now)
+                .execution_options(synchronize_session=False)
+            )
+
+        elif action == "assign":
+            assigned_to = data["assigned_to"]
+            await db.execute(
+                insert(ProjectHistory).from_select(
+                    ["project_id", "old_assigned_to", "new_assigned_to", "changed_by", "change_reason"],
+                    select(
+                        ProjectModel.id,
+                        ProjectModel.assigned_to,
+                        literal(assigned_to, Integer),
+                        literal(user_id),
+                        literal("Bulk assignment")
+                    ).where(in_target)
+                )
+            )
+            await db.execute(
+                update(ProjectModel)
+                .where(in_target)
+                .values(assigned_to=assigned_to, updated_at=now)
+                .execution_options(synchronize_session=False)
+            )
+
+        elif action == "add_tags":
+            tag_ids = list(dict.fromkeys(data["tag_ids"]))
+
+            # Attach every existing tag to every target project, skipping pairs
+            # that are already linked; the join drops ids with no tag row
+            if tag_ids:
+                await db.execute(
+                    insert(ProjectTag).from_select(
+                        ["project_id", "tag_id"],
+                        select(ProjectModel.id, Tag.id)
+                        .select_from(ProjectModel)
+                        .join(Tag, true())
+                        .where(
+                            in_target,
+                            Tag.id.in_(tag_ids),
+                            ~exists().where(
+                                ProjectTag.project_id == ProjectModel.id,
+                                ProjectTag.tag_id == Tag.id
+                            )
                         )
-                        tag = tag_result.scalar_one_or_none()
-                        if tag and tag not in project.tags:
-                            project.tags.append(tag)
+                    )
+                )
 
-            success_count += 1
+        await db.commit()
 
-        except Exception as e:
-            failed_count += 1
-            errors.append(f"Project {project.site_code}: {str(e)}")
+    except SQLAlchemyError as e:
+        await db.rollback()
+        logger.error(f"Bulk action '{action}' failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Bulk action '{action}' failed"
+        )
 
-    await db.commit()
+    for file_path in attachment_paths:
+        try:
+            await aiofiles.os.remove(file_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error(f"Error deleting file: {e}")
+
+    success_count = len(target_ids)
+    failed_count = len(errors)
+
+    # One activity row per affected project
+    request.state.activity_entity_ids = target_ids
+    request.state.activity_details = {"bulk_action": action}
+
+    logger.info(f"Bulk action '{action}' completed: {success_count} success, {failed_count} failed")
+
+    # One queued event per bulk action; recipients are resolved off the request path
+    if action == "update_status":
+        notification_fanout.status_changed(user_id, target_ids, new_status)
+    elif action == "assign" and data["assigned_to"]:
+        notification_fanout.project_event(
+            NotificationType.PROJECT_ASSIGNED, user_id, target_ids
+        )
 
-    logger.info(f"Bulk action '{action_data.action}' completed: {success_count} success, {failed_count} failed")
+    if project_hub.has_clients:
+        if action == "delete":
+            deltas = [project_delta(row) for row in targets]
+        elif action == "update_status":
+            deltas = [
+                project_delta(row, status=new_status.value, changes=["status"])
+                for row in targets
+            ]
+        elif action == "assign":
+            deltas = [
+                project_delta(row, assigned_to=data["assigned_to"], changes=["assigned_to"])
+                for row in targets
+            ]
+        else:
+            deltas = [project_delta(row, changes=["tags"]) for row in targets]
+
+        project_hub.publish_many(
+            PROJECT_DELETED if action == "delete" else PROJECT_UPDATED, deltas
+        )
 
     return BulkActionResponse(
         success_count=success_count,
@@ -443,7 +657,7 @@ async def get_project_stats(
     in_progress = by_status.get("in_progress", 0)
     completion_rate = (completed / total * 100) if total > 0 else 0
 
-    return ProjectStats(
+    return json_response(ProjectStats(
         total=total,
         by_status=by_status,
         by_province=by_province,
@@ -451,8 +665,5 @@ async def get_project_stats(
         pending=pending,
         in_progress=in_progress,
         completion_rate=round(completion_rate, 2)
-    )
-
+    ))
 
-# Import for ProjectHistoryItem
-from app.schemas.schemas import ProjectHistoryItem
@@ -7,7 +7,9 @@ from sqlalchemy import select, func, desc
 from typing import List, Optional
 import logging
 
+from app.db.replicas import get_read_db
 from app.db.session import get_db
+from app.core.responses import json_response
 from app.core.security import get_current_user_id
 from app.schemas.schemas import (
     SavedReportCreate,
@@ -23,11 +25,6 @@ from app.models.models import (
 )
 from datetime import datetime, timedelta
 import io
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from fastapi.responses import StreamingResponse
 
 logger = logging.getLogger(__name__)
@@ -35,12 +32,8 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-@router.get("/summary", response_model=dict)
-async def get_summary_report(
-    user_id: int = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db)
-):
-    """Generate summary report"""
+async def _summary_report(db: AsyncSession) -> dict:
+    """Build the summary report data"""
     # Get total projects
     total_result = await db.execute(select(func.count()).select_from(ProjectModel))
     total = total_result.scalar()
@@ -78,13 +71,17 @@ async def get_summary_report(
     }
 
 
-@router.get("/province/{province}", response_model=dict)
-async def get_province_report(
-    province: str,
+@router.get("/summary", response_model=dict)
+async def get_summary_report(
     user_id: int = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Generate province-specific report"""
+    """Generate summary report"""
+    return json_response(await _summary_report(db))
+
+
+async def _province_report(province: str, db: AsyncSession) -> dict:
+    """Build the province-specific report data"""
     # Get projects in province
     result = await db.execute(
         select(ProjectModel).where(ProjectModel.province == province)
@@ -122,13 +119,18 @@ async def get_province_report(
     }
 
 
-@router.get("/timeline", response_model=dict)
-async def get_timeline_report(
-    months: int = Query(12, ge=1, le=36),
+@router.get("/province/{province}", response_model=dict)
+async def get_province_report(
+    province: str,
     user_id: int = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Generate timeline report"""
+    """Generate province-specific report"""
+    return json_response(await _province_report(province, db))
+
+
+async def _timeline_report(months: int, db: AsyncSession) -> dict:
+    """Build the timeline report data"""
     months_ago = datetime.utcnow() - timedelta(days=30 * months)
 
     # Get projects created in timeframe
@@ -173,13 +175,18 @@ async def get_timeline_report(
     }
 
 
-@router.get("/status", response_model=dict)
-async def get_status_report(
-    status: Optional[ProjectStatus] = None,
+@router.get("/timeline", response_model=dict)
+async def get_timeline_report(
+    months: int = Query(12, ge=1, le=36),
     user_id: int = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Generate status analysis report"""
+    """Generate timeline report"""
+    return json_response(await _timeline_report(months, db))
+
+
+async def _status_report(status: Optional[ProjectStatus], db: AsyncSession) -> dict:
+    """Build the status analysis report data"""
     query = select(ProjectModel)
     if status:
         query = query.where(ProjectModel.status == status)
@@ -211,30 +218,24 @@ async def get_status_report(
     }
 
 
-@router.get("/export/pdf")
-async def export_pdf_report(
-    report_type: str = Query(..., description="summary, province, timeline, status"),
-    province: Optional[str] = Query(None),
+@router.get("/status", response_model=dict)
+async def get_status_report(
+    status: Optional[ProjectStatus] = None,
     user_id: int = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Export report as PDF"""
-    # Get data based on report type
-    if report_type == "summary":
-        data = await get_summary_report(user_id, db)
-    elif report_type == "province" and province:
-        data = await get_province_report(province, user_id, db)
-    elif report_type == "timeline":
-        data = await get_timeline_report(12, user_id, db)
-    elif report_type == "status":
-        data = await get_status_report(None, user_id, db)
-    else:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid report type or missing required parameters"
-        )
+    """Generate status analysis report"""
+    return json_response(await _status_report(status, db))
+
+
+def _render_pdf(report_type: str, province: Optional[str], data: dict) -> bytes:
+    """Lay out report data as a PDF document"""
+    # reportlab takes ~100 ms and several MB to import; load it on first export
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 
-    # Generate PDF
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=letter)
 
@@ -279,10 +280,34 @@ async def export_pdf_report(
     elements.append(Paragraph(f"Generated: {data.get('generated_at', '')}", styles['Normal']))
 
     doc.build(elements)
-    buffer.seek(0)
+    return buffer.getvalue()
+
+
+@router.get("/export/pdf")
+async def export_pdf_report(
+    report_type: str = Query(..., description="summary, province, timeline, status"),
+    province: Optional[str] = Query(None),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Export report as PDF"""
+    # Get data based on report type
+    if report_type == "summary":
+        data = await _summary_report(db)
+    elif report_type == "province" and province:
+        data = await _province_report(province, db)
+    elif report_type == "timeline":
+        data = await _timeline_report(12, db)
+    elif report_type == "status":
+        data = await _status_report(None, db)
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid report type or missing required parameters"
+        )
 
     return StreamingResponse(
-        io.BytesIO(buffer.read()),
+        io.BytesIO(_render_pdf(report_type, province, data)),
         media_type="application/pdf",
         headers={"Content-Disposition": f"attachment; filename={report_type}_report.pdf"}
     )
@@ -292,7 +317,7 @@ async def export_pdf_report(
 @router.get("/saved", response_model=List[SavedReport])
 async def get_saved_reports(
     user_id: int = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get user's saved reports"""
     result = await db.execute(
@@ -302,7 +327,7 @@ async def get_saved_reports(
     )
     reports = result.scalars().all()
 
-    return [SavedReport.model_validate(r) for r in reports]
+    return json_response([SavedReport.model_validate(r) for r in reports])
 
 
 @router.post("/saved", response_model=SavedReport, status_code=status.HTTP_201_CREATED)
@@ -323,7 +348,9 @@ async def save_report(
 
     logger.info(f"Report saved: {report_data.name} by user {user_id}")
 
-    return SavedReport.model_validate(new_report)
+    return json_response(
+        SavedReport.model_validate(new_report), status_code=status.HTTP_201_CREATED
+    )
 
 
 @router.delete("/saved/{report_id}", status_code=status.HTTP_204_NO_CONTENT)
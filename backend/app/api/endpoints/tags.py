@@ -10,7 +10,7 @@ import logging
 from app.db.session import get_db
 from app.core.security import get_current_user_id
 from app.schemas.schemas import TagCreate, TagUpdate, Tag
-from app.models.models import Tag as TagModel, User
+from app.models.models import Tag as TagModel, User, Project, ProjectTag
 
 logger = logging.getLogger(__name__)
 
@@ -151,26 +151,34 @@ async def get_tag_projects(
     db: AsyncSession = Depends(get_db)
 ):
     """Get all projects with this tag"""
-    result = await db.execute(
-        select(TagModel).where(TagModel.id == tag_id)
-    )
-    tag = result.scalar_one_or_none()
-
-    if not tag:
+    result = await db.execute(select(TagModel.id).where(TagModel.id == tag_id))
+    if result.scalar() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Tag not found"
         )
 
-    # Get projects with count
+    # One narrow join instead of loading the tag and lazily its projects
+    result = await db.execute(
+        select(
+            Project.id,
+            Project.site_code,
+            Project.project_name,
+            Project.status,
+        )
+        .join(ProjectTag, ProjectTag.project_id == Project.id)
+        .where(ProjectTag.tag_id == tag_id)
+        .order_by(Project.id)
+    )
+
     projects = [
         {
-            "id": project.id,
-            "site_code": project.site_code,
-            "project_name": project.project_name,
-            "status": project.status.value
+            "id": row.id,
+            "site_code": row.site_code,
+            "project_name": row.project_name,
+            "status": row.status.value
         }
-        for project in tag.projects
+        for row in result.all()
     ]
 
     return projects
@@ -8,6 +8,7 @@ from typing import List
 
 from app.db.session import get_db
 from app.core.security import get_current_user_id, require_admin
+from app.core.principal_cache import principal_cache
 from app.schemas.schemas import User, UserUpdate, UserList
 from app.models.models import User as UserModel, UserRole
 import logging
@@ -97,6 +98,9 @@ async def update_user(
     await db.commit()
     await db.refresh(user)
 
+    # Role changes must take effect on the user's next request
+    await principal_cache.invalidate(user_id)
+
     logger.info(f"User updated: {user.username} by user {current_user_id}")
 
     return User.model_validate(user)
@@ -130,4 +134,6 @@ async def delete_user(
     await db.delete(user)
     await db.commit()
 
+    await principal_cache.invalidate(user_id)
+
     logger.info(f"User deleted: {user.username} by user {current_user_id}")
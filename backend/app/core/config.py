@@ -20,6 +20,16 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    PASSWORD_HASH_WORKERS: int = 2  # bcrypt threads per worker process
+    PASSWORD_HASH_MAX_PENDING: int = 32  # queued + running before 503
+    TOKEN_REVOCATION_REFRESH_INTERVAL: int = 5  # seconds
+    TOKEN_REVOCATION_REFRESH_OVERLAP: int = 60  # seconds a revocation may take to commit
+    TOKEN_REVOCATION_BLOOM_CAPACITY: int = 100000
+    TOKEN_REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+    TOKEN_REVOCATION_PRUNE_INTERVAL: int = 3600  # 1 hour
+    TOKEN_REVOCATION_PRUNE_CHUNK_SIZE: int = 5000
+    SESSION_PRUNE_INTERVAL: int = 3600  # 1 hour
+    SESSION_PRUNE_CHUNK_SIZE: int = 5000
 
     # Database
     DATABASE_URL: str = (
@@ -27,14 +37,47 @@ class Settings(BaseSettings):
     )
     DB_POOL_SIZE: int = 10
     DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a connection
+    DB_POOL_RECYCLE: int = 3600  # below MySQL wait_timeout
+    DB_SCHEMA_AUTO_UPGRADE: bool = True  # apply pending migrations at startup
+
+    # Read replicas (GET routes of analytics, reports, project list/map)
+    DATABASE_REPLICA_URLS: list[str] = []
+    DB_REPLICA_SELECTION: str = "least_connections"  # or "round_robin"
+    DB_REPLICA_MAX_LAG: float = 5.0  # seconds behind the primary before skipping it
+    DB_REPLICA_LAG_CHECK_INTERVAL: int = 5  # seconds
+    DB_READ_YOUR_WRITES_WINDOW: float = 10.0  # seconds a writer reads from the primary
+
+    # SQL profiling (Server-Timing header, N+1 detection, query budgets)
+    SQL_PROFILER_ENABLED: bool = True
+    SQL_QUERY_BUDGET: int = 15  # statements per request unless @query_budget
+    SQL_REPEAT_THRESHOLD: int = 5  # same statement shape this often looks like N+1
+    SQL_PROFILER_STRICT: bool = False  # fail requests over budget (tests/CI)
+
+    # Prometheus metrics on /metrics
+    METRICS_ENABLED: bool = True
+
+    # Startup warm-up (GET /api/ready answers 503 until it finishes)
+    WARMUP_ENABLED: bool = True
+    WARMUP_TIMEOUT: float = 30.0  # seconds before reporting ready anyway
+    WARMUP_PRINCIPALS: int = 200  # users with live sessions primed into the principal cache
 
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
     CACHE_TTL: int = 3600  # 1 hour
 
+    # In-process caches
+    PRINCIPAL_CACHE_TTL: int = 60  # 1 minute
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    PRINCIPAL_CACHE_SHARED: bool = False  # Share through REDIS_URL across workers
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000  # Verified access tokens, 0 disables
+
     # CORS
     BACKEND_CORS_ORIGINS: list[str] = ["http://localhost:3000", "http://localhost:8000"]
 
+    # Reverse proxies (addresses or CIDR ranges) whose X-Forwarded-For is trusted
+    TRUSTED_PROXIES: list[str] = []
+
     # Email
     SMTP_HOST: str = "smtp.gmail.com"
     SMTP_PORT: int = 587
@@ -47,6 +90,8 @@ class Settings(BaseSettings):
     # File Upload
     UPLOAD_DIR: str = "./uploads"
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB
+    UPLOAD_CHUNK_SIZE: int = 256 * 1024  # bytes copied per read/write
+    UPLOAD_FORM_OVERHEAD: int = 64 * 1024  # multipart boundaries, headers and form fields
     ALLOWED_FILE_TYPES: list[str] = [
         "image/jpeg",
         "image/png",
@@ -61,8 +106,29 @@ class Settings(BaseSettings):
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
 
+    # Activity log
+    ACTIVITY_LOG_QUEUE_SIZE: int = 10000
+    ACTIVITY_LOG_BATCH_SIZE: int = 500
+    ACTIVITY_LOG_FLUSH_INTERVAL_MS: int = 1000
+    ACTIVITY_LOG_RETENTION_MONTHS: int = 12
+    ACTIVITY_LOG_ARCHIVE: bool = False  # Keep expired partitions as archive tables
+    ACTIVITY_LOG_PARTITION_MONTHS_AHEAD: int = 3
+    ACTIVITY_LOG_DELETE_CHUNK_SIZE: int = 5000
+    ACTIVITY_LOG_MAINTENANCE_INTERVAL: int = 6 * 3600  # 6 hours
+
+    # Notifications
+    NOTIFICATION_RECONCILE_INTERVAL: int = 3600  # 1 hour
+    NOTIFICATION_RECONCILE_CHUNK_SIZE: int = 1000
+    NOTIFICATION_STREAM_HEARTBEAT: int = 15  # seconds
+    NOTIFICATION_STREAM_RETRY_MS: int = 5000
+    NOTIFICATION_QUEUE_SIZE: int = 10000  # queued project events
+    NOTIFICATION_BATCH_SIZE: int = 100
+    NOTIFICATION_FLUSH_INTERVAL_MS: int = 500
+    NOTIFICATION_INSERT_CHUNK_SIZE: int = 1000
+
     # WebSocket
     WS_MESSAGE_QUEUE_SIZE: int = 100
+    WS_SEND_TIMEOUT: float = 10.0  # seconds a send may block before the client is dropped
 
     class Config:
         env_file = ".env"
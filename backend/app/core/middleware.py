@@ -0,0 +1,216 @@
+"""
+ASGI middleware
+"""
+
+import ipaddress
+import json
+import logging
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import JSONResponse
+
+from app.services.activity_log import ActivityRecorder
+
+logger = logging.getLogger(__name__)
+
+MUTATING_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+# Largest response body inspected to find the id of a created entity
+MAX_CAPTURED_BODY = 64 * 1024
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", []):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+Networks = Tuple[Union[ipaddress.IPv4Network, ipaddress.IPv6Network], ...]
+
+
+def _is_trusted(address: str, trusted_proxies: Networks) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in trusted_proxies)
+
+
+def _client_ip(scope, trusted_proxies: Networks) -> Optional[str]:
+    """Address of the client; X-Forwarded-For only counts from a trusted proxy"""
+    client = scope.get("client")
+    peer = client[0] if client else None
+    forwarded = _header(scope, b"x-forwarded-for")
+    if peer is None or not forwarded or not _is_trusted(peer, trusted_proxies):
+        return peer
+
+    # Proxies append to the right; the first hop not added by one of ours
+    # is the client, anything left of it could have been sent by the client
+    hops = [hop.strip() for hop in forwarded.split(",")]
+    for hop in reversed(hops):
+        if not _is_trusted(hop, trusted_proxies):
+            return hop[:45]
+    return hops[0][:45]
+
+
+class StreamingAwareGZipMiddleware(GZipMiddleware):
+    """GZip that leaves Server-Sent Events streams uncompressed.
+
+    Compressing an event stream buffers events inside the compressor, so
+    clients asking for ``text/event-stream`` bypass it.
+    """
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and "text/event-stream" in (
+            _header(scope, b"accept") or ""
+        ):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+class RequestSizeLimitMiddleware:
+    """Refuse oversized request bodies on the given paths before reading them.
+
+    Form parsing spools the whole body before the endpoint runs, so a size
+    check in the endpoint only fires once everything has been received.
+    Here the declared ``Content-Length`` is checked first; a request without
+    one is refused, since its size is only known after reading it.
+    """
+
+    def __init__(self, app, limits: Dict[str, int]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        length = _header(scope, b"content-length")
+        if length is None or not length.isdigit():
+            status_code, detail = 411, "Content-Length required"
+        elif int(length) > limit:
+            status_code, detail = 413, f"Request body exceeds {limit} bytes"
+        else:
+            await self.app(scope, receive, send)
+            return
+
+        response = JSONResponse(
+            status_code=status_code,
+            content={"detail": detail, "status_code": status_code},
+            headers={"Connection": "close"},
+        )
+        await response(scope, receive, send)
+
+
+class ActivityLogMiddleware:
+    """Capture successful mutations and hand them to the activity recorder.
+
+    Only the collection prefixes in ``entity_types`` are tracked. The entity
+    id comes from the first numeric path parameter, or from the ``id`` of the
+    JSON body for create responses. Endpoints touching several entities set
+    ``request.state.activity_entity_ids`` instead and get one row per id,
+    plus ``request.state.activity_details`` merged into each row's details.
+    A mutation with no known id is not recorded. Recording is a
+    non-blocking enqueue. ``X-Forwarded-For`` is only honoured from peers in
+    ``trusted_proxies`` (addresses or CIDR ranges).
+    """
+
+    def __init__(
+        self,
+        app,
+        recorder: ActivityRecorder,
+        prefix: str,
+        entity_types: Dict[str, str],
+        trusted_proxies: Iterable[str] = (),
+    ):
+        self.app = app
+        self.recorder = recorder
+        self.prefix = prefix.rstrip("/") + "/"
+        self.entity_types = entity_types
+        self.trusted_proxies: Networks = tuple(
+            ipaddress.ip_network(proxy, strict=False) for proxy in trusted_proxies
+        )
+
+    def _entity_type(self, path: str) -> Optional[str]:
+        if not path.startswith(self.prefix):
+            return None
+        collection = path[len(self.prefix):].split("/", 1)[0]
+        return self.entity_types.get(collection)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in MUTATING_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        entity_type = self._entity_type(scope["path"])
+        if entity_type is None:
+            await self.app(scope, receive, send)
+            return
+
+        scope.setdefault("state", {})
+        status_code = 0
+        body = bytearray()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body" and status_code == 201:
+                if len(body) < MAX_CAPTURED_BODY:
+                    body.extend(message.get("body", b""))
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+        if not 200 <= status_code < 300:
+            return
+
+        try:
+            self._record(scope, entity_type, status_code, body)
+        except Exception as e:
+            logger.error(f"Failed to capture activity for {scope['path']}: {e}")
+
+    def _record(self, scope, entity_type: str, status_code: int, body: bytearray):
+        route = scope.get("route")
+        endpoint = getattr(route, "endpoint", None)
+        action = endpoint.__name__ if endpoint else scope["method"].lower()
+
+        state = scope["state"]
+        entity_ids = state.get("activity_entity_ids")
+        if entity_ids is None:
+            entity_id = next(
+                (
+                    int(value)
+                    for value in scope.get("path_params", {}).values()
+                    if str(value).isdigit()
+                ),
+                None,
+            )
+            if entity_id is None and body:
+                try:
+                    entity_id = json.loads(body).get("id")
+                except (ValueError, AttributeError):
+                    entity_id = None
+            entity_ids = [entity_id] if entity_id else []
+
+        details = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "status_code": status_code,
+            **state.get("activity_details", {}),
+        }
+        for entity_id in entity_ids:
+            self.recorder.record(
+                action=action,
+                entity_type=entity_type,
+                entity_id=entity_id,
+                user_id=state.get("user_id"),
+                details=details,
+                ip_address=_client_ip(scope, self.trusted_proxies),
+                user_agent=_header(scope, b"user-agent"),
+            )
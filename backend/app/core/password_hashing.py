@@ -0,0 +1,118 @@
+"""
+Bounded thread pool for bcrypt hashing and verification
+
+bcrypt is deliberately slow (hundreds of milliseconds of CPU per call) and
+would stall every other request if run on the event loop. Hashing runs on a
+small dedicated executor instead; bcrypt releases the GIL, so the loop keeps
+serving requests meanwhile. Admission is bounded: when more than
+``max_pending`` operations are queued or running, new ones are rejected with
+503 and a ``Retry-After`` estimate rather than piling up behind a login storm.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from fastapi import HTTPException, status
+
+from app.core.config import get_settings
+from app.core.security import get_password_hash, verify_password
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+T = TypeVar("T")
+
+
+class PasswordHasher:
+    """Runs password hashing on a bounded executor with admission control"""
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_run = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="bcrypt"
+            )
+        return self._executor
+
+    def _retry_after(self) -> int:
+        """Seconds until the current backlog should have drained"""
+        average = self.total_run / self.completed if self.completed else 0.3
+        return max(1, math.ceil(self.pending / self.workers * average))
+
+    def _timed(self, submitted: float, func: Callable[..., T], *args) -> T:
+        started = time.perf_counter()
+        wait = started - submitted
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        try:
+            return func(*args)
+        finally:
+            self.total_run += time.perf_counter() - started
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            if self.rejected % 100 == 1:
+                logger.warning(
+                    f"Password hashing saturated ({self.pending} pending), "
+                    f"{self.rejected} requests rejected so far"
+                )
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication is busy, please retry shortly",
+                headers={"Retry-After": str(self._retry_after())},
+            )
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._get_executor(), self._timed, time.perf_counter(), func, *args
+            )
+        finally:
+            self.pending -= 1
+            self.completed += 1
+
+    async def hash(self, password: str) -> str:
+        return await self.run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self.run(verify_password, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "running": min(self.pending, self.workers),
+            "queue_depth": max(0, self.pending - self.workers),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.total_wait / self.completed * 1000, 2) if self.completed else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 2),
+            "avg_hash_ms": round(self.total_run / self.completed * 1000, 2) if self.completed else 0.0,
+        }
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
@@ -0,0 +1,134 @@
+"""
+Short-lived cache of authenticated principals (user id, role, active flag)
+
+Every authenticated request needs the caller's role and ``is_active`` flag.
+Caching them for ``PRINCIPAL_CACHE_TTL`` seconds removes the user lookup from
+most requests. Entries are dropped explicitly when a user is updated or
+deleted. With ``PRINCIPAL_CACHE_SHARED`` the cache lives in Redis so that an
+invalidation on one worker is seen by all of them; otherwise each worker
+keeps its own copy and other workers may serve a stale role for up to one TTL.
+"""
+
+import logging
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from app.core.config import get_settings
+from app.models.models import UserRole
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+KEY_PREFIX = "principal:"
+
+
+class Principal(NamedTuple):
+    """The parts of a user that authorization decisions depend on"""
+
+    id: int
+    role: UserRole
+    is_active: bool
+
+
+class PrincipalCache:
+    """TTL cache of principals keyed by user id"""
+
+    def __init__(self, ttl: int, max_entries: int = 10000, redis_url: Optional[str] = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._local: Dict[int, Tuple[Principal, float]] = {}
+        self._redis = None
+        if redis_url:
+            import redis.asyncio as redis
+
+            self._redis = redis.from_url(redis_url)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    async def get(self, user_id: int) -> Optional[Principal]:
+        principal = await self._get(user_id)
+        if principal is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return principal
+
+    async def _get(self, user_id: int) -> Optional[Principal]:
+        if self._redis is not None:
+            try:
+                value = await self._redis.get(f"{KEY_PREFIX}{user_id}")
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Principal cache read failed: {e}")
+                return None
+            if value is None:
+                return None
+            role, is_active = value.decode().split("|")
+            return Principal(user_id, UserRole(role), is_active == "1")
+
+        entry = self._local.get(user_id)
+        if entry is None:
+            return None
+        principal, expires_at = entry
+        if expires_at <= time.monotonic():
+            self._local.pop(user_id, None)
+            return None
+        return principal
+
+    async def set(self, principal: Principal) -> None:
+        if self._redis is not None:
+            value = f"{principal.role.value}|{int(principal.is_active)}"
+            try:
+                await self._redis.set(f"{KEY_PREFIX}{principal.id}", value, ex=self.ttl)
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Principal cache write failed: {e}")
+            return
+
+        if len(self._local) >= self.max_entries:
+            self._evict()
+        self._local[principal.id] = (principal, time.monotonic() + self.ttl)
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        expired = [key for key, (_, expires_at) in self._local.items() if expires_at <= now]
+        for key in expired:
+            del self._local[key]
+        # Still full: drop the oldest insertions
+        while len(self._local) >= self.max_entries:
+            del self._local[next(iter(self._local))]
+
+    async def invalidate(self, user_id: int) -> None:
+        """Forget a user after their role or status changed"""
+        self.invalidations += 1
+        self._local.pop(user_id, None)
+        if self._redis is not None:
+            try:
+                await self._redis.delete(f"{KEY_PREFIX}{user_id}")
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Principal cache invalidation failed for user {user_id}: {e}")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": "redis" if self._redis is not None else "memory",
+            "entries": len(self._local),
+            "lookups": lookups,
+            "hits": self.hits,
+            "misses": self.misses,
+            # Every hit is a user SELECT the request did not have to run
+            "db_queries_saved": self.hits,
+            "db_queries_per_request": round(self.misses / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+        }
+
+
+principal_cache = PrincipalCache(
+    ttl=settings.PRINCIPAL_CACHE_TTL,
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    redis_url=settings.REDIS_URL if settings.PRINCIPAL_CACHE_SHARED else None,
+)
@@ -0,0 +1,34 @@
+"""
+JSON responses encoded by pydantic-core
+
+``FastJSONResponse`` is the application's default response class. It encodes
+with ``pydantic_core.to_json`` instead of the stdlib ``json`` module.
+
+Endpoints that already hold validated response models return them through
+``json_response()``. FastAPI passes Response objects through untouched, so
+the models are not dumped, validated against ``response_model`` again and
+re-encoded; the route keeps its ``response_model`` for the OpenAPI schema.
+Only pass instances of the route's response model (or plain JSON data),
+since nothing filters the output any more.
+"""
+
+from typing import Any, Mapping, Optional
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response serialized in Rust; NaN and infinity become null"""
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content, inf_nan_mode="null")
+
+
+def json_response(
+    content: Any,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> FastJSONResponse:
+    """Serialize already validated models (or plain data) straight to bytes"""
+    return FastJSONResponse(content, status_code=status_code, headers=headers)
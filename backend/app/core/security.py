@@ -2,22 +2,28 @@
 Security utilities for authentication and authorization
 """
 
+import hashlib
+import time
 from datetime import datetime, timedelta
 from typing import Optional, List
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.core.config import get_settings
+from app.core.principal_cache import Principal, principal_cache
+from app.core.token_cache import token_cache
 from app.db.session import get_db
 from app.models.models import User as UserModel, UserRole
+from app.services.token_revocation import new_jti, revocation_list
 
 settings = get_settings()
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -33,17 +39,26 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     expire = datetime.utcnow() + (
         expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     )
-    to_encode.update({"exp": expire, "type": "access"})
+    to_encode.update(
+        {"exp": expire, "iat": time.time(), "jti": new_jti(), "type": "access"}
+    )
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
 def create_refresh_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire, "type": "refresh"})
+    to_encode.update(
+        {"exp": expire, "iat": time.time(), "jti": new_jti(), "type": "refresh"}
+    )
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
+def hash_refresh_token(token: str) -> str:
+    """Fixed-length digest under which a refresh token's session is stored"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
 def decode_token(token: str) -> dict:
     try:
         return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
@@ -55,79 +70,124 @@ def decode_token(token: str) -> dict:
         )
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db),
-) -> UserModel:
-    token = credentials.credentials
-    payload = decode_token(token)
+def get_token_payload(token: str) -> dict:
+    """Verified claims of an access token"""
+    payload = token_cache.get(token)
 
-    if payload.get("type") != "access":
-        raise HTTPException(status_code=401, detail="Invalid token type")
+    if payload is None:
+        payload = decode_token(token)
 
-    user_id: int = payload.get("sub")
-    if user_id is None:
-        raise HTTPException(status_code=401, detail="Invalid token payload")
+        if payload.get("type") != "access":
+            raise HTTPException(status_code=401, detail="Invalid token type")
 
-    result = await db.execute(select(UserModel).where(UserModel.id == user_id))
-    user = result.scalar_one_or_none()
+        if payload.get("sub") is None:
+            raise HTTPException(status_code=401, detail="Invalid token payload")
 
-    if not user or not user.is_active:
+        token_cache.put(token, payload)
+
+    return payload
+
+
+def get_token_user_id(token: str) -> int:
+    """Validate an access token and return the user id it was issued to"""
+    return int(get_token_payload(token)["sub"])
+
+
+async def get_principal(user_id: int, db: AsyncSession) -> Principal:
+    """Role and active flag of a user, from the principal cache when possible"""
+    principal = await principal_cache.get(user_id)
+
+    if principal is None:
+        result = await db.execute(
+            select(UserModel.id, UserModel.role, UserModel.is_active).where(
+                UserModel.id == user_id
+            )
+        )
+        row = result.one_or_none()
+        if row is not None:
+            principal = Principal(row.id, row.role, bool(row.is_active))
+            await principal_cache.set(principal)
+
+    if principal is None or not principal.is_active:
         raise HTTPException(status_code=401, detail="User not found or inactive")
 
-    return user
+    return principal
 
 
-async def get_current_user_id(
+async def authenticate_token(token: str, db: AsyncSession) -> Principal:
+    """Principal of a valid, unrevoked access token"""
+    payload = get_token_payload(token)
+
+    if await revocation_list.is_revoked(payload, db):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return await get_principal(int(payload["sub"]), db)
+
+
+async def get_current_principal(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db),
-) -> int:
-    token = credentials.credentials
-    payload = decode_token(token)
+) -> Principal:
+    principal = await authenticate_token(credentials.credentials, db)
+    request.state.user_id = principal.id
+    return principal
 
-    if payload.get("type") != "access":
-        raise HTTPException(status_code=401, detail="Invalid token type")
 
-    user_id: int = payload.get("sub")
-    if user_id is None:
-        raise HTTPException(status_code=401, detail="Invalid token payload")
+async def get_current_user(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db),
+) -> UserModel:
+    principal = await authenticate_token(credentials.credentials, db)
 
-    result = await db.execute(select(UserModel).where(UserModel.id == user_id))
+    result = await db.execute(select(UserModel).where(UserModel.id == principal.id))
     user = result.scalar_one_or_none()
 
     if not user or not user.is_active:
         raise HTTPException(status_code=401, detail="User not found or inactive")
 
-    return user_id
+    request.state.user_id = user.id
+    return user
+
+
+async def get_current_user_id(
+    principal: Principal = Depends(get_current_principal),
+) -> int:
+    return principal.id
 
 
-async def require_admin(user: UserModel = Depends(get_current_user)) -> UserModel:
-    if user.role not in [UserRole.ADMIN]:
+async def require_admin(principal: Principal = Depends(get_current_principal)) -> int:
+    if principal.role not in [UserRole.ADMIN]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required"
         )
-    return user
+    return principal.id
 
 
-async def require_editor(user: UserModel = Depends(get_current_user)) -> UserModel:
-    if user.role not in [UserRole.ADMIN, UserRole.EDITOR]:
+async def require_editor(principal: Principal = Depends(get_current_principal)) -> int:
+    if principal.role not in [UserRole.ADMIN, UserRole.EDITOR]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Editor access required"
         )
-    return user
+    return principal.id
 
 
 class RoleChecker:
     def __init__(self, allowed_roles: List[str]):
         self.allowed_roles = allowed_roles
 
-    async def __call__(self, user: UserModel = Depends(get_current_user)) -> UserModel:
-        if user.role.value not in self.allowed_roles:
+    async def __call__(self, principal: Principal = Depends(get_current_principal)) -> int:
+        if principal.role.value not in self.allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Access denied. Required roles: {', '.join(self.allowed_roles)}",
             )
-        return user
+        return principal.id
 
 
 require_viewer = RoleChecker(["admin", "editor", "viewer"])
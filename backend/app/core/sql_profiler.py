@@ -0,0 +1,153 @@
+"""
+Per-request SQL statement profiling
+
+Cursor execution events of the engine are attributed to the current request
+through a context variable. ``QueryProfilerMiddleware`` reports the number of
+statements and the time spent in the database as a ``Server-Timing`` header,
+logs statement fingerprints that repeat within one request (the usual N+1
+shape) and enforces a query budget per route. In strict mode a route that
+exceeds its budget fails with ``QueryBudgetExceeded`` instead of only
+logging, which makes regressions visible in tests.
+
+Routes with a legitimately higher (or lower) budget declare it with
+``@query_budget(n)`` below the router decorator.
+"""
+
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# Collapse expanded IN lists and literals so repeated shapes compare equal
+_IN_LIST = re.compile(r"\(\s*(?:%s|\?|:\w+)(?:\s*,\s*(?:%s|\?|:\w+))*\s*\)")
+_NUMBER = re.compile(r"\b\d+\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """A request issued more SQL statements than its route allows"""
+
+
+def fingerprint(statement: str) -> str:
+    statement = _IN_LIST.sub("(?)", statement)
+    statement = _NUMBER.sub("N", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+class RequestProfile:
+    """Statements executed on behalf of one request"""
+
+    __slots__ = ("count", "duration", "fingerprints")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints: Counter = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        return [
+            (statement, count)
+            for statement, count in self.fingerprints.most_common()
+            if count >= threshold
+        ]
+
+
+_current: ContextVar[Optional[RequestProfile]] = ContextVar("sql_profile", default=None)
+
+
+def current_profile() -> Optional[RequestProfile]:
+    return _current.get()
+
+
+def attach(engine: AsyncEngine) -> None:
+    """Time every cursor execution and attribute it to the current request"""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._profiler_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        profile = _current.get()
+        if profile is not None:
+            profile.record(statement, time.perf_counter() - context._profiler_started)
+
+
+def query_budget(limit: int) -> Callable:
+    """Override the default statement budget of a route"""
+
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.__query_budget__ = limit
+        return endpoint
+
+    return decorator
+
+
+class QueryProfilerMiddleware:
+    """Profile SQL per HTTP request and emit a Server-Timing header"""
+
+    def __init__(self, app, budget: int, repeat_threshold: int, strict: bool = False):
+        self.app = app
+        self.budget = budget
+        self.repeat_threshold = repeat_threshold
+        self.strict = strict
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = _current.set(profile)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                self._check(scope, profile)
+                headers = list(message.get("headers", []))
+                headers.append(
+                    (
+                        b"server-timing",
+                        f'db;dur={profile.duration * 1000:.1f};desc="{profile.count} queries"'.encode(),
+                    )
+                )
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+
+    def _check(self, scope, profile: RequestProfile) -> None:
+        route = scope.get("route")
+        path = getattr(route, "path", scope["path"])
+        endpoint = getattr(route, "endpoint", None)
+        budget = getattr(endpoint, "__query_budget__", self.budget)
+
+        for statement, count in profile.repeated(self.repeat_threshold):
+            logger.warning(
+                f"Possible N+1 in {scope['method']} {path}: "
+                f"statement repeated {count}x: {statement[:200]}"
+            )
+
+        if profile.count > budget:
+            message = (
+                f"{scope['method']} {path} issued {profile.count} SQL statements "
+                f"(budget {budget})"
+            )
+            if self.strict:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
@@ -0,0 +1,148 @@
+"""
+Connection pool instrumentation
+
+``InstrumentedQueuePool`` times how long callers wait to get a connection and
+pool events track checkouts, hold times, connection lifetimes and failed
+pre-pings. The numbers are exposed on ``/api/v1/admin/db-pool`` to size
+``DB_POOL_SIZE`` / ``DB_MAX_OVERFLOW`` from data.
+"""
+
+import time
+from collections import deque
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+# Recent checkout waits kept for percentiles
+WAIT_SAMPLES = 2048
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 2)
+
+
+def _percentile(samples, fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class PoolMetrics:
+    """Counters fed by the instrumented pool and pool events"""
+
+    def __init__(self):
+        self.pool: Optional[Pool] = None
+        self.checkouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.waits = deque(maxlen=WAIT_SAMPLES)
+        self.hold_total = 0.0
+        self.hold_max = 0.0
+        self.checkins = 0
+        self.connections_opened = 0
+        self.connections_closed = 0
+        self.lifetime_total = 0.0
+        self.lifetime_max = 0.0
+        self.invalidated = 0
+        self.pre_ping_failures = 0
+
+    def record_wait(self, seconds: float) -> None:
+        self.wait_total += seconds
+        self.wait_max = max(self.wait_max, seconds)
+        self.waits.append(seconds)
+
+    def attach(self, engine: AsyncEngine) -> None:
+        """Register pool and engine event listeners"""
+        sync_engine = engine.sync_engine
+        self.pool = sync_engine.pool
+
+        @event.listens_for(sync_engine, "connect")
+        def _connect(dbapi_connection, record):
+            record.info["connected_at"] = time.monotonic()
+            self.connections_opened += 1
+
+        @event.listens_for(sync_engine, "checkout")
+        def _checkout(dbapi_connection, record, proxy):
+            record.info["checked_out_at"] = time.monotonic()
+            self.checkouts += 1
+
+        @event.listens_for(sync_engine, "checkin")
+        def _checkin(dbapi_connection, record):
+            started = record.info.pop("checked_out_at", None)
+            if started is not None:
+                held = time.monotonic() - started
+                self.hold_total += held
+                self.hold_max = max(self.hold_max, held)
+                self.checkins += 1
+
+        @event.listens_for(sync_engine, "close")
+        def _close(dbapi_connection, record):
+            connected = record.info.pop("connected_at", None)
+            self.connections_closed += 1
+            if connected is not None:
+                lifetime = time.monotonic() - connected
+                self.lifetime_total += lifetime
+                self.lifetime_max = max(self.lifetime_max, lifetime)
+
+        @event.listens_for(sync_engine, "invalidate")
+        def _invalidate(dbapi_connection, record, exception):
+            self.invalidated += 1
+
+        @event.listens_for(sync_engine, "handle_error")
+        def _handle_error(context):
+            if context.is_pre_ping:
+                self.pre_ping_failures += 1
+
+    def stats(self) -> dict:
+        pool = self.pool
+        size = pool.size() if hasattr(pool, "size") else 0
+        max_overflow = getattr(pool, "_max_overflow", 0)
+        checked_out = pool.checkedout() if hasattr(pool, "checkedout") else 0
+        capacity = size + max(max_overflow, 0)
+
+        return {
+            "pool": type(pool).__name__ if pool is not None else None,
+            "size": size,
+            "max_overflow": max_overflow,
+            "checked_out": checked_out,
+            "checked_in": pool.checkedin() if hasattr(pool, "checkedin") else 0,
+            "overflow_in_use": max(0, pool.overflow()) if hasattr(pool, "overflow") else 0,
+            "saturation": round(checked_out / capacity, 4) if capacity > 0 else None,
+            "checkouts": self.checkouts,
+            "checkout_wait_ms": {
+                "avg": _ms(self.wait_total / self.checkouts) if self.checkouts else 0.0,
+                "p50": _ms(_percentile(self.waits, 0.5)),
+                "p99": _ms(_percentile(self.waits, 0.99)),
+                "max": _ms(self.wait_max),
+            },
+            "hold_ms": {
+                "avg": _ms(self.hold_total / self.checkins) if self.checkins else 0.0,
+                "max": _ms(self.hold_max),
+            },
+            "connections_opened": self.connections_opened,
+            "connections_closed": self.connections_closed,
+            "connection_lifetime_s": {
+                "avg": round(self.lifetime_total / self.connections_closed, 1)
+                if self.connections_closed else 0.0,
+                "max": round(self.lifetime_max, 1),
+            },
+            "invalidated": self.invalidated,
+            "pre_ping_failures": self.pre_ping_failures,
+        }
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_metrics.record_wait(time.perf_counter() - started)
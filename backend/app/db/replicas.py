@@ -0,0 +1,309 @@
+"""
+Read replica routing
+
+Read-only GET routes take their session from ``get_read_db``. Without
+``DATABASE_REPLICA_URLS`` that is a primary session, same as ``get_db``.
+Otherwise one replica is picked, by fewest sessions in use or round robin,
+among those whose last lag check was within ``DB_REPLICA_MAX_LAG``. The
+primary serves the read when no replica qualifies.
+
+Read-your-writes: ``ReadYourWritesMiddleware`` notes the user of every
+mutating request before its response is sent. That user's reads then go to
+the primary for ``DB_READ_YOUR_WRITES_WINDOW`` seconds, so their own change
+is visible despite replica lag. The window's end travels with the response
+as a cookie signed with ``SECRET_KEY``, so whichever worker serves the next
+read honours it; the writing worker also remembers it for clients that do
+not keep cookies.
+"""
+
+import hashlib
+import hmac
+import itertools
+import logging
+import math
+import time
+from typing import AsyncIterator, Dict, List, Optional
+
+from fastapi import Depends, Request
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core import sql_profiler
+from app.core.config import get_settings
+from app.core.middleware import MUTATING_METHODS
+from app.core.security import get_current_user_id
+from app.db.session import AsyncSessionLocal, pool_options
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+SELECTION_POLICIES = {"least_connections", "round_robin"}
+
+# Prune expired read-your-writes entries once the map grows past this
+STICKY_PRUNE_SIZE = 10000
+
+READ_YOUR_WRITES_COOKIE = "atlas_rw"
+
+
+def _signature(user_id: int, until: int) -> str:
+    message = f"{user_id}:{until}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+
+def _cookie_is_current(cookie: str, user_id: int) -> bool:
+    """The cookie was issued by a worker to this user and has not expired"""
+    try:
+        cookie_user, until, signature = cookie.split(":")
+        cookie_user, until = int(cookie_user), int(until)
+    except ValueError:
+        return False
+    return (
+        cookie_user == user_id
+        and until > time.time()
+        and hmac.compare_digest(signature, _signature(user_id, until))
+    )
+
+
+class Replica:
+    """A replica engine with its sessions in use and last measured lag"""
+
+    def __init__(self, url: str):
+        self.name = make_url(url).render_as_string(hide_password=True)
+        self.engine = create_async_engine(
+            url,
+            echo=False,
+            pool_pre_ping=True,
+            **pool_options(url, instrumented=False),
+        )
+        if settings.SQL_PROFILER_ENABLED:
+            sql_profiler.attach(self.engine)
+        self.sessionmaker = async_sessionmaker(
+            self.engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autocommit=False,
+            autoflush=False,
+        )
+        self.in_use = 0
+        self.reads = 0
+        # Seconds behind the primary; None while replication is stopped
+        self.lag: Optional[float] = 0.0
+        self.reachable = True
+        # Replication status missing at the last check (warned once)
+        self.lag_unknown = False
+
+    async def measure_lag(self) -> Optional[float]:
+        """Seconds behind the source as reported by the replica itself"""
+        async with self.engine.connect() as conn:
+            if self.engine.dialect.name != "mysql":
+                # SQLite stand-ins have no replication; only check they answer
+                await conn.execute(text("SELECT 1"))
+                return 0.0
+            try:
+                row = (await conn.execute(text("SHOW REPLICA STATUS"))).mappings().first()
+            except DBAPIError:
+                # MySQL before 8.0.22. Without the REPLICATION CLIENT grant both
+                # statements are denied; the error reaches check_lag(), which
+                # takes the replica out of rotation as unreachable.
+                row = (await conn.execute(text("SHOW SLAVE STATUS"))).mappings().first()
+
+        if row is None:
+            # The server has no replication configured, so there is no lag to
+            # read. It is used as if current; say so once.
+            if not self.lag_unknown:
+                self.lag_unknown = True
+                logger.warning(
+                    f"Replica {self.name} reports no replication status; "
+                    "its lag cannot be measured and is taken as 0"
+                )
+            return 0.0
+        self.lag_unknown = False
+        lag = row.get("Seconds_Behind_Source", row.get("Seconds_Behind_Master"))
+        return None if lag is None else float(lag)
+
+
+class ReplicaRouter:
+    """Chooses the database for read-only requests"""
+
+    def __init__(
+        self,
+        urls: List[str],
+        selection: str = "least_connections",
+        max_lag: float = 5.0,
+        sticky_window: float = 10.0,
+    ):
+        if selection not in SELECTION_POLICIES:
+            raise ValueError(f"Unknown replica selection policy: {selection}")
+        self.replicas = [Replica(url) for url in urls]
+        self.selection = selection
+        self.max_lag = max_lag
+        self.sticky_window = sticky_window
+        self.primary_reads = 0
+        self._rotation = itertools.count()
+        self._recent_writers: Dict[int, float] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def note_write(self, user_id: int) -> str:
+        """Send this user's reads to the primary for the stickiness window.
+
+        Returns the read-your-writes cookie value for the response.
+        """
+        now = time.monotonic()
+        if len(self._recent_writers) >= STICKY_PRUNE_SIZE:
+            self._recent_writers = {
+                uid: until for uid, until in self._recent_writers.items() if until > now
+            }
+        self._recent_writers[user_id] = now + self.sticky_window
+
+        until = math.ceil(time.time() + self.sticky_window)
+        return f"{user_id}:{until}:{_signature(user_id, until)}"
+
+    def is_sticky(self, user_id: Optional[int], cookie: Optional[str] = None) -> bool:
+        if user_id is None:
+            return False
+        until = self._recent_writers.get(user_id)
+        if until is not None and until > time.monotonic():
+            return True
+        return cookie is not None and _cookie_is_current(cookie, user_id)
+
+    def eligible(self) -> List[Replica]:
+        return [
+            replica
+            for replica in self.replicas
+            if replica.reachable and replica.lag is not None and replica.lag <= self.max_lag
+        ]
+
+    def choose(
+        self, user_id: Optional[int] = None, cookie: Optional[str] = None
+    ) -> Optional[Replica]:
+        """Replica for this read, or None to use the primary"""
+        if not self.replicas or self.is_sticky(user_id, cookie):
+            return None
+        candidates = self.eligible()
+        if not candidates:
+            return None
+
+        # Rotating the start spreads ties between equally loaded replicas
+        start = next(self._rotation) % len(candidates)
+        rotated = candidates[start:] + candidates[:start]
+        if self.selection == "round_robin":
+            return rotated[0]
+        return min(rotated, key=lambda replica: replica.in_use)
+
+    async def check_lag(self) -> None:
+        """Refresh every replica's lag; unreachable replicas are skipped"""
+        for replica in self.replicas:
+            was_eligible = replica in self.eligible()
+            try:
+                replica.lag = await replica.measure_lag()
+                replica.reachable = True
+            except Exception as e:
+                replica.reachable = False
+                if was_eligible:
+                    logger.warning(f"Replica {replica.name} unreachable: {e}")
+                continue
+
+            if was_eligible and replica not in self.eligible():
+                logger.warning(
+                    f"Replica {replica.name} lagging ({replica.lag}s), reading from the primary"
+                )
+            elif not was_eligible and replica in self.eligible():
+                logger.info(f"Replica {replica.name} back in rotation ({replica.lag}s behind)")
+
+    def stats(self) -> dict:
+        return {
+            "selection": self.selection,
+            "max_lag": self.max_lag,
+            "primary_reads": self.primary_reads,
+            "sticky_users": sum(
+                1 for until in self._recent_writers.values() if until > time.monotonic()
+            ),
+            "replicas": [
+                {
+                    "name": replica.name,
+                    "reachable": replica.reachable,
+                    "lag": replica.lag,
+                    "lag_unknown": replica.lag_unknown,
+                    "in_use": replica.in_use,
+                    "reads": replica.reads,
+                }
+                for replica in self.replicas
+            ],
+        }
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+async def get_read_db(
+    request: Request,
+    user_id: int = Depends(get_current_user_id),
+) -> AsyncIterator[AsyncSession]:
+    """Session for read-only routes: a replica when one is fresh enough"""
+    replica = replica_router.choose(user_id, request.cookies.get(READ_YOUR_WRITES_COOKIE))
+    if replica is None:
+        replica_router.primary_reads += 1
+        async with AsyncSessionLocal() as session:
+            yield session
+        return
+
+    replica.in_use += 1
+    replica.reads += 1
+    try:
+        async with replica.sessionmaker() as session:
+            yield session
+    finally:
+        replica.in_use -= 1
+
+
+class ReadYourWritesMiddleware:
+    """Pin the author of a mutating request to the primary for a while.
+
+    The write is noted when the response starts, i.e. before the client can
+    send its next request, and the response sets the read-your-writes
+    cookie. ``user_id`` is set on the request state by the authentication
+    dependencies.
+    """
+
+    def __init__(self, app, router: ReplicaRouter):
+        self.app = app
+        self.router = router
+        self.cookie_attributes = (
+            f"Max-Age={math.ceil(router.sticky_window)}; Path=/; HttpOnly; SameSite=Lax"
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in MUTATING_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        scope.setdefault("state", {})
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                user_id = scope["state"].get("user_id")
+                if user_id is not None:
+                    cookie = self.router.note_write(user_id)
+                    headers = list(message.get("headers", []))
+                    headers.append((
+                        b"set-cookie",
+                        f"{READ_YOUR_WRITES_COOKIE}={cookie}; {self.cookie_attributes}".encode(),
+                    ))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+replica_router = ReplicaRouter(
+    settings.DATABASE_REPLICA_URLS,
+    selection=settings.DB_REPLICA_SELECTION,
+    max_lag=settings.DB_REPLICA_MAX_LAG,
+    sticky_window=settings.DB_READ_YOUR_WRITES_WINDOW,
+)
@@ -0,0 +1,207 @@
+"""
+Schema version check and upgrades
+
+Workers used to run ``Base.metadata.create_all`` on every boot, which
+reflects each table (a round trip per table on MySQL). Now the database
+records the version it was created or upgraded to in ``schema_version``,
+and a booting worker only reads that row:
+
+- same version: nothing else to do
+- empty database: ``create_all`` and stamp ``SCHEMA_VERSION``
+- older or unrecorded version: ``create_all`` for missing tables, then the
+  pending migrations, then stamp. Migrations check the current columns
+  first, so a database upgraded by hand is only stamped
+- newer version: refuse to start; the code is older than the database
+
+On MySQL the upgrade holds a named lock, so workers booting together
+apply it once.
+
+    python -m app.db.schema              # show the recorded version
+    python -m app.db.schema --upgrade    # upgrade without starting the API
+"""
+
+import argparse
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional, Set, Tuple
+
+from sqlalchemy import func, inspect, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import get_settings
+from app.db.session import Base, engine
+from app.models.models import SchemaVersion, Session
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+UPGRADE_LOCK = "project_tracker_schema_upgrade"
+UPGRADE_LOCK_TIMEOUT = 60  # seconds
+
+
+class SchemaVersionError(RuntimeError):
+    """The database schema does not match this version of the code"""
+
+
+async def _columns(conn: AsyncConnection, table: str) -> Set[str]:
+    return await conn.run_sync(
+        lambda sync_conn: {column["name"] for column in inspect(sync_conn).get_columns(table)}
+    )
+
+
+def _is_mysql(conn: AsyncConnection) -> bool:
+    return conn.dialect.name == "mysql"
+
+
+# ==================== Migrations ====================
+
+
+async def _add_unread_notifications(conn: AsyncConnection) -> None:
+    if "unread_notifications" in await _columns(conn, "users"):
+        return
+    await conn.execute(text(
+        "ALTER TABLE users ADD COLUMN unread_notifications INTEGER NOT NULL DEFAULT 0"
+    ))
+    await conn.execute(text(
+        "UPDATE users SET unread_notifications = (SELECT COUNT(*) FROM notifications "
+        "WHERE notifications.user_id = users.id AND is_read = 0)"
+    ))
+
+
+async def _add_tokens_not_before(conn: AsyncConnection) -> None:
+    if "tokens_not_before" in await _columns(conn, "users"):
+        return
+    column_type = "DATETIME(6)" if _is_mysql(conn) else "DATETIME"
+    await conn.execute(text(f"ALTER TABLE users ADD COLUMN tokens_not_before {column_type} NULL"))
+
+
+async def _hash_session_refresh_tokens(conn: AsyncConnection) -> None:
+    if "refresh_token_hash" in await _columns(conn, "sessions"):
+        return
+    if not _is_mysql(conn):
+        # SQLite cannot drop a unique column in place; recreating the table
+        # signs every user out, which is acceptable for local databases
+        logger.warning("Recreating the sessions table; existing sessions are dropped")
+        await conn.execute(text("DROP TABLE sessions"))
+        await conn.run_sync(Session.__table__.create)
+        return
+    await conn.execute(text("ALTER TABLE sessions ADD COLUMN refresh_token_hash CHAR(64) NULL"))
+    await conn.execute(text("UPDATE sessions SET refresh_token_hash = SHA2(refresh_token, 256)"))
+    await conn.execute(text(
+        "ALTER TABLE sessions MODIFY refresh_token_hash CHAR(64) NOT NULL, "
+        "ADD UNIQUE INDEX ix_sessions_refresh_token_hash (refresh_token_hash), "
+        "DROP COLUMN refresh_token"
+    ))
+
+
+async def _add_attachment_checksum(conn: AsyncConnection) -> None:
+    if "checksum" in await _columns(conn, "attachments"):
+        return
+    await conn.execute(text("ALTER TABLE attachments ADD COLUMN checksum VARCHAR(64) NULL"))
+
+
+# (version, description, migration) in order; append only
+MIGRATIONS: List[Tuple[int, str, Callable[[AsyncConnection], Awaitable[None]]]] = [
+    (1, "per-user unread notification counters", _add_unread_notifications),
+    (2, "revoke all access tokens of a user", _add_tokens_not_before),
+    (3, "sessions keyed by refresh-token digest", _hash_session_refresh_tokens),
+    (4, "SHA-256 checksum of attachments", _add_attachment_checksum),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+# ==================== Version check ====================
+
+
+async def _read_version(conn: AsyncConnection) -> Optional[int]:
+    """Recorded version, or None without a (filled) schema_version table"""
+    try:
+        return (await conn.execute(select(func.max(SchemaVersion.version)))).scalar()
+    except DBAPIError as e:
+        if e.connection_invalidated:
+            raise
+        await conn.rollback()
+        return None
+
+
+async def current_version() -> Optional[int]:
+    async with engine.connect() as conn:
+        return await _read_version(conn)
+
+
+async def upgrade() -> int:
+    """Create missing tables and apply pending migrations"""
+    async with engine.connect() as conn:
+        if _is_mysql(conn):
+            locked = (await conn.execute(
+                text("SELECT GET_LOCK(:name, :timeout)"),
+                {"name": UPGRADE_LOCK, "timeout": UPGRADE_LOCK_TIMEOUT},
+            )).scalar()
+            if locked != 1:
+                raise SchemaVersionError("Timed out waiting for another schema upgrade")
+        try:
+            # Another worker may have finished the upgrade while we waited
+            version = await _read_version(conn)
+            if version == SCHEMA_VERSION:
+                return version
+
+            fresh = not await conn.run_sync(
+                lambda sync_conn: inspect(sync_conn).has_table("users")
+            )
+            await conn.run_sync(Base.metadata.create_all)
+
+            if fresh:
+                logger.info(f"Created schema version {SCHEMA_VERSION}")
+            else:
+                for target, description, migrate in MIGRATIONS:
+                    if target > (version or 0):
+                        logger.info(f"Upgrading schema to version {target}: {description}")
+                        await migrate(conn)
+
+            await conn.execute(SchemaVersion.__table__.insert(), {"version": SCHEMA_VERSION})
+            await conn.commit()
+            return SCHEMA_VERSION
+        finally:
+            if _is_mysql(conn):
+                await conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": UPGRADE_LOCK})
+
+
+async def ensure_schema(auto_upgrade: bool = True) -> int:
+    """Startup check: a single query when the schema is current"""
+    version = await current_version()
+    if version == SCHEMA_VERSION:
+        return version
+    if version is not None and version > SCHEMA_VERSION:
+        raise SchemaVersionError(
+            f"Database schema version {version} is newer than this code ({SCHEMA_VERSION})"
+        )
+    if not auto_upgrade:
+        raise SchemaVersionError(
+            f"Database schema version {version} is behind {SCHEMA_VERSION}; "
+            "run `python -m app.db.schema --upgrade`"
+        )
+    return await upgrade()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Database schema version")
+    parser.add_argument("--upgrade", action="store_true", help="apply pending migrations")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    async def run():
+        try:
+            if args.upgrade:
+                await upgrade()
+            version = await current_version()
+            print(f"Database schema version: {version} (code expects {SCHEMA_VERSION})")
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
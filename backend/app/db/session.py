@@ -3,20 +3,38 @@ Database configuration and session management
 """
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 from app.core.config import get_settings
+from app.core import sql_profiler
+from app.db.pool_metrics import InstrumentedQueuePool, pool_metrics
 
 settings = get_settings()
 
+
+def pool_options(url: str, instrumented: bool = True) -> dict:
+    """Pool settings for the primary and replica engines"""
+    if "sqlite" in url:
+        return {"poolclass": NullPool}
+    return {
+        # Only the primary pool feeds pool_metrics
+        "poolclass": InstrumentedQueuePool if instrumented else AsyncAdaptedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+
 # Create async engine
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=False,
-    pool_size=settings.DB_POOL_SIZE,
-    max_overflow=settings.DB_MAX_OVERFLOW,
     pool_pre_ping=True,
-    poolclass=NullPool if "sqlite" in settings.DATABASE_URL else None,
+    **pool_options(settings.DATABASE_URL),
 )
+pool_metrics.attach(engine)
+if settings.SQL_PROFILER_ENABLED:
+    sql_profiler.attach(engine)
 
 # Create async session maker
 AsyncSessionLocal = async_sessionmaker(
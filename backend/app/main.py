@@ -4,14 +4,32 @@ FastAPI application entry point
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 import logging
 
 from app.core.config import get_settings
+from app.core.password_hashing import password_hasher
+from app.core.middleware import (
+    ActivityLogMiddleware,
+    RequestSizeLimitMiddleware,
+    StreamingAwareGZipMiddleware,
+)
+from app.core.metrics import MetricsMiddleware, loop_lag_monitor, registry
+from app.core.responses import FastJSONResponse
+from app.core.sql_profiler import QueryProfilerMiddleware
+from app.db.replicas import ReadYourWritesMiddleware, replica_router
+from app.services.activity_log import activity_recorder
+from app.services.activity_retention import run_activity_log_maintenance
+from app.services.metrics_collectors import register_collectors
+from app.services.notification_fanout import notification_fanout
+from app.services.notifications import reconcile_unread_counts
+from app.services.scheduler import scheduler
+from app.services.session_pruning import prune_expired_sessions
+from app.services.token_revocation import prune_revoked_tokens, revocation_list
+from app.services.warmup import warmup
 from app.api.endpoints import (
     auth,
     projects,
@@ -22,6 +40,8 @@ from app.api.endpoints import (
     notifications,
     reports,
     analytics,
+    live,
+    admin,
 )
 
 # Configure logging
@@ -38,8 +58,37 @@ app = FastAPI(
     docs_url="/api/docs",
     redoc_url="/api/redoc",
     openapi_url="/api/openapi.json",
+    default_response_class=FastJSONResponse,
+)
+
+# Activity log capture for mutating API calls
+app.add_middleware(
+    ActivityLogMiddleware,
+    recorder=activity_recorder,
+    prefix=settings.API_V1_PREFIX,
+    entity_types={
+        "projects": "project",
+        "comments": "comment",
+        "attachments": "attachment",
+        "tags": "tag",
+    },
+    trusted_proxies=settings.TRUSTED_PROXIES,
+)
+
+# Oversized uploads are refused before their body is received
+app.add_middleware(
+    RequestSizeLimitMiddleware,
+    limits={
+        f"{settings.API_V1_PREFIX}/attachments/upload": (
+            settings.MAX_FILE_SIZE + settings.UPLOAD_FORM_OVERHEAD
+        ),
+    },
 )
 
+# Readers see their own writes: pin writers to the primary for a while
+if replica_router.enabled:
+    app.add_middleware(ReadYourWritesMiddleware, router=replica_router)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -50,7 +99,21 @@ app.add_middleware(
 )
 
 # GZip compression
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+app.add_middleware(StreamingAwareGZipMiddleware, minimum_size=1000)
+
+# Per-request SQL statement counts and timing
+if settings.SQL_PROFILER_ENABLED:
+    app.add_middleware(
+        QueryProfilerMiddleware,
+        budget=settings.SQL_QUERY_BUDGET,
+        repeat_threshold=settings.SQL_REPEAT_THRESHOLD,
+        strict=settings.SQL_PROFILER_STRICT,
+    )
+
+# Request metrics (outermost, so latency covers every other middleware)
+if settings.METRICS_ENABLED:
+    register_collectors()
+    app.add_middleware(MetricsMiddleware)
 
 
 # Exception handlers
@@ -60,6 +123,7 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     return JSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail, "status_code": exc.status_code},
+        headers=getattr(exc, "headers", None),
     )
 
 
@@ -75,11 +139,65 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 @app.on_event("startup")
 async def startup_event():
     """Initialize database and other resources"""
-    from app.db.session import init_db
+    from app.db.schema import ensure_schema
 
     logger.info("Starting up...")
-    await init_db()
-    logger.info("Database initialized")
+    version = await ensure_schema(auto_upgrade=settings.DB_SCHEMA_AUTO_UPGRADE)
+    logger.info(f"Database schema version {version}")
+
+    try:
+        await revocation_list.refresh()
+    except Exception as e:
+        # Revocation checks fall back to the database until a refresh succeeds
+        logger.error(f"Initial token revocation load failed: {e}")
+
+    await activity_recorder.start()
+    await notification_fanout.start()
+
+    if settings.METRICS_ENABLED:
+        loop_lag_monitor.start()
+
+    if replica_router.enabled:
+        await replica_router.check_lag()
+        scheduler.add_job(
+            "replica-lag-check",
+            replica_router.check_lag,
+            interval=settings.DB_REPLICA_LAG_CHECK_INTERVAL,
+        )
+
+    scheduler.add_job(
+        "activity-log-maintenance",
+        run_activity_log_maintenance,
+        interval=settings.ACTIVITY_LOG_MAINTENANCE_INTERVAL,
+        initial_delay=60,
+    )
+    scheduler.add_job(
+        "notification-counter-reconcile",
+        reconcile_unread_counts,
+        interval=settings.NOTIFICATION_RECONCILE_INTERVAL,
+    )
+    scheduler.add_job(
+        "token-revocation-refresh",
+        revocation_list.refresh,
+        interval=settings.TOKEN_REVOCATION_REFRESH_INTERVAL,
+    )
+    scheduler.add_job(
+        "revoked-token-prune",
+        prune_revoked_tokens,
+        interval=settings.TOKEN_REVOCATION_PRUNE_INTERVAL,
+    )
+    scheduler.add_job(
+        "session-prune",
+        prune_expired_sessions,
+        interval=settings.SESSION_PRUNE_INTERVAL,
+        initial_delay=120,
+    )
+    scheduler.start()
+
+    if settings.WARMUP_ENABLED:
+        warmup.start()
+    else:
+        warmup.mark_ready()
 
 
 # Shutdown event
@@ -88,6 +206,14 @@ async def shutdown_event():
     """Cleanup resources"""
     logger.info("Shutting down...")
 
+    await warmup.stop()
+    await loop_lag_monitor.stop()
+    await scheduler.stop()
+    await notification_fanout.stop()
+    await activity_recorder.stop()
+    await replica_router.dispose()
+    password_hasher.shutdown()
+
 
 # Health check endpoint
 @app.get("/api/health")
@@ -100,6 +226,26 @@ async def health_check():
     }
 
 
+# Readiness endpoint
+@app.get("/api/ready")
+async def readiness_check():
+    """Readiness endpoint: 503 until the worker has warmed up"""
+    if not warmup.ready:
+        return JSONResponse(status_code=503, content={"status": "warming_up"})
+    return {"status": "ready", **warmup.stats()}
+
+
+# Prometheus metrics
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus text exposition of this worker's metrics"""
+    if not settings.METRICS_ENABLED:
+        return PlainTextResponse("Metrics disabled\n", status_code=404)
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4"
+    )
+
+
 # Root endpoint
 @app.get("/")
 async def root():
@@ -151,6 +297,12 @@ app.include_router(
     analytics.router, prefix=f"{settings.API_V1_PREFIX}/analytics", tags=["Analytics"]
 )
 
+app.include_router(live.router, tags=["Live Updates"])
+
+app.include_router(
+    admin.router, prefix=f"{settings.API_V1_PREFIX}/admin", tags=["Admin"]
+)
+
 
 # Mount static files (uploads)
 app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
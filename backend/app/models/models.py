@@ -18,6 +18,7 @@ from sqlalchemy import (
     Index,
     CheckConstraint,
 )
+from sqlalchemy.dialects import mysql
 from sqlalchemy.orm import relationship, backref
 from sqlalchemy.sql import func
 from app.db.session import Base
@@ -84,6 +85,12 @@ class User(Base):
     password_reset_token = Column(String(255))
     password_reset_expires = Column(DateTime)
     last_login = Column(DateTime)
+    # Denormalized count of unread notifications, see app.services.notifications
+    unread_notifications = Column(Integer, nullable=False, default=0, server_default="0")
+    # Access tokens issued before this instant are rejected ("log out everywhere")
+    tokens_not_before = Column(
+        DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql")
+    )
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
@@ -130,6 +137,35 @@ class Project(Base):
     )
     notes = Column(Text)
     progress = Column(Integer, default=0)
+    created_by = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    assigned_to = Column(
+        Integer, ForeignKey("users.id", ondelete="SET NULL"), index=True
+    )
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    # Relationships
+    creator = relationship(
+        "User", foreign_keys=[created_by], back_populates="created_projects"
+    )
+    assignee = relationship(
+        "User", foreign_keys=[assigned_to], back_populates="assigned_projects"
+    )
+    tags = relationship("Tag", secondary="project_tags", back_populates="projects")
+    history = relationship(
+        "ProjectHistory", back_populates="project", cascade="all, delete-orphan"
+    )
+    comments = relationship(
+        "Comment", back_populates="project", cascade="all, delete-orphan"
+    )
+    attachments = relationship(
+        "Attachment", back_populates="project", cascade="all, delete-orphan"
+    )
+
     __table_args__ = (
         CheckConstraint("progress >= 0 AND progress <= 100"),
         Index(
@@ -183,6 +219,7 @@ class Attachment(Base):
     file_path = Column(String(500), nullable=False)
     file_size = Column(Integer, nullable=False)
     file_type = Column(String(100), nullable=False)
+    checksum = Column(String(64))  # SHA-256 hex digest, NULL for older uploads
     uploaded_by = Column(
         Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
     )
@@ -241,7 +278,9 @@ class Tag(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
-    creator = relationship("User")
+    # The tag schema always includes the creator; load it with the tags so
+    # serializing a project's tags never triggers a lazy load
+    creator = relationship("User", lazy="selectin")
     projects = relationship("Project", secondary="project_tags", back_populates="tags")
 
 
@@ -320,7 +359,11 @@ class SavedReport(Base):
 
 
 class ActivityLog(Base):
-    """Global activity log model"""
+    """Global activity log model
+
+    On MySQL this table can be range-partitioned by month on created_at, see
+    app.services.activity_retention.
+    """
 
     __tablename__ = "activity_log"
 
@@ -338,6 +381,20 @@ class ActivityLog(Base):
     user = relationship("User", back_populates="activity_logs")
 
 
+class RevokedToken(Base):
+    """Access token revoked before its expiry, see app.services.token_revocation"""
+
+    __tablename__ = "revoked_tokens"
+
+    id = Column(Integer, primary_key=True, index=True)
+    jti = Column(String(36), unique=True, nullable=False)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    expires_at = Column(DateTime, nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
 class Session(Base):
     """User session model for refresh tokens"""
 
@@ -347,7 +404,8 @@ class Session(Base):
     user_id = Column(
         Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
     )
-    refresh_token = Column(String(255), unique=True, nullable=False, index=True)
+    # SHA-256 hex digest of the refresh token, see security.hash_refresh_token
+    refresh_token_hash = Column(String(64), unique=True, nullable=False)
     device_info = Column(String(255))
     ip_address = Column(String(45))
     expires_at = Column(DateTime, nullable=False, index=True)
@@ -355,3 +413,12 @@ class Session(Base):
 
     # Relationships
     user = relationship("User", back_populates="sessions")
+
+
+class SchemaVersion(Base):
+    """Schema version the database was created or upgraded to, see app.db.schema"""
+
+    __tablename__ = "schema_version"
+
+    version = Column(Integer, primary_key=True, autoincrement=False)
+    applied_at = Column(DateTime(timezone=True), server_default=func.now())
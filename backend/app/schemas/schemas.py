@@ -4,7 +4,7 @@ Pydantic schemas for request/response validation
 
 from pydantic import BaseModel, EmailStr, Field, validator
 from typing import Optional, List, Dict, Any
-from datetime import datetime
+from datetime import date, datetime
 from app.models.models import UserRole, ProjectStatus, NotificationType, ReportType
 
 
@@ -133,8 +133,8 @@ class ProjectBase(BaseModel):
     district: Optional[str] = Field(None, max_length=50)
     latitude: float = Field(..., ge=-90, le=90)
     longitude: float = Field(..., ge=-180, le=180)
-    activation_date: str  # ISO format date string
-    completion_date: Optional[str] = None
+    activation_date: date
+    completion_date: Optional[date] = None
     status: ProjectStatus = ProjectStatus.PLANNING
     notes: Optional[str] = None
     progress: int = Field(0, ge=0, le=100)
@@ -158,8 +158,8 @@ class ProjectUpdate(BaseModel):
     district: Optional[str] = Field(None, max_length=50)
     latitude: Optional[float] = Field(None, ge=-90, le=90)
     longitude: Optional[float] = Field(None, ge=-180, le=180)
-    activation_date: Optional[str] = None
-    completion_date: Optional[str] = None
+    activation_date: Optional[date] = None
+    completion_date: Optional[date] = None
     status: Optional[ProjectStatus] = None
     notes: Optional[str] = None
     progress: Optional[int] = Field(None, ge=0, le=100)
@@ -245,6 +245,7 @@ class AttachmentBase(BaseModel):
     file_path: str
     file_size: int
     file_type: str
+    checksum: Optional[str] = None
     description: Optional[str] = None
 
 
@@ -516,6 +517,9 @@ class ActivityFeedItem(BaseModel):
     created_at: datetime
     user: Optional[User] = None
 
+    class Config:
+        from_attributes = True
+
 
 class HeatMapData(BaseModel):
     """Heat map data point"""
@@ -560,3 +564,4 @@ class BulkActionResponse(BaseModel):
 Project.model_rebuild()
 Comment.model_rebuild()
 Tag.model_rebuild()
+ProjectWithHistory.model_rebuild()
@@ -0,0 +1,57 @@
+"""
+Asynchronous activity log writer
+"""
+
+import logging
+from typing import List
+
+from sqlalchemy import insert
+
+from app.core.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.models.models import ActivityLog as ActivityLogModel
+from app.services.batching import BatchingQueue
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class ActivityRecorder(BatchingQueue[dict]):
+    """Buffers activity log rows and writes them with multi-row inserts"""
+
+    name = "activity-log"
+
+    def record(
+        self,
+        action: str,
+        entity_type: str,
+        entity_id: int,
+        user_id: int = None,
+        details: dict = None,
+        ip_address: str = None,
+        user_agent: str = None,
+    ) -> bool:
+        """Queue an activity entry; never blocks the caller"""
+        return self.put(
+            {
+                "user_id": user_id,
+                "action": action,
+                "entity_type": entity_type,
+                "entity_id": entity_id,
+                "details": details,
+                "ip_address": ip_address,
+                "user_agent": user_agent,
+            }
+        )
+
+    async def flush(self, batch: List[dict]) -> None:
+        async with AsyncSessionLocal() as db:
+            await db.execute(insert(ActivityLogModel).values(batch))
+            await db.commit()
+
+
+activity_recorder = ActivityRecorder(
+    max_size=settings.ACTIVITY_LOG_QUEUE_SIZE,
+    batch_size=settings.ACTIVITY_LOG_BATCH_SIZE,
+    flush_interval_ms=settings.ACTIVITY_LOG_FLUSH_INTERVAL_MS,
+)
@@ -0,0 +1,292 @@
+"""
+Partition maintenance and retention for the activity log
+
+On MySQL the ``activity_log`` table is range-partitioned by month on
+``created_at`` so that expired history is removed by dropping (or archiving)
+whole partitions instead of running large DELETEs. Other databases fall back
+to deleting expired rows in bounded chunks.
+
+Converting an existing table is a one-off, table-rebuilding operation and is
+therefore explicit:
+
+    python -m app.services.activity_retention --partition
+"""
+
+import argparse
+import asyncio
+import logging
+from datetime import date, datetime
+from typing import List, Tuple
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import get_settings
+from app.db.session import engine
+from app.models.models import ActivityLog as ActivityLogModel
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+TABLE = "activity_log"
+LOCK_NAME = "activity_log_maintenance"
+
+
+def _add_months(day: date, months: int) -> date:
+    """First day of the month ``months`` away from ``day``'s month"""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _partition_name(month: date) -> str:
+    return f"p{month:%Y%m}"
+
+
+def _partition_month(name: str) -> date:
+    return datetime.strptime(name[1:], "%Y%m").date()
+
+
+def _partition_clause(month: date) -> str:
+    upper = _add_months(month, 1)
+    return (
+        f"PARTITION {_partition_name(month)} "
+        f"VALUES LESS THAN (TO_DAYS('{upper.isoformat()}'))"
+    )
+
+
+async def _partitions(conn: AsyncConnection) -> List[str]:
+    """Monthly partition names of the activity log, oldest first"""
+    result = await conn.execute(
+        text(
+            "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table "
+            "AND PARTITION_NAME IS NOT NULL "
+            "ORDER BY PARTITION_ORDINAL_POSITION"
+        ),
+        {"table": TABLE},
+    )
+    return [name for name in result.scalars().all() if name != "pmax"]
+
+
+async def _is_partitioned(conn: AsyncConnection, table: str) -> bool:
+    result = await conn.execute(
+        text(
+            "SELECT COUNT(PARTITION_NAME) FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table"
+        ),
+        {"table": table},
+    )
+    return bool(result.scalar())
+
+
+async def _has_rows(conn: AsyncConnection, source: str) -> bool:
+    result = await conn.execute(text(f"SELECT EXISTS (SELECT 1 FROM {source})"))
+    return bool(result.scalar())
+
+
+async def enable_partitioning(conn: AsyncConnection, months_ahead: int) -> None:
+    """Convert activity_log into a monthly RANGE-partitioned table (MySQL)"""
+    if await _partitions(conn):
+        logger.info("activity_log is already partitioned")
+        return
+
+    # Partitioned InnoDB tables support neither foreign keys nor unique keys
+    # that exclude the partitioning column
+    result = await conn.execute(
+        text(
+            "SELECT CONSTRAINT_NAME FROM information_schema.REFERENTIAL_CONSTRAINTS "
+            "WHERE CONSTRAINT_SCHEMA = DATABASE() AND TABLE_NAME = :table"
+        ),
+        {"table": TABLE},
+    )
+    for constraint in result.scalars().all():
+        await conn.execute(text(f"ALTER TABLE {TABLE} DROP FOREIGN KEY {constraint}"))
+
+    await conn.execute(
+        text(
+            f"ALTER TABLE {TABLE} "
+            "MODIFY created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP, "
+            "DROP PRIMARY KEY, ADD PRIMARY KEY (id, created_at)"
+        )
+    )
+
+    # Back-filled rows can have low created_at values under high ids
+    result = await conn.execute(select(func.min(ActivityLogModel.created_at)))
+    oldest = result.scalar() or datetime.utcnow()
+    first = _add_months(oldest.date(), 0)
+    last = _add_months(date.today(), months_ahead)
+
+    clauses = []
+    month = first
+    while month <= last:
+        clauses.append(_partition_clause(month))
+        month = _add_months(month, 1)
+    clauses.append("PARTITION pmax VALUES LESS THAN MAXVALUE")
+
+    await conn.execute(
+        text(
+            f"ALTER TABLE {TABLE} PARTITION BY RANGE (TO_DAYS(created_at)) "
+            f"({', '.join(clauses)})"
+        )
+    )
+    logger.info(f"activity_log partitioned into {len(clauses)} partitions")
+
+
+async def ensure_future_partitions(
+    conn: AsyncConnection, partitions: List[str], months_ahead: int
+) -> None:
+    """Split pmax so there is always a partition for the coming months"""
+    newest = _partition_month(partitions[-1])
+    target = _add_months(date.today(), months_ahead)
+
+    clauses = []
+    month = _add_months(newest, 1)
+    while month <= target:
+        clauses.append(_partition_clause(month))
+        month = _add_months(month, 1)
+
+    if clauses:
+        clauses.append("PARTITION pmax VALUES LESS THAN MAXVALUE")
+        await conn.execute(
+            text(f"ALTER TABLE {TABLE} REORGANIZE PARTITION pmax INTO ({', '.join(clauses)})")
+        )
+        logger.info(f"Added {len(clauses) - 1} activity_log partitions")
+
+
+async def drop_expired_partitions(
+    conn: AsyncConnection, partitions: List[str], cutoff: date, archive: bool
+) -> List[str]:
+    """Drop (optionally archiving first) partitions entirely older than cutoff.
+
+    Each DDL statement commits on its own, so archiving resumes from whichever
+    step an interrupted earlier run reached.
+    """
+    expired = [
+        name for name in partitions if _add_months(_partition_month(name), 1) <= cutoff
+    ]
+
+    dropped = []
+    for name in expired:
+        if archive and not await _archive_partition(conn, name):
+            continue
+        await conn.execute(text(f"ALTER TABLE {TABLE} DROP PARTITION {name}"))
+        logger.info(f"Dropped activity_log partition {name} (archived: {archive})")
+        dropped.append(name)
+
+    return dropped
+
+
+async def _archive_partition(conn: AsyncConnection, name: str) -> bool:
+    """Move a partition's rows into its archive table; False if it must be kept"""
+    archive_table = f"{TABLE}_archive_{name[1:]}"
+    await conn.execute(text(f"CREATE TABLE IF NOT EXISTS {archive_table} LIKE {TABLE}"))
+    if await _is_partitioned(conn, archive_table):
+        await conn.execute(text(f"ALTER TABLE {archive_table} REMOVE PARTITIONING"))
+
+    if await _has_rows(conn, archive_table):
+        if not await _has_rows(conn, f"{TABLE} PARTITION ({name})"):
+            # Exchanged by an earlier run that stopped before the drop
+            return True
+        logger.error(
+            f"Both {archive_table} and partition {name} hold rows; keeping {name}"
+        )
+        return False
+
+    # EXCHANGE PARTITION swaps the rows into the empty table in O(1)
+    await conn.execute(
+        text(f"ALTER TABLE {TABLE} EXCHANGE PARTITION {name} WITH TABLE {archive_table}")
+    )
+    return True
+
+
+async def delete_expired_rows(
+    conn: AsyncConnection, cutoff: date, chunk_size: int
+) -> int:
+    """Fallback retention for unpartitioned tables: delete in bounded chunks"""
+    deleted = 0
+    while True:
+        result = await conn.execute(
+            select(ActivityLogModel.id)
+            .where(ActivityLogModel.created_at < cutoff)
+            .order_by(ActivityLogModel.id)
+            .limit(chunk_size)
+        )
+        ids = result.scalars().all()
+        if not ids:
+            break
+
+        await conn.execute(delete(ActivityLogModel).where(ActivityLogModel.id.in_(ids)))
+        await conn.commit()
+        deleted += len(ids)
+
+        if len(ids) < chunk_size:
+            break
+        await asyncio.sleep(0)
+
+    return deleted
+
+
+async def _acquire_lock(conn: AsyncConnection) -> bool:
+    """Take a MySQL advisory lock so only one worker runs maintenance"""
+    result = await conn.execute(text("SELECT GET_LOCK(:name, 0)"), {"name": LOCK_NAME})
+    return result.scalar() == 1
+
+
+async def run_activity_log_maintenance() -> Tuple[List[str], int]:
+    """Periodic job: keep partitions ahead of time and enforce retention"""
+    cutoff = _add_months(date.today(), -settings.ACTIVITY_LOG_RETENTION_MONTHS)
+
+    async with engine.connect() as conn:
+        if conn.dialect.name != "mysql":
+            deleted = await delete_expired_rows(
+                conn, cutoff, settings.ACTIVITY_LOG_DELETE_CHUNK_SIZE
+            )
+            await conn.commit()
+            if deleted:
+                logger.info(f"Deleted {deleted} expired activity_log rows")
+            return [], deleted
+
+        if not await _acquire_lock(conn):
+            return [], 0
+
+        try:
+            partitions = await _partitions(conn)
+            if not partitions:
+                deleted = await delete_expired_rows(
+                    conn, cutoff, settings.ACTIVITY_LOG_DELETE_CHUNK_SIZE
+                )
+                await conn.commit()
+                return [], deleted
+
+            await ensure_future_partitions(
+                conn, partitions, settings.ACTIVITY_LOG_PARTITION_MONTHS_AHEAD
+            )
+            dropped = await drop_expired_partitions(
+                conn, partitions, cutoff, settings.ACTIVITY_LOG_ARCHIVE
+            )
+            return dropped, 0
+        finally:
+            await conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": LOCK_NAME})
+
+
+async def _main(args) -> None:
+    if args.partition:
+        async with engine.connect() as conn:
+            if conn.dialect.name != "mysql":
+                raise SystemExit("Partitioning is only supported on MySQL")
+            await enable_partitioning(conn, settings.ACTIVITY_LOG_PARTITION_MONTHS_AHEAD)
+
+    dropped, deleted = await run_activity_log_maintenance()
+    print(f"Dropped partitions: {dropped or 'none'}; deleted rows: {deleted}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--partition",
+        action="store_true",
+        help="convert activity_log to a monthly partitioned table first",
+    )
+    asyncio.run(_main(parser.parse_args()))
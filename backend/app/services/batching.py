@@ -0,0 +1,148 @@
+"""
+Bounded background queue that flushes items in batches
+"""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Generic, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_STOP = object()
+
+
+class BatchingQueue(ABC, Generic[T]):
+    """Collects items off the request path and flushes them in batches.
+
+    ``put()`` never blocks: when the queue is full the item is dropped and
+    counted, so a slow database cannot stall request handling. A background
+    task flushes as soon as ``batch_size`` items are buffered, or
+    ``flush_interval_ms`` after the first item of a batch arrived.
+    Subclasses implement ``flush()``.
+    """
+
+    name = "batch"
+
+    def __init__(self, max_size: int, batch_size: int, flush_interval_ms: int):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._full: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._accepting = False
+        self.enqueued = 0
+        self.dropped = 0
+        self.flushed = 0
+        self.failed = 0
+
+    @abstractmethod
+    async def flush(self, batch: List[T]) -> None:
+        """Write one batch; exceptions are logged and the batch is counted failed"""
+
+    def put(self, item: T) -> bool:
+        """Enqueue an item without waiting; returns False if it was dropped"""
+        if not self._accepting:
+            self.dropped += 1
+            return False
+
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.dropped % 1000 == 1:
+                logger.warning(
+                    f"{self.name} queue full ({self.max_size}), "
+                    f"{self.dropped} items dropped so far"
+                )
+            return False
+
+        self.enqueued += 1
+        if self._queue.qsize() >= self.batch_size:
+            self._full.set()
+        return True
+
+    async def start(self) -> None:
+        """Start the background flush task"""
+        if self._task is not None:
+            return
+
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._full = asyncio.Event()
+        self._accepting = True
+        self._task = asyncio.create_task(self._run(), name=f"{self.name}-flusher")
+        logger.info(f"{self.name} queue started")
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Stop accepting items and flush everything already queued"""
+        if self._task is None:
+            return
+
+        self._accepting = False
+        self._full.set()
+        await self._queue.put(_STOP)
+
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except asyncio.TimeoutError:
+            logger.error(
+                f"{self.name} queue did not drain within {timeout}s, "
+                f"{self._queue.qsize()} items lost"
+            )
+        finally:
+            self._task = None
+
+        logger.info(f"{self.name} queue stopped ({self.flushed} items flushed)")
+
+    async def _run(self) -> None:
+        queue = self._queue
+
+        while True:
+            item = await queue.get()
+            stop = item is _STOP
+            batch = [] if stop else [item]
+
+            # Give the batch a chance to fill up before flushing
+            if not stop and queue.qsize() + 1 < self.batch_size:
+                self._full.clear()
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+            while len(batch) < self.batch_size:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+
+            if batch:
+                await self._flush_safely(batch)
+
+            if stop:
+                return
+
+    async def _flush_safely(self, batch: List[T]) -> None:
+        try:
+            await self.flush(batch)
+            self.flushed += len(batch)
+        except Exception as e:
+            self.failed += len(batch)
+            logger.error(f"{self.name} flush of {len(batch)} items failed: {e}")
+
+    def stats(self) -> dict:
+        """Get queue statistics"""
+        return {
+            "queued": self._queue.qsize() if self._queue else 0,
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "flushed": self.flushed,
+            "failed": self.failed,
+        }
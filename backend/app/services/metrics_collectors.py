@@ -0,0 +1,148 @@
+"""
+Scrape-time collectors exposing component statistics as metrics
+"""
+
+from app.core.metrics import register_collector
+from app.core.password_hashing import password_hasher
+from app.core.principal_cache import principal_cache
+from app.core.token_cache import token_cache
+from app.db.pool_metrics import pool_metrics
+from app.db.replicas import replica_router
+from app.services.activity_log import activity_recorder
+from app.services.notification_fanout import notification_fanout
+from app.services.notifications import notification_broker
+from app.services.project_queries import project_list_queries
+from app.services.realtime import project_hub
+from app.services.token_revocation import revocation_list
+
+
+def _pool_connections():
+    stats = pool_metrics.stats()
+    yield ("checked_out",), stats["checked_out"]
+    yield ("checked_in",), stats["checked_in"]
+    yield ("overflow",), stats["overflow_in_use"]
+
+
+def _pool_checkout_wait():
+    waits = pool_metrics.stats()["checkout_wait_ms"]
+    for quantile in ("p50", "p99", "max"):
+        yield (quantile,), waits[quantile] / 1000
+
+
+def _caches():
+    for name, stats in (
+        ("token", token_cache.stats()),
+        ("principal", principal_cache.stats()),
+        ("project_list_statements", project_list_queries.stats()),
+    ):
+        yield (name, "hit"), stats["hits"]
+        yield (name, "miss"), stats["misses"]
+
+
+def _cache_hit_ratio():
+    for name, stats in (
+        ("token", token_cache.stats()),
+        ("principal", principal_cache.stats()),
+        ("project_list_statements", project_list_queries.stats()),
+    ):
+        lookups = stats["hits"] + stats["misses"]
+        yield (name,), stats["hits"] / lookups if lookups else 0.0
+
+
+def _queue_stats():
+    return (
+        ("activity_log", activity_recorder.stats()),
+        ("notification_fanout", notification_fanout.stats()),
+    )
+
+
+def register_collectors() -> None:
+    register_collector(
+        "db_pool_connections",
+        "Pooled database connections by state",
+        _pool_connections,
+        ("state",),
+    )
+    register_collector(
+        "db_pool_size",
+        "Configured pool size and overflow limit",
+        lambda: [(("size",), pool_metrics.stats()["size"]),
+                 (("max_overflow",), pool_metrics.stats()["max_overflow"])],
+        ("limit",),
+    )
+    register_collector(
+        "db_pool_checkout_wait_seconds",
+        "Recent connection checkout wait",
+        _pool_checkout_wait,
+        ("quantile",),
+    )
+    register_collector(
+        "db_pool_pre_ping_failures_total",
+        "Connections found dead by the pre-ping",
+        lambda: [((), pool_metrics.pre_ping_failures)],
+        kind="counter",
+    )
+    if replica_router.enabled:
+        register_collector(
+            "db_replica_lag_seconds",
+            "Replica lag at the last check, -1 while replication is stopped",
+            lambda: [
+                ((replica.name,), -1 if replica.lag is None else replica.lag)
+                for replica in replica_router.replicas
+            ],
+            ("replica",),
+        )
+        register_collector(
+            "db_reads_total",
+            "Read-only sessions by the database that served them",
+            lambda: [(("primary",), replica_router.primary_reads)]
+            + [((replica.name,), replica.reads) for replica in replica_router.replicas],
+            ("database",),
+            kind="counter",
+        )
+    register_collector(
+        "cache_lookups_total",
+        "Cache lookups by cache and result",
+        _caches,
+        ("cache", "result"),
+        kind="counter",
+    )
+    register_collector(
+        "cache_hit_ratio",
+        "Share of cache lookups served from the cache",
+        _cache_hit_ratio,
+        ("cache",),
+    )
+    register_collector(
+        "background_queue_depth",
+        "Items waiting in a background batching queue",
+        lambda: [((name,), stats["queued"]) for name, stats in _queue_stats()],
+        ("queue",),
+    )
+    register_collector(
+        "background_queue_dropped_total",
+        "Items dropped because a background queue was full",
+        lambda: [((name,), stats["dropped"]) for name, stats in _queue_stats()],
+        ("queue",),
+        kind="counter",
+    )
+    register_collector(
+        "password_hash_queue_depth",
+        "bcrypt operations waiting for a hashing thread",
+        lambda: [((), password_hasher.stats()["queue_depth"])],
+    )
+    register_collector(
+        "token_revocation_bloom_hits_total",
+        "Revocation checks that needed a database lookup",
+        lambda: [((), revocation_list.bloom_hits)],
+        kind="counter",
+    )
+    register_collector(
+        "live_connections",
+        "Open WebSocket and notification stream connections",
+        lambda: [
+            (("websocket",), project_hub.stats()["clients"]),
+            (("notification_stream",), notification_broker.stats()["streams"]),
+        ],
+        ("kind",),
+    )
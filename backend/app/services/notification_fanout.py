@@ -0,0 +1,222 @@
+"""
+Batched notification fan-out for project events
+
+Request handlers only enqueue a compact event (type, actor, project ids); the
+background flusher resolves who should hear about it and writes the
+notification rows with multi-row inserts. Recipients of a project event are
+drawn from its assignee, its creator, its watchers (users who have commented
+on the project) and, for comments, the users mentioned in the comment. Each
+recipient gets one notification per event and project, and the actor never
+notifies themselves.
+"""
+
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+from sqlalchemy import insert, select
+
+from app.core.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.models.models import (
+    Comment as CommentModel,
+    Notification as NotificationModel,
+    NotificationType,
+    Project as ProjectModel,
+    ProjectStatus,
+)
+from app.services import notifications as unread_counter
+from app.services.batching import BatchingQueue
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+ASSIGNEE = "assignee"
+CREATOR = "creator"
+WATCHERS = "watchers"
+MENTIONS = "mentions"
+
+# Who hears about each kind of event
+AUDIENCES = {
+    NotificationType.NEW_PROJECT: (ASSIGNEE,),
+    NotificationType.PROJECT_ASSIGNED: (ASSIGNEE,),
+    NotificationType.PROJECT_STATUS_CHANGED: (ASSIGNEE, CREATOR, WATCHERS),
+    NotificationType.PROJECT_COMPLETED: (ASSIGNEE, CREATOR, WATCHERS),
+    NotificationType.COMMENT_ADDED: (ASSIGNEE, CREATOR, WATCHERS, MENTIONS),
+}
+
+TITLES = {
+    NotificationType.NEW_PROJECT: "New project",
+    NotificationType.PROJECT_ASSIGNED: "Project assigned to you",
+    NotificationType.PROJECT_STATUS_CHANGED: "Project status changed",
+    NotificationType.PROJECT_COMPLETED: "Project completed",
+    NotificationType.COMMENT_ADDED: "New comment",
+}
+
+
+def _chunks(items: Sequence, size: int) -> Iterable[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _message(event: dict, project) -> str:
+    label = f"{project.site_code} - {project.project_name}"
+    notification_type = event["type"]
+    if notification_type == NotificationType.NEW_PROJECT:
+        return f"{label} was created"
+    if notification_type == NotificationType.PROJECT_ASSIGNED:
+        return f"{label} was assigned to you"
+    if notification_type == NotificationType.PROJECT_COMPLETED:
+        return f"{label} was marked as done"
+    if notification_type == NotificationType.PROJECT_STATUS_CHANGED:
+        return f"{label} is now {event['data']['status']}"
+    return f"New comment on {label}"
+
+
+class NotificationFanout(BatchingQueue[dict]):
+    """Buffers project events and turns them into notification rows"""
+
+    name = "notification-fanout"
+
+    def __init__(self, max_size: int, batch_size: int, flush_interval_ms: int, insert_chunk_size: int):
+        super().__init__(max_size, batch_size, flush_interval_ms)
+        self.insert_chunk_size = insert_chunk_size
+        self.notifications_created = 0
+
+    def project_event(
+        self,
+        notification_type: NotificationType,
+        actor_id: int,
+        project_ids: Iterable[int],
+        data: Optional[dict] = None,
+    ) -> bool:
+        """Queue an event concerning one or more projects; never blocks"""
+        return self.put(
+            {
+                "type": notification_type,
+                "actor_id": actor_id,
+                "project_ids": list(project_ids),
+                "data": data or {},
+            }
+        )
+
+    def status_changed(self, actor_id: int, project_ids: Iterable[int], new_status: ProjectStatus) -> bool:
+        notification_type = (
+            NotificationType.PROJECT_COMPLETED
+            if new_status == ProjectStatus.DONE
+            else NotificationType.PROJECT_STATUS_CHANGED
+        )
+        return self.project_event(
+            notification_type, actor_id, project_ids, {"status": new_status.value}
+        )
+
+    def comment_added(self, actor_id: int, project_id: int, comment_id: int) -> bool:
+        return self.project_event(
+            NotificationType.COMMENT_ADDED,
+            actor_id,
+            [project_id],
+            {"comment_id": comment_id},
+        )
+
+    async def flush(self, batch: List[dict]) -> None:
+        project_ids = sorted({pid for event in batch for pid in event["project_ids"]})
+        needs_watchers = any(WATCHERS in AUDIENCES[event["type"]] for event in batch)
+        comment_ids = [
+            event["data"]["comment_id"]
+            for event in batch
+            if event["type"] == NotificationType.COMMENT_ADDED
+        ]
+
+        async with AsyncSessionLocal() as db:
+            projects = {}
+            watchers: Dict[int, Set[int]] = defaultdict(set)
+            for chunk in _chunks(project_ids, self.insert_chunk_size):
+                result = await db.execute(
+                    select(
+                        ProjectModel.id,
+                        ProjectModel.site_code,
+                        ProjectModel.project_name,
+                        ProjectModel.created_by,
+                        ProjectModel.assigned_to,
+                    ).where(ProjectModel.id.in_(chunk))
+                )
+                projects.update((row.id, row) for row in result.all())
+
+                if needs_watchers:
+                    result = await db.execute(
+                        select(CommentModel.project_id, CommentModel.user_id)
+                        .where(CommentModel.project_id.in_(chunk))
+                        .distinct()
+                    )
+                    for project_id, watcher_id in result.all():
+                        watchers[project_id].add(watcher_id)
+
+            mentions: Dict[int, Set[int]] = {}
+            if comment_ids:
+                result = await db.execute(
+                    select(CommentModel.id, CommentModel.mentions).where(
+                        CommentModel.id.in_(comment_ids)
+                    )
+                )
+                mentions = {
+                    comment_id: {int(user_id) for user_id in (mentioned or [])}
+                    for comment_id, mentioned in result.all()
+                }
+
+            rows = []
+            counts: Dict[int, int] = defaultdict(int)
+            for event in batch:
+                audience = AUDIENCES[event["type"]]
+                for project_id in event["project_ids"]:
+                    project = projects.get(project_id)
+                    if project is None:
+                        # Deleted before the event was flushed
+                        continue
+
+                    recipients = set()
+                    if ASSIGNEE in audience and project.assigned_to:
+                        recipients.add(project.assigned_to)
+                    if CREATOR in audience:
+                        recipients.add(project.created_by)
+                    if WATCHERS in audience:
+                        recipients |= watchers.get(project_id, set())
+                    if MENTIONS in audience:
+                        recipients |= mentions.get(event["data"].get("comment_id"), set())
+                    recipients.discard(event["actor_id"])
+
+                    data = {"project_id": project_id, "actor_id": event["actor_id"], **event["data"]}
+                    message = _message(event, project)
+                    for recipient in recipients:
+                        rows.append(
+                            {
+                                "user_id": recipient,
+                                "type": event["type"],
+                                "title": TITLES[event["type"]],
+                                "message": message,
+                                "data": data,
+                                "is_read": False,
+                            }
+                        )
+                        counts[recipient] += 1
+
+            if not rows:
+                return
+
+            for chunk in _chunks(rows, self.insert_chunk_size):
+                await db.execute(insert(NotificationModel).values(list(chunk)))
+            await unread_counter.increment_unread(db, counts)
+            await db.commit()
+
+        self.notifications_created += len(rows)
+        unread_counter.notification_broker.notify_new(counts)
+
+    def stats(self) -> dict:
+        return {**super().stats(), "notifications_created": self.notifications_created}
+
+
+notification_fanout = NotificationFanout(
+    max_size=settings.NOTIFICATION_QUEUE_SIZE,
+    batch_size=settings.NOTIFICATION_BATCH_SIZE,
+    flush_interval_ms=settings.NOTIFICATION_FLUSH_INTERVAL_MS,
+    insert_chunk_size=settings.NOTIFICATION_INSERT_CHUNK_SIZE,
+)
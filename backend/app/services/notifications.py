@@ -0,0 +1,164 @@
+"""
+Per-user unread notification counters and live stream subscribers
+
+``users.unread_notifications`` is maintained alongside every change to a
+notification's read state so the header badge is a primary-key lookup. A
+periodic job recomputes the counters from the notifications table to repair
+any drift (e.g. rows written outside the API).
+
+``notification_broker`` tracks the open notification streams of this worker
+and wakes them when something changes for their user.
+"""
+
+import asyncio
+import logging
+from typing import Dict, Iterable, Optional, Set
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.models.models import Notification as NotificationModel, User as UserModel
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+_counter = UserModel.unread_notifications
+
+
+class StreamSubscriber:
+    """State of one open stream; updates coalesce until the stream wakes up"""
+
+    def __init__(self):
+        self.wakeup = asyncio.Event()
+        self.has_new = False
+        self.unread_count: Optional[int] = None
+
+
+class NotificationBroker:
+    """In-process registry of notification stream subscribers per user"""
+
+    def __init__(self):
+        self._subscribers: Dict[int, Set[StreamSubscriber]] = {}
+
+    def subscribe(self, user_id: int) -> StreamSubscriber:
+        subscriber = StreamSubscriber()
+        self._subscribers.setdefault(user_id, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, user_id: int, subscriber: StreamSubscriber) -> None:
+        subscribers = self._subscribers.get(user_id)
+        if subscribers is not None:
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._subscribers[user_id]
+
+    def has_subscribers(self, user_id: int) -> bool:
+        return user_id in self._subscribers
+
+    def notify_new(self, user_ids: Iterable[int]) -> None:
+        """Wake streams of users who received new notifications"""
+        for user_id in user_ids:
+            for subscriber in self._subscribers.get(user_id, ()):
+                subscriber.has_new = True
+                subscriber.wakeup.set()
+
+    def notify_count(self, user_id: int, count: int) -> None:
+        """Push a changed unread count to the user's streams"""
+        for subscriber in self._subscribers.get(user_id, ()):
+            subscriber.unread_count = count
+            subscriber.wakeup.set()
+
+    def stats(self) -> dict:
+        return {
+            "users": len(self._subscribers),
+            "streams": sum(len(s) for s in self._subscribers.values()),
+        }
+
+
+notification_broker = NotificationBroker()
+
+
+async def get_unread_count(db: AsyncSession, user_id: int) -> int:
+    result = await db.execute(select(_counter).where(UserModel.id == user_id))
+    return result.scalar() or 0
+
+
+async def publish_unread_count(db: AsyncSession, user_id: int) -> None:
+    """Send the user's current count to open streams (after commit)"""
+    if notification_broker.has_subscribers(user_id):
+        notification_broker.notify_count(user_id, await get_unread_count(db, user_id))
+
+
+async def increment_unread(db: AsyncSession, counts: Dict[int, int]) -> None:
+    """Add ``counts[user_id]`` to each user's counter (caller commits)"""
+    by_amount: Dict[int, list] = {}
+    for user_id, amount in counts.items():
+        if amount:
+            by_amount.setdefault(amount, []).append(user_id)
+
+    # Most fan-outs add the same amount to every recipient: one UPDATE each
+    for amount, user_ids in by_amount.items():
+        await db.execute(
+            update(UserModel)
+            .where(UserModel.id.in_(user_ids))
+            .values(unread_notifications=_counter + amount)
+            .execution_options(synchronize_session=False)
+        )
+
+
+async def decrement_unread(db: AsyncSession, user_id: int, amount: int = 1) -> None:
+    """Subtract from a user's counter without going below zero (caller commits)"""
+    await db.execute(
+        update(UserModel)
+        .where(UserModel.id == user_id)
+        .values(
+            unread_notifications=case((_counter > amount, _counter - amount), else_=0)
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def reset_unread(db: AsyncSession, user_id: int) -> None:
+    """Set a user's counter to zero (caller commits)"""
+    await db.execute(
+        update(UserModel)
+        .where(UserModel.id == user_id)
+        .values(unread_notifications=0)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def reconcile_unread_counts() -> int:
+    """Recompute every counter from the notifications table in id ranges"""
+    chunk = settings.NOTIFICATION_RECONCILE_CHUNK_SIZE
+    actual = (
+        select(func.count())
+        .where(
+            NotificationModel.user_id == UserModel.id,
+            NotificationModel.is_read == False,
+        )
+        .scalar_subquery()
+    )
+
+    repaired = 0
+    async with AsyncSessionLocal() as db:
+        max_id = (await db.execute(select(func.max(UserModel.id)))).scalar() or 0
+
+        for start in range(1, max_id + 1, chunk):
+            result = await db.execute(
+                update(UserModel)
+                .where(
+                    UserModel.id.between(start, start + chunk - 1),
+                    _counter != actual,
+                )
+                .values(unread_notifications=actual)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+            repaired += result.rowcount or 0
+
+    if repaired:
+        logger.warning(f"Reconciled unread notification counters for {repaired} users")
+    return repaired
@@ -0,0 +1,265 @@
+"""
+In-process WebSocket hub for live project change broadcasts
+
+Each worker fans out the deltas produced by its own request handlers; with
+several workers behind a load balancer every worker only sees its own writes.
+"""
+
+import asyncio
+import json
+import logging
+from collections import OrderedDict, deque
+from contextlib import suppress
+from itertools import chain
+from typing import Deque, Dict, Iterable, Optional, Sequence, Set, Tuple
+
+from fastapi import WebSocket, status
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+PROJECT_CREATED = "project.created"
+PROJECT_UPDATED = "project.updated"
+PROJECT_DELETED = "project.deleted"
+
+
+def project_delta(project, **extra) -> dict:
+    """Compact representation of a project sent to subscribers"""
+    delta = {
+        "id": project.id,
+        "site_code": project.site_code,
+        "project_name": project.project_name,
+        "province": project.province,
+        "municipality": project.municipality,
+        "status": project.status.value if project.status else None,
+        "latitude": float(project.latitude),
+        "longitude": float(project.longitude),
+        "progress": project.progress,
+        "assigned_to": project.assigned_to,
+    }
+    delta.update(extra)
+    return delta
+
+
+class HubClient:
+    """A connected WebSocket with its subscription and pending messages.
+
+    Pending messages are keyed by project id, so a burst of changes to the
+    same project is coalesced into the latest one. When more than
+    ``max_pending`` distinct projects are waiting, or sending stalls for
+    about ``send_timeout`` seconds, the client is considered too slow and is
+    disconnected.
+
+    Only the writer task touches the socket: replies to the client's own
+    messages and the close are queued here too, so sends never overlap.
+    """
+
+    def __init__(self, websocket: WebSocket, max_pending: int, send_timeout: float):
+        self.websocket = websocket
+        self.max_pending = max_pending
+        self.send_timeout = send_timeout
+        self.subscribed = False
+        self.provinces: Optional[frozenset] = None
+        self.statuses: Optional[frozenset] = None
+        self.bbox: Optional[Sequence[float]] = None
+        self.overflowed = False
+        self.sent = 0
+        self.coalesced = 0
+        self._pending: "OrderedDict[int, str]" = OrderedDict()
+        self._replies: Deque[str] = deque()
+        self._close: Optional[Tuple[int, str]] = None
+        self._wakeup = asyncio.Event()
+
+    def matches(self, delta: dict) -> bool:
+        if self.statuses is not None and delta.get("status") not in self.statuses:
+            return False
+        if self.bbox is not None:
+            min_lng, min_lat, max_lng, max_lat = self.bbox
+            lng, lat = delta.get("longitude"), delta.get("latitude")
+            if lng is None or lat is None:
+                return False
+            if not (min_lng <= lng <= max_lng and min_lat <= lat <= max_lat):
+                return False
+        return True
+
+    @property
+    def closing(self) -> bool:
+        return self.overflowed or self._close is not None
+
+    def offer(self, key: int, message: str) -> bool:
+        """Queue a message without blocking; False if the client overflowed"""
+        if self.closing:
+            return False
+
+        if key in self._pending:
+            self._pending[key] = message
+            self.coalesced += 1
+        elif len(self._pending) >= self.max_pending:
+            self.overflowed = True
+            self._wakeup.set()
+            return False
+        else:
+            self._pending[key] = message
+
+        self._wakeup.set()
+        return True
+
+    def reply(self, message: dict) -> None:
+        """Queue a reply to the client's own message, sent ahead of deltas"""
+        if self.closing:
+            return
+        if len(self._replies) >= self.max_pending:
+            self.overflowed = True
+        else:
+            self._replies.append(json.dumps(message))
+        self._wakeup.set()
+
+    def close(self, code: int, reason: str = "") -> None:
+        """Close the socket once the writer gets to it; nothing more is sent"""
+        if self._close is None:
+            self._close = (code, reason)
+        self._wakeup.set()
+
+    def _next_message(self) -> Optional[str]:
+        if self.closing:
+            return None
+        if self._replies:
+            return self._replies.popleft()
+        if self._pending:
+            return self._pending.popitem(last=False)[1]
+        return None
+
+    async def run_writer(self) -> None:
+        """Send queued messages until the client is closed or disconnects"""
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+            loop = asyncio.get_running_loop()
+            try:
+                async with asyncio.timeout(self.send_timeout) as deadline:
+                    while (message := self._next_message()) is not None:
+                        # Push the deadline out only once half of it is used, so
+                        # a fast queue drain does not reschedule a timer per send
+                        if deadline.when() - loop.time() < self.send_timeout / 2:
+                            deadline.reschedule(loop.time() + self.send_timeout)
+                        await self.websocket.send_text(message)
+                        self.sent += 1
+            except TimeoutError:
+                logger.info(f"WebSocket client stalled for {self.send_timeout}s, dropping it")
+                self.overflowed = True
+            except Exception:
+                # Connection went away; the reader side cleans up
+                return
+
+            if self.closing:
+                code, reason = self._close or (status.WS_1013_TRY_AGAIN_LATER, "Slow consumer")
+                # A stalled peer may not take the close frame either
+                with suppress(Exception):
+                    async with asyncio.timeout(self.send_timeout):
+                        await self.websocket.close(code=code, reason=reason)
+                return
+
+
+class ProjectHub:
+    """Registry of WebSocket clients indexed by subscribed province"""
+
+    def __init__(self, queue_size: int, send_timeout: float):
+        self.queue_size = queue_size
+        self.send_timeout = send_timeout
+        self._clients: Set[HubClient] = set()
+        self._wildcard: Set[HubClient] = set()
+        self._by_province: Dict[str, Set[HubClient]] = {}
+        self.published = 0
+        self.delivered = 0
+        self.dropped_clients = 0
+
+    @property
+    def has_clients(self) -> bool:
+        return bool(self._clients)
+
+    def connect(self, websocket: WebSocket) -> HubClient:
+        client = HubClient(websocket, self.queue_size, self.send_timeout)
+        self._clients.add(client)
+        return client
+
+    def _unindex(self, client: HubClient) -> None:
+        self._wildcard.discard(client)
+        for province in client.provinces or ():
+            subscribers = self._by_province.get(province)
+            if subscribers is not None:
+                subscribers.discard(client)
+                if not subscribers:
+                    del self._by_province[province]
+
+    def subscribe(
+        self,
+        client: HubClient,
+        provinces: Optional[Iterable[str]] = None,
+        statuses: Optional[Iterable[str]] = None,
+        bbox: Optional[Sequence[float]] = None,
+    ) -> None:
+        """Replace the client's subscription; omitted filters match everything"""
+        self._unindex(client)
+
+        client.provinces = frozenset(provinces) if provinces else None
+        client.statuses = frozenset(statuses) if statuses else None
+        client.bbox = tuple(bbox) if bbox else None
+        client.subscribed = True
+
+        if client.provinces is None:
+            self._wildcard.add(client)
+        else:
+            for province in client.provinces:
+                self._by_province.setdefault(province, set()).add(client)
+
+    def unsubscribe(self, client: HubClient) -> None:
+        self._unindex(client)
+        client.subscribed = False
+
+    def disconnect(self, client: HubClient) -> None:
+        self._unindex(client)
+        self._clients.discard(client)
+
+    def publish(self, event_type: str, delta: dict) -> int:
+        """Fan a project delta out to matching clients; returns deliveries"""
+        if not self._clients:
+            return 0
+
+        # Serialize once and share the string between all recipients
+        message = json.dumps({"type": event_type, "project": delta}, default=str)
+        key = delta["id"]
+        candidates = chain(
+            self._wildcard, self._by_province.get(delta.get("province"), ())
+        )
+
+        delivered = 0
+        for client in candidates:
+            if client.closing or not client.matches(delta):
+                continue
+            if client.offer(key, message):
+                delivered += 1
+            else:
+                self.dropped_clients += 1
+
+        self.published += 1
+        self.delivered += delivered
+        return delivered
+
+    def publish_many(self, event_type: str, deltas: Iterable[dict]) -> int:
+        return sum(self.publish(event_type, delta) for delta in deltas)
+
+    def stats(self) -> dict:
+        return {
+            "clients": len(self._clients),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped_clients": self.dropped_clients,
+        }
+
+
+project_hub = ProjectHub(
+    queue_size=settings.WS_MESSAGE_QUEUE_SIZE, send_timeout=settings.WS_SEND_TIMEOUT
+)
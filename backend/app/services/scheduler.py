@@ -0,0 +1,92 @@
+"""
+Lightweight in-process scheduler for periodic maintenance jobs
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJob:
+    """Runs an async callable every ``interval`` seconds until stopped"""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[None]],
+        interval: float,
+        initial_delay: Optional[float] = None,
+    ):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.initial_delay = interval if initial_delay is None else initial_delay
+        self.runs = 0
+        self.failures = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=f"job-{self.name}")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def run_once(self) -> None:
+        try:
+            await self.func()
+            self.runs += 1
+        except Exception as e:
+            self.failures += 1
+            logger.error(f"Job '{self.name}' failed: {e}")
+
+    async def _run(self) -> None:
+        await asyncio.sleep(self.initial_delay)
+        while True:
+            await self.run_once()
+            await asyncio.sleep(self.interval)
+
+
+class Scheduler:
+    """Registry of periodic jobs started and stopped with the application"""
+
+    def __init__(self):
+        self.jobs: Dict[str, PeriodicJob] = {}
+
+    def add_job(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[None]],
+        interval: float,
+        initial_delay: Optional[float] = None,
+    ) -> PeriodicJob:
+        job = PeriodicJob(name, func, interval, initial_delay)
+        self.jobs[name] = job
+        return job
+
+    def start(self) -> None:
+        for job in self.jobs.values():
+            job.start()
+        logger.info(f"Scheduler started with {len(self.jobs)} jobs")
+
+    async def stop(self) -> None:
+        for job in self.jobs.values():
+            await job.stop()
+
+    def stats(self) -> dict:
+        return {
+            name: {"runs": job.runs, "failures": job.failures}
+            for name, job in self.jobs.items()
+        }
+
+
+scheduler = Scheduler()
@@ -0,0 +1,48 @@
+"""
+Removal of expired refresh-token sessions
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+
+from sqlalchemy import delete, select
+
+from app.core.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.models.models import Session as SessionModel
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+async def prune_expired_sessions() -> int:
+    """Periodic job: delete expired sessions in bounded chunks"""
+    chunk_size = settings.SESSION_PRUNE_CHUNK_SIZE
+    cutoff = datetime.utcnow()
+    deleted = 0
+
+    async with AsyncSessionLocal() as db:
+        while True:
+            # Walks the expires_at index; each chunk is its own short transaction
+            result = await db.execute(
+                select(SessionModel.id)
+                .where(SessionModel.expires_at < cutoff)
+                .order_by(SessionModel.expires_at)
+                .limit(chunk_size)
+            )
+            ids = result.scalars().all()
+            if not ids:
+                break
+
+            await db.execute(delete(SessionModel).where(SessionModel.id.in_(ids)))
+            await db.commit()
+            deleted += len(ids)
+
+            if len(ids) < chunk_size:
+                break
+            await asyncio.sleep(0)
+
+    if deleted:
+        logger.info(f"Pruned {deleted} expired sessions")
+    return deleted
@@ -0,0 +1,325 @@
+"""
+Access token revocation
+
+Tokens can be revoked individually (their ``jti`` is stored in
+``revoked_tokens`` until the token would have expired anyway) or all at once
+per user (``users.tokens_not_before``).
+
+Every worker mirrors the revocation state in memory. A Bloom filter holds the
+revoked ``jti`` values and is refreshed incrementally by id, and a small map
+holds the recent per-user cut-offs. Ids are allocated at insert but become
+visible at commit, so a row can appear below ids already seen; each refresh
+re-reads the ids above the high-water mark it had
+``TOKEN_REVOCATION_REFRESH_OVERLAP`` seconds earlier. Checking
+a token that was not revoked, the common case, is therefore a pure in-memory
+operation; only Bloom filter hits are confirmed against the database.
+Revocations made on another worker take effect here within
+``TOKEN_REVOCATION_REFRESH_INTERVAL`` seconds.
+"""
+
+import hashlib
+import logging
+import math
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.models.models import (
+    RevokedToken as RevokedTokenModel,
+    Session as SessionModel,
+    User as UserModel,
+)
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def new_jti() -> str:
+    return uuid.uuid4().hex
+
+
+def _timestamp(value: datetime) -> float:
+    """Epoch seconds of a naive UTC datetime"""
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings using double hashing"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class RevocationList:
+    """Per-worker mirror of revoked tokens and per-user cut-offs"""
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float,
+        overlap: float,
+        refresh_batch_size: int = 5000,
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.overlap = overlap
+        self.refresh_batch_size = refresh_batch_size
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._last_id = 0
+        # (monotonic time, high-water id) of recent refreshes, oldest first
+        self._marks: Deque[Tuple[float, int]] = deque()
+        # Local revocations made while a rebuild is loading its new filter
+        self._rebuild_local: Optional[List[str]] = None
+        self._not_before: Dict[int, float] = {}
+        self.ready = False
+        self.checks = 0
+        self.bloom_hits = 0
+        self.confirmed = 0
+        self.fallback_checks = 0
+
+    def add_local(self, jti: str) -> None:
+        """Make a revocation made by this worker visible immediately"""
+        self._bloom.add(jti)
+        if self._rebuild_local is not None:
+            self._rebuild_local.append(jti)
+
+    def set_not_before(self, user_id: int, not_before: datetime) -> None:
+        self._not_before[user_id] = _timestamp(not_before)
+
+    async def _load(self, db: AsyncSession, bloom: BloomFilter, after_id: int) -> Tuple[int, int]:
+        """Add revocations with ids above ``after_id``; returns (new entries, last id)"""
+        added = 0
+        while True:
+            result = await db.execute(
+                select(RevokedTokenModel.id, RevokedTokenModel.jti)
+                .where(RevokedTokenModel.id > after_id)
+                .order_by(RevokedTokenModel.id)
+                .limit(self.refresh_batch_size)
+            )
+            rows = result.all()
+            for row in rows:
+                # Re-read rows are already present; keep count meaningful
+                if row.jti not in bloom:
+                    bloom.add(row.jti)
+                    added += 1
+            if rows:
+                after_id = rows[-1].id
+            if len(rows) < self.refresh_batch_size:
+                return added, after_id
+
+    def _scan_from(self, now: float) -> int:
+        """High-water id of the newest refresh at least ``overlap`` seconds old"""
+        cutoff = now - self.overlap
+        while len(self._marks) > 1 and self._marks[1][0] <= cutoff:
+            self._marks.popleft()
+        return self._marks[0][1] if self._marks else 0
+
+    async def _full_load_marks(self, db: AsyncSession, now: float, last_id: int) -> Deque:
+        """Marks after loading every row: nothing older to compare with yet, so
+        rows inserted within the overlap (possibly uncommitted) are read again
+        """
+        horizon = datetime.utcnow() - timedelta(seconds=self.overlap)
+        result = await db.execute(
+            select(func.max(RevokedTokenModel.id)).where(RevokedTokenModel.created_at < horizon)
+        )
+        floor = min(result.scalar() or 0, last_id)
+        return deque([(now - self.overlap, floor), (now, last_id)])
+
+    async def refresh(self) -> int:
+        """Load revocations committed since the last refresh; returns new entries"""
+        now = time.monotonic()
+        async with AsyncSessionLocal() as db:
+            added, last_id = await self._load(db, self._bloom, self._scan_from(now))
+            self._last_id = max(self._last_id, last_id)
+            if self._marks:
+                self._marks.append((now, self._last_id))
+            else:
+                self._marks = await self._full_load_marks(db, now, self._last_id)
+
+            # Cut-offs older than an access token's lifetime cannot reject anything
+            horizon = datetime.utcnow() - timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+            result = await db.execute(
+                select(UserModel.id, UserModel.tokens_not_before).where(
+                    UserModel.tokens_not_before > horizon
+                )
+            )
+            self._not_before = {
+                user_id: _timestamp(not_before) for user_id, not_before in result.all()
+            }
+
+        # Rebuilt filters are sized above the configured capacity
+        if self._bloom.count > self._bloom.capacity:
+            await self.rebuild()
+        self.ready = True
+        return added
+
+    def _capacity_for(self, live: int) -> int:
+        """Configured capacity, doubled until ``live`` fills at most half of it"""
+        capacity = self.capacity
+        while capacity < live * 2:
+            capacity *= 2
+        return capacity
+
+    async def rebuild(self) -> None:
+        """Replace the filter, e.g. after expired revocations were pruned.
+
+        The new filter is loaded on the side and swapped in complete; until
+        then checks keep using the current one.
+        """
+        if self._rebuild_local is not None:
+            return
+        self._rebuild_local = []
+        try:
+            now = time.monotonic()
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(select(func.count(RevokedTokenModel.id)))
+                bloom = BloomFilter(self._capacity_for(result.scalar() or 0), self.error_rate)
+                _, last_id = await self._load(db, bloom, 0)
+                marks = await self._full_load_marks(db, now, last_id)
+
+            for jti in self._rebuild_local:
+                bloom.add(jti)
+            self._bloom = bloom
+            # Rows a concurrent refresh saw above last_id are read again
+            self._last_id = last_id
+            self._marks = marks
+        finally:
+            self._rebuild_local = None
+        logger.info(f"Revocation filter rebuilt with {bloom.count} entries")
+
+    async def is_revoked(self, payload: dict, db: AsyncSession) -> bool:
+        self.checks += 1
+
+        not_before = self._not_before.get(int(payload["sub"]))
+        if not_before is not None and payload.get("iat", 0) < not_before:
+            return True
+
+        jti = payload.get("jti")
+        if jti is None:
+            return False
+
+        if self.ready and jti not in self._bloom:
+            return False
+
+        # Possible revocation (or filter not loaded yet): ask the database
+        if self.ready:
+            self.bloom_hits += 1
+        else:
+            self.fallback_checks += 1
+        result = await db.execute(
+            select(RevokedTokenModel.id).where(RevokedTokenModel.jti == jti)
+        )
+        revoked = result.scalar() is not None
+        if revoked:
+            self.confirmed += 1
+        return revoked
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "entries": self._bloom.count,
+            "capacity": self._bloom.capacity,
+            "users_cut_off": len(self._not_before),
+            "checks": self.checks,
+            "bloom_hits": self.bloom_hits,
+            "confirmed": self.confirmed,
+            "false_positives": self.bloom_hits - self.confirmed,
+            "fallback_checks": self.fallback_checks,
+        }
+
+
+async def revoke_token(db: AsyncSession, payload: dict) -> bool:
+    """Revoke a single decoded token until its expiry"""
+    jti = payload.get("jti")
+    if jti is None:
+        return False
+
+    db.add(
+        RevokedTokenModel(
+            jti=jti,
+            user_id=int(payload["sub"]),
+            expires_at=datetime.utcfromtimestamp(payload["exp"]),
+        )
+    )
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Already revoked
+        await db.rollback()
+    revocation_list.add_local(jti)
+    return True
+
+
+async def revoke_all_tokens(db: AsyncSession, user_id: int) -> None:
+    """Reject every token issued to a user so far and end their sessions"""
+    now = datetime.utcnow()
+    await db.execute(
+        update(UserModel).where(UserModel.id == user_id).values(tokens_not_before=now)
+    )
+    await db.execute(delete(SessionModel).where(SessionModel.user_id == user_id))
+    await db.commit()
+    revocation_list.set_not_before(user_id, now)
+
+
+async def prune_revoked_tokens() -> int:
+    """Periodic job: forget revocations of tokens that have expired anyway"""
+    deleted = 0
+    chunk_size = settings.TOKEN_REVOCATION_PRUNE_CHUNK_SIZE
+    async with AsyncSessionLocal() as db:
+        while True:
+            result = await db.execute(
+                select(RevokedTokenModel.id)
+                .where(RevokedTokenModel.expires_at < datetime.utcnow())
+                .order_by(RevokedTokenModel.id)
+                .limit(chunk_size)
+            )
+            ids = result.scalars().all()
+            if not ids:
+                break
+            await db.execute(delete(RevokedTokenModel).where(RevokedTokenModel.id.in_(ids)))
+            await db.commit()
+            deleted += len(ids)
+            if len(ids) < chunk_size:
+                break
+
+    if deleted:
+        logger.info(f"Pruned {deleted} expired token revocations")
+        await revocation_list.rebuild()
+    return deleted
+
+
+revocation_list = RevocationList(
+    capacity=settings.TOKEN_REVOCATION_BLOOM_CAPACITY,
+    error_rate=settings.TOKEN_REVOCATION_BLOOM_ERROR_RATE,
+    overlap=settings.TOKEN_REVOCATION_REFRESH_OVERLAP,
+)
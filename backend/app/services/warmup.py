@@ -0,0 +1,171 @@
+"""
+Worker warm-up before taking traffic
+
+A fresh worker opens pool connections lazily, compiles each statement shape
+and ORM loader on first use, and starts with empty caches, so its first few
+hundred requests are slow. The warm-up runs in the background after startup:
+
+1. opens ``DB_POOL_SIZE`` connections on the primary (and each replica)
+2. primes the principals of users with live sessions
+3. builds the common project list statements and runs each once on every
+   engine, compiling their SQL and relationship loaders and the response
+   schema's validator
+
+``GET /api/ready`` answers 503 until it finishes, so a load balancer only
+routes to warm workers. Failed steps are logged and skipped; after
+``WARMUP_TIMEOUT`` the worker reports ready regardless.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import get_settings
+from app.core.principal_cache import Principal, principal_cache
+from app.db.replicas import replica_router
+from app.db.session import AsyncSessionLocal, engine
+from app.models.models import ProjectStatus, Session, User
+from app.schemas.schemas import Project
+from app.services.project_queries import project_list_queries
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# (filters, sort_by, sort_desc) of the project list views opened most often
+WARMUP_PROJECT_LISTS = (
+    ({}, "created_at", True),
+    ({"status": ProjectStatus.IN_PROGRESS}, "created_at", True),
+    ({"search": "site"}, "site_code", False),
+)
+WARMUP_PAGE_SIZE = 20
+
+
+async def _fill_pool(target: AsyncEngine, size: int) -> int:
+    """Open ``size`` connections at once and hand them back to the pool"""
+    if target.dialect.name == "sqlite":
+        # No pool to fill (NullPool); one connection still loads the driver
+        size = 1
+    results = await asyncio.gather(
+        *(target.connect() for _ in range(size)), return_exceptions=True
+    )
+    opened = [conn for conn in results if not isinstance(conn, BaseException)]
+    for conn in opened:
+        await conn.close()
+    if len(opened) < size:
+        error = next(r for r in results if isinstance(r, BaseException))
+        logger.warning(f"Warm-up opened {len(opened)}/{size} connections: {error}")
+    return len(opened)
+
+
+class WarmUp:
+    """Runs the warm-up steps once and tracks readiness"""
+
+    def __init__(self, timeout: float, principals: int):
+        self.timeout = timeout
+        self.principals = principals
+        self.ready = False
+        self.started_at: Optional[float] = None
+        self.duration: Optional[float] = None
+        self.steps: Dict[str, dict] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Warm up in the background; ``ready`` flips when done"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="warmup")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def mark_ready(self) -> None:
+        self.ready = True
+
+    async def _run(self) -> None:
+        self.started_at = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.run_steps(), self.timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Warm-up did not finish within {self.timeout}s, reporting ready")
+        self.duration = time.perf_counter() - self.started_at
+        self.ready = True
+        logger.info(f"Worker warmed up in {self.duration:.2f}s")
+
+    async def run_steps(self) -> None:
+        for name, step in (
+            ("pool", self._warm_pools),
+            ("caches", self._warm_caches),
+            ("queries", self._warm_queries),
+        ):
+            started = time.perf_counter()
+            try:
+                detail = await step()
+                self.steps[name] = {"ok": True, **detail}
+            except Exception as e:
+                logger.error(f"Warm-up step '{name}' failed: {e}")
+                self.steps[name] = {"ok": False, "error": str(e)}
+            self.steps[name]["seconds"] = round(time.perf_counter() - started, 3)
+
+    async def _warm_pools(self) -> dict:
+        detail = {"primary": await _fill_pool(engine, settings.DB_POOL_SIZE)}
+        for replica in replica_router.replicas:
+            detail[replica.name] = await _fill_pool(replica.engine, settings.DB_POOL_SIZE)
+        return {"connections": detail}
+
+    async def _warm_caches(self) -> dict:
+        async with AsyncSessionLocal() as db:
+            # Users who can make authenticated requests right now
+            result = await db.execute(
+                select(User.id, User.role, User.is_active)
+                .where(
+                    User.id.in_(
+                        select(Session.user_id).where(Session.expires_at > datetime.utcnow())
+                    )
+                )
+                .limit(self.principals)
+            )
+            rows = result.all()
+        for row in rows:
+            await principal_cache.set(Principal(row.id, row.role, bool(row.is_active)))
+        return {"principals": len(rows)}
+
+    async def _warm_queries(self) -> dict:
+        # Compiled statements are cached per engine, and list reads may go
+        # to any replica
+        sessionmakers = [AsyncSessionLocal] + [
+            replica.sessionmaker for replica in replica_router.replicas
+        ]
+        statements = 0
+        for sessionmaker in sessionmakers:
+            async with sessionmaker() as db:
+                for filters, sort_by, sort_desc in WARMUP_PROJECT_LISTS:
+                    count, page, params = project_list_queries.build(
+                        filters, sort_by, sort_desc, offset=0, limit=WARMUP_PAGE_SIZE
+                    )
+                    await db.execute(count, params)
+                    projects = (await db.execute(page, params)).scalars().all()
+                    for project in projects:
+                        Project.model_validate(project)
+                    statements += 2
+        return {"statements": statements, "engines": len(sessionmakers)}
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "seconds": round(self.duration, 3) if self.duration is not None else None,
+            "steps": self.steps,
+        }
+
+
+warmup = WarmUp(timeout=settings.WARMUP_TIMEOUT, principals=settings.WARMUP_PRINCIPALS)
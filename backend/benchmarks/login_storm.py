@@ -0,0 +1,95 @@
+"""
+Login storm benchmark
+
+Fires a burst of concurrent logins at a minimal app that verifies bcrypt
+hashes the way ``auth.login`` does, while a steady stream of cheap requests
+measures how responsive the rest of the worker stays. Runs once with bcrypt
+on the event loop and once on the bounded hashing pool.
+
+    python -m benchmarks.login_storm --logins 40 --probes 200
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.password_hashing import PasswordHasher
+from app.core.security import get_password_hash, verify_password
+
+PASSWORD = "correct horse battery staple"
+
+
+def build_app(hasher: PasswordHasher, password_hash: str, inline: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/login")
+    async def login():
+        if inline:
+            ok = verify_password(PASSWORD, password_hash)
+        else:
+            ok = await hasher.verify(PASSWORD, password_hash)
+        return {"ok": ok}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    return app
+
+
+async def _probe(client: httpx.AsyncClient, count: int, interval: float) -> list:
+    """Latency of probes measured from when each was due, so time spent
+    waiting for a blocked event loop is counted"""
+    latencies = []
+    started = time.perf_counter()
+    for i in range(count):
+        due = started + i * interval
+        await asyncio.sleep(max(0.0, due - time.perf_counter()))
+        await client.get("/health")
+        latencies.append(time.perf_counter() - due)
+    return latencies
+
+
+async def run_scenario(name: str, inline: bool, password_hash: str, args) -> None:
+    hasher = PasswordHasher(workers=args.workers, max_pending=args.max_pending)
+    app = build_app(hasher, password_hash, inline)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        logins = [asyncio.create_task(client.post("/login")) for _ in range(args.logins)]
+        latencies = await _probe(client, args.probes, args.interval)
+        responses = await asyncio.gather(*logins)
+        elapsed = time.perf_counter() - started
+
+    hasher.shutdown()
+    latencies.sort()
+    codes = [r.status_code for r in responses]
+
+    print(f"[{name}] logins={args.logins} ok={codes.count(200)} "
+          f"rejected_503={codes.count(503)} elapsed={elapsed:.2f}s")
+    print(f"[{name}] /health p50={statistics.median(latencies) * 1000:.1f}ms "
+          f"p99={latencies[int(len(latencies) * 0.99)] * 1000:.1f}ms "
+          f"max={latencies[-1] * 1000:.1f}ms")
+    if not inline:
+        print(f"[{name}] pool {hasher.stats()}")
+
+
+async def main(args) -> None:
+    password_hash = get_password_hash(PASSWORD)
+    await run_scenario("event loop", True, password_hash, args)
+    await run_scenario("hash pool", False, password_hash, args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Login storm benchmark")
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--probes", type=int, default=200)
+    parser.add_argument("--interval", type=float, default=0.005)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--max-pending", type=int, default=32)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,281 @@
+"""
+ORM hydration and serialization micro-benchmarks
+
+Measures each step between the database and the response body for the
+response schemas in ``app.schemas.schemas``, at several result sizes:
+
+    orm_load          query + ORM hydration (with the endpoint's eager loads)
+    validate          Schema.model_validate(obj) over ORM objects (from_attributes)
+    dump              model_dump() to Python objects
+    json_stdlib       model_dump(mode="json") + json.dumps
+    dump_json         TypeAdapter(List[Schema]).dump_json (pydantic-core)
+    fastapi_response  what FastAPI does with a returned list of models: dump,
+                      re-validate against response_model, serialize, json.dumps
+    fast_response     app.core.responses.json_response: the validated models
+                      encoded once by pydantic-core, no re-validation
+
+Fixtures come from ``generate_dataset.py`` loaded into an in-memory SQLite
+database. Timings are normalized by a fixed pure-Python calibration loop so
+baselines recorded on one machine remain comparable on another; small sizes
+are noisy, so use a generous ``--max-regression`` when gating on them.
+
+    python -m benchmarks.serialization                      # compare with the baseline
+    python -m benchmarks.serialization --update-baseline    # record a new baseline
+    python -m benchmarks.serialization --sizes 20,100 --schemas Project,User
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.pool import StaticPool
+
+from app.core.responses import json_response
+from app.db.session import Base
+from app.models import models
+from app.schemas import schemas
+from generate_dataset import DatasetGenerator
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "serialization.json")
+DEFAULT_SIZES = (20, 100, 10000)
+# Fixture rows regardless of --sizes, so subsets measure the same data
+FIXTURE_ROWS = 10000
+
+
+def _project_query():
+    return select(models.Project).options(
+        selectinload(models.Project.creator),
+        selectinload(models.Project.assignee),
+        selectinload(models.Project.tags),
+    )
+
+
+# Response schema -> query the endpoints use to load it
+SCHEMAS: Dict[str, tuple] = {
+    "User": (schemas.User, lambda: select(models.User)),
+    "Tag": (schemas.Tag, lambda: select(models.Tag)),
+    "Project": (schemas.Project, _project_query),
+    "ProjectHistoryItem": (
+        schemas.ProjectHistoryItem,
+        lambda: select(models.ProjectHistory).options(
+            selectinload(models.ProjectHistory.changer)
+        ),
+    ),
+    "Comment": (
+        schemas.Comment,
+        lambda: select(models.Comment).options(
+            selectinload(models.Comment.user),
+            selectinload(models.Comment.replies, recursion_depth=8),
+        ),
+    ),
+    "Notification": (schemas.Notification, lambda: select(models.Notification)),
+    "Attachment": (
+        schemas.Attachment,
+        lambda: select(models.Attachment).options(selectinload(models.Attachment.uploader)),
+    ),
+}
+
+
+# ==================== Fixtures ====================
+
+
+def build_database(rows: int, seed: int):
+    """In-memory SQLite database with at least ``rows`` rows per large table"""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+
+    args = argparse.Namespace(years=4, comments_per_project=1.5, activity=False)
+    tables = ["users", "tags", "projects", "project_history", "comments",
+              "notifications", "activity_log"]
+    generator = DatasetGenerator(args, random.Random(seed), {table: 0 for table in tables})
+
+    with engine.begin() as conn:
+        conn.execute(insert(models.User), generator.users_rows(rows, []))
+        conn.execute(insert(models.Tag), generator.tag_rows({}))
+        chunk = generator.project_chunk(rows)
+        for model, chunk_rows in chunk.items():
+            if chunk_rows:
+                conn.execute(insert(model), chunk_rows)
+
+        rng = random.Random(seed)
+        conn.execute(insert(models.Attachment), [
+            {
+                "id": n,
+                "project_id": rng.randint(1, rows),
+                "filename": f"{n:08d}.jpg",
+                "original_filename": f"site-photo-{n}.jpg",
+                "file_path": f"./uploads/projects/{n}/{n:08d}.jpg",
+                "file_size": rng.randint(50_000, 5_000_000),
+                "file_type": "image/jpeg",
+                "uploaded_by": rng.randint(1, rows),
+                "description": None,
+            }
+            for n in range(1, rows + 1)
+        ])
+    return engine
+
+
+# ==================== Measurement ====================
+
+
+def measure(fn: Callable, min_time: float, min_rounds: int = 3, max_rounds: int = 100) -> dict:
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < max_rounds and (
+        len(timings) < min_rounds or time.perf_counter() - started < min_time
+    ):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    return {"median_s": statistics.median(timings), "min_s": min(timings), "rounds": len(timings)}
+
+
+def calibrate() -> float:
+    """Seconds for a fixed pure-Python workload on this machine"""
+
+    def workload():
+        total = 0
+        for i in range(300_000):
+            total += i * i % 7
+        return total
+
+    return measure(workload, min_time=0.5, min_rounds=5)["median_s"]
+
+
+def bench_schema(engine, name: str, size: int, min_time: float, loop) -> Dict[str, dict]:
+    schema, query = SCHEMAS[name]
+    adapter = TypeAdapter(List[schema])
+    field = create_response_field(name=f"Response_{name}", type_=List[schema])
+
+    def orm_load():
+        with Session(engine) as session:
+            session.execute(query().limit(size)).scalars().all()
+
+    # Keep the session open: validation reads the loaded relationships
+    session = Session(engine)
+    objects = session.execute(query().limit(size)).scalars().all()
+    validated = [schema.model_validate(obj) for obj in objects]
+
+    def fastapi_response():
+        content = loop.run_until_complete(
+            serialize_response(field=field, response_content=validated)
+        )
+        return JSONResponse(content).body
+
+    stages = {
+        "orm_load": orm_load,
+        "validate": lambda: [schema.model_validate(obj) for obj in objects],
+        "dump": lambda: [model.model_dump() for model in validated],
+        "json_stdlib": lambda: json.dumps(
+            [model.model_dump(mode="json") for model in validated]
+        ),
+        "dump_json": lambda: adapter.dump_json(validated),
+        "fastapi_response": fastapi_response,
+        "fast_response": lambda: json_response(validated).body,
+    }
+    results = {
+        stage: {**measure(fn, min_time), "rows": len(objects)}
+        for stage, fn in stages.items()
+    }
+    session.close()
+    return results
+
+
+def run(args) -> dict:
+    sizes = [int(size) for size in args.sizes.split(",")]
+    names = args.schemas.split(",") if args.schemas else list(SCHEMAS)
+    engine = build_database(max(sizes + [FIXTURE_ROWS]), args.seed)
+    calibration = calibrate()
+    loop = asyncio.new_event_loop()
+
+    results = {}
+    for name in names:
+        for size in sizes:
+            for stage, stats in bench_schema(engine, name, size, args.min_time, loop).items():
+                stats["normalized"] = round(stats["median_s"] / calibration, 4)
+                results[f"{name}/{size}/{stage}"] = stats
+    loop.close()
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "calibration_s": calibration,
+        },
+        "results": results,
+    }
+
+
+# ==================== Reporting ====================
+
+
+def report(result: dict, baseline: dict = None) -> List[tuple]:
+    """Print a table per schema; returns (key, change) for compared entries"""
+    compared = []
+    old = baseline["results"] if baseline else {}
+    print(f"{'benchmark':<44}{'rows':>7}{'median ms':>12}{'us/row':>10}{'vs baseline':>14}")
+    for key, stats in result["results"].items():
+        line = (
+            f"{key:<44}{stats['rows']:>7}{stats['median_s'] * 1000:>12.3f}"
+            f"{stats['median_s'] * 1e6 / max(stats['rows'], 1):>10.2f}"
+        )
+        if key in old:
+            change = stats["normalized"] / old[key]["normalized"] - 1
+            compared.append((key, change))
+            line += f"{change * 100:>+13.0f}%"
+        print(line)
+    return compared
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serialization micro-benchmarks")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)))
+    parser.add_argument("--schemas", help=f"comma-separated subset of {', '.join(SCHEMAS)}")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per benchmark")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--compare", default=BASELINE, help="baseline JSON")
+    parser.add_argument("--save", help="write results as JSON")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--max-regression", type=float,
+                        help="exit non-zero if a normalized median grew by more than this")
+    args = parser.parse_args()
+
+    result = run(args)
+
+    baseline = None
+    if args.compare and os.path.exists(args.compare) and not args.update_baseline:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    compared = report(result, baseline)
+
+    for path in filter(None, [args.save, BASELINE if args.update_baseline else None]):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(result, f, indent=2, sort_keys=True)
+        print(f"\nSaved to {path}")
+
+    if args.max_regression is not None:
+        failed = [(key, change) for key, change in compared if change > args.max_regression]
+        for key, change in failed:
+            print(f"Regression in {key}: {change * 100:+.0f}%", file=sys.stderr)
+        if failed:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+WebSocket hub fan-out benchmark
+
+Connects thousands of in-memory clients with a mix of province, status and
+bounding-box subscriptions, publishes a stream of project deltas and reports
+publish cost, delivery throughput and how slow consumers are handled.
+
+    python -m benchmarks.ws_fanout --clients 5000 --events 2000
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from app.services.realtime import ProjectHub, PROJECT_UPDATED
+
+PROVINCES = ["Batanes", "Cagayan", "Isabela", "Nueva Vizcaya", "Quirino"]
+STATUSES = ["planning", "in_progress", "on_hold", "done", "pending", "cancelled"]
+
+
+class FakeWebSocket:
+    """Stands in for a starlette WebSocket; optionally slow to consume"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.received = 0
+        self.closed_with = None
+
+    async def send_text(self, message: str) -> None:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.received += 1
+
+    async def close(self, code: int = 1000, reason: str = None) -> None:
+        self.closed_with = code
+
+
+def _subscribe(hub: ProjectHub, client, rng: random.Random) -> None:
+    kind = rng.random()
+    if kind < 0.4:
+        hub.subscribe(client, provinces=[rng.choice(PROVINCES)])
+    elif kind < 0.6:
+        hub.subscribe(client, statuses=rng.sample(STATUSES, 2))
+    elif kind < 0.8:
+        lng, lat = rng.uniform(120, 122), rng.uniform(16, 20)
+        hub.subscribe(client, bbox=[lng, lat, lng + 1, lat + 1])
+    else:
+        hub.subscribe(client)
+
+
+async def run(args) -> None:
+    rng = random.Random(args.seed)
+    hub = ProjectHub(queue_size=args.queue_size, send_timeout=args.send_timeout)
+
+    sockets, writers = [], []
+    for i in range(args.clients):
+        slow = i < args.clients * args.slow_fraction
+        websocket = FakeWebSocket(delay=1.0 if slow else 0.0)
+        client = hub.connect(websocket)
+        _subscribe(hub, client, rng)
+        sockets.append(websocket)
+        writers.append(asyncio.create_task(client.run_writer()))
+
+    publish_times = []
+    started = time.perf_counter()
+    for i in range(args.events):
+        delta = {
+            "id": rng.randint(1, args.projects),
+            "province": rng.choice(PROVINCES),
+            "status": rng.choice(STATUSES),
+            "latitude": rng.uniform(16, 21),
+            "longitude": rng.uniform(120, 123),
+        }
+        t0 = time.perf_counter()
+        hub.publish(PROJECT_UPDATED, delta)
+        publish_times.append(time.perf_counter() - t0)
+
+        # Let writers run between bursts, as the event loop would between requests
+        if i % args.burst == 0:
+            await asyncio.sleep(0)
+
+    await asyncio.sleep(0.1)
+    elapsed = time.perf_counter() - started
+
+    for writer in writers:
+        writer.cancel()
+    await asyncio.gather(*writers, return_exceptions=True)
+
+    publish_times.sort()
+    received = sum(ws.received for ws in sockets)
+    stats = hub.stats()
+
+    print(f"clients={args.clients} events={args.events} queue_size={args.queue_size}")
+    print(f"publish mean={statistics.mean(publish_times) * 1e6:.1f}us "
+          f"p99={publish_times[int(len(publish_times) * 0.99)] * 1e6:.1f}us "
+          f"max={publish_times[-1] * 1e6:.1f}us")
+    print(f"delivered={stats['delivered']} received={received} "
+          f"throughput={received / elapsed:,.0f} msg/s")
+    print(f"slow consumers disconnected={sum(1 for ws in sockets if ws.closed_with)} "
+          f"coalesced={sum(c.coalesced for c in hub._clients)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="WebSocket hub fan-out benchmark")
+    parser.add_argument("--clients", type=int, default=5000)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--projects", type=int, default=500)
+    parser.add_argument("--queue-size", type=int, default=100)
+    parser.add_argument("--send-timeout", type=float, default=10.0)
+    parser.add_argument("--slow-fraction", type=float, default=0.02)
+    parser.add_argument("--burst", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(run(parser.parse_args()))
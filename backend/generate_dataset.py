@@ -0,0 +1,574 @@
+"""
+Synthetic dataset generator
+
+Fills the database with realistic-looking projects for benchmarking:
+
+* a skewed province / municipality / barangay hierarchy (a few large
+  provinces and towns hold most projects, as in production data)
+* coordinates clustered around barangay centres
+* status histories produced by walking a project lifecycle from the
+  activation date, so older projects are more often done and the status mix
+  follows from the history chain
+* tags with skewed popularity, comments (a few projects attract most
+  discussion), notifications and activity log entries derived from the
+  generated events
+
+Rows are generated in chunks with explicit ids (appending after existing
+rows) and bulk-loaded either through executemany inserts, which the MySQL
+drivers rewrite into multi-row INSERT statements, or on MySQL through
+``LOAD DATA LOCAL INFILE`` (the server needs ``local_infile=ON``).
+
+    python generate_dataset.py --projects 100000
+    python generate_dataset.py --projects 1000000 --load-data
+    python generate_dataset.py --database-url sqlite+aiosqlite:///./bench.db --projects 50000
+
+Generation is deterministic for a given ``--seed`` and starting database.
+"""
+
+import argparse
+import asyncio
+import enum
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+from bisect import bisect
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from typing import Dict, List
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from app.core.config import get_settings
+from app.core.security import get_password_hash
+from app.db.session import Base
+from app.models.models import (
+    ActivityLog,
+    Comment,
+    Notification,
+    NotificationType,
+    Project,
+    ProjectHistory,
+    ProjectStatus,
+    ProjectTag,
+    Tag,
+    User,
+    UserRole,
+)
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Password of every generated user
+DEFAULT_PASSWORD = "password123"
+
+# Province centres (lat, lng)
+PROVINCES = {
+    "Cagayan": (17.95, 121.80),
+    "Isabela": (16.97, 121.81),
+    "Nueva Vizcaya": (16.33, 121.17),
+    "Quirino": (16.49, 121.54),
+    "Batanes": (20.45, 121.97),
+    "Ilocos Norte": (18.17, 120.75),
+    "Ilocos Sur": (17.22, 120.57),
+    "La Union": (16.62, 120.32),
+    "Pangasinan": (15.89, 120.29),
+    "Benguet": (16.45, 120.59),
+    "Nueva Ecija": (15.58, 120.99),
+    "Tarlac": (15.47, 120.60),
+    "Pampanga": (15.08, 120.66),
+    "Bulacan": (14.97, 120.90),
+    "Zambales": (15.51, 119.97),
+    "Aurora": (15.98, 121.63),
+    "Batangas": (13.76, 121.06),
+    "Laguna": (14.17, 121.33),
+    "Quezon": (14.03, 122.11),
+    "Albay": (13.18, 123.53),
+    "Camarines Sur": (13.53, 123.35),
+    "Iloilo": (10.72, 122.56),
+    "Cebu": (10.32, 123.75),
+    "Leyte": (10.86, 124.88),
+    "Bohol": (9.85, 124.14),
+    "Negros Occidental": (10.29, 123.03),
+    "Davao del Sur": (6.77, 125.35),
+    "Bukidnon": (8.05, 125.09),
+    "Misamis Oriental": (8.50, 124.62),
+    "South Cotabato": (6.27, 124.85),
+}
+BARANGAYS = [
+    "Poblacion", "San Jose", "San Isidro", "Santa Cruz", "San Roque", "Santo Nino",
+    "San Antonio", "Bagong Silang", "San Vicente", "Santa Maria", "Mabini", "Rizal",
+    "Bonifacio", "Del Pilar", "Magsaysay", "Quezon", "San Juan", "Santa Rosa",
+    "Malvar", "Burgos", "Mabuhay", "Maligaya", "Riverside", "Centro", "Lourdes",
+]
+SYLLABLES = ["ba", "ga", "la", "ma", "na", "pa", "sa", "ta", "an", "tu", "bu", "li",
+             "gu", "ra", "ya", "lo", "mi", "si", "ca", "ba"]
+PROJECT_KINDS = [
+    "Free Wi-Fi Site", "School Connectivity", "Health Center Upgrade", "Farm-to-Market Road",
+    "Water System", "Bridge Repair", "Solar Street Lights", "Evacuation Center",
+    "Rural Health Unit", "Barangay Hall", "Public Market", "Flood Control",
+]
+TAG_NAMES = [
+    "priority", "funded", "phase-1", "phase-2", "phase-3", "rural", "urban", "audit",
+    "lgu-partner", "dict", "deped", "doh", "typhoon-damage", "pilot", "delayed",
+    "inspection", "procurement", "renewal", "geotagged", "coastal",
+]
+TAG_COLORS = ["#3498db", "#e74c3c", "#2ecc71", "#f1c40f", "#9b59b6", "#1abc9c"]
+
+# Lifecycle transitions: status -> {next status: weight}
+TRANSITIONS = {
+    ProjectStatus.PLANNING: {ProjectStatus.IN_PROGRESS: 80, ProjectStatus.PENDING: 10,
+                             ProjectStatus.ON_HOLD: 5, ProjectStatus.CANCELLED: 5},
+    ProjectStatus.PENDING: {ProjectStatus.IN_PROGRESS: 70, ProjectStatus.ON_HOLD: 20,
+                            ProjectStatus.CANCELLED: 10},
+    ProjectStatus.IN_PROGRESS: {ProjectStatus.DONE: 65, ProjectStatus.ON_HOLD: 20,
+                                ProjectStatus.PENDING: 15},
+    ProjectStatus.ON_HOLD: {ProjectStatus.IN_PROGRESS: 80, ProjectStatus.CANCELLED: 20},
+}
+# Mean days spent in a status before the next transition
+MEAN_DWELL_DAYS = 75
+
+COMMENT_PHRASES = [
+    "Site survey completed.", "Waiting for materials.", "Contractor mobilized.",
+    "Power supply confirmed with the cooperative.", "LGU requested schedule update.",
+    "Photos uploaded for inspection.", "Delayed by weather.", "Signal test passed.",
+    "Please review the revised budget.", "Turnover documents submitted.",
+]
+
+
+class Weighted:
+    """Fast repeated weighted choice over a fixed population"""
+
+    def __init__(self, items: list, weights: List[float]):
+        self.items = items
+        self.cumulative = list(accumulate(weights))
+        self.total = self.cumulative[-1]
+
+    def pick(self, rng: random.Random):
+        return self.items[bisect(self.cumulative, rng.random() * self.total)]
+
+
+def zipf_weights(count: int, exponent: float = 1.1) -> List[float]:
+    return [1 / (rank ** exponent) for rank in range(1, count + 1)]
+
+
+def _place_name(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+
+
+class Geography:
+    """Province -> municipality -> barangay tree with skewed sizes"""
+
+    def __init__(self, rng: random.Random):
+        provinces = list(PROVINCES)
+        rng.shuffle(provinces)
+        places = []
+        weights = []
+        for province_rank, province in enumerate(provinces, start=1):
+            lat, lng = PROVINCES[province]
+            municipalities = rng.randint(8, 35)
+            for municipality_rank in range(1, municipalities + 1):
+                municipality = _place_name(rng)
+                district = f"District {['I', 'II', 'III', 'IV'][municipality_rank % 4]}"
+                m_lat, m_lng = rng.gauss(lat, 0.25), rng.gauss(lng, 0.25)
+                barangays = rng.sample(BARANGAYS, rng.randint(6, len(BARANGAYS)))
+                for barangay_rank, barangay in enumerate(barangays, start=1):
+                    places.append((
+                        province, municipality, barangay, district,
+                        rng.gauss(m_lat, 0.03), rng.gauss(m_lng, 0.03),
+                    ))
+                    weights.append(
+                        province_rank ** -1.1 * municipality_rank ** -1.0 * barangay_rank ** -0.8
+                    )
+        self.places = Weighted(places, weights)
+
+
+def _storage_value(value):
+    """Column value as MySQL LOAD DATA expects it"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, enum.Enum):
+        # SQLAlchemy Enum columns store member names
+        return value.name
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+
+class Loader:
+    """Bulk-loads generated rows table by table"""
+
+    def __init__(self, conn: AsyncConnection, chunk_size: int, load_data: bool):
+        self.conn = conn
+        self.chunk_size = chunk_size
+        self.load_data = load_data
+        self.rows_loaded: Dict[str, int] = {}
+
+    async def load(self, model, rows: List[dict]) -> None:
+        if not rows:
+            return
+        table = model.__table__
+        if self.load_data:
+            await self._load_data(table, rows)
+        else:
+            for start in range(0, len(rows), self.chunk_size):
+                await self.conn.execute(insert(table), rows[start:start + self.chunk_size])
+        self.rows_loaded[table.name] = self.rows_loaded.get(table.name, 0) + len(rows)
+
+    async def _load_data(self, table, rows: List[dict]) -> None:
+        columns = list(rows[0])
+        fd, path = tempfile.mkstemp(suffix=".tsv")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                for row in rows:
+                    f.write("\t".join(_storage_value(row[column]) for column in columns))
+                    f.write("\n")
+            await self.conn.exec_driver_sql(
+                f"LOAD DATA LOCAL INFILE '{path}' INTO TABLE {table.name} "
+                f"CHARACTER SET utf8mb4 FIELDS TERMINATED BY '\\t' "
+                f"LINES TERMINATED BY '\\n' ({', '.join(columns)})"
+            )
+        finally:
+            os.unlink(path)
+
+
+class DatasetGenerator:
+    """Generates users, tags and projects with their dependent rows"""
+
+    def __init__(self, args, rng: random.Random, start_ids: Dict[str, int]):
+        self.args = args
+        self.rng = rng
+        self.next_ids = dict(start_ids)
+        self.now = datetime.utcnow().replace(microsecond=0)
+        self.geography = Geography(rng)
+        self.user_ids: List[int] = []
+        self.users: Weighted = None
+        self.editors: Weighted = None
+        self.tags: Weighted = None
+
+    def _id(self, table: str) -> int:
+        self.next_ids[table] += 1
+        return self.next_ids[table]
+
+    # ---------- reference data ----------
+
+    def users_rows(self, count: int, existing: List[tuple]) -> List[dict]:
+        rng = self.rng
+        password_hash = get_password_hash(DEFAULT_PASSWORD)
+        rows = []
+        roles = Weighted([UserRole.ADMIN, UserRole.EDITOR, UserRole.VIEWER], [3, 27, 70])
+        for _ in range(count):
+            user_id = self._id("users")
+            rows.append({
+                "id": user_id,
+                "username": f"user{user_id:07d}",
+                "email": f"user{user_id:07d}@example.com",
+                "password_hash": password_hash,
+                "full_name": f"{_place_name(rng)} {_place_name(rng)}",
+                "role": roles.pick(rng),
+                "is_active": rng.random() > 0.02,
+                "is_verified": True,
+                "unread_notifications": 0,
+                "created_at": self.now - timedelta(days=rng.randint(0, 365 * self.args.years)),
+            })
+
+        everyone = existing + [(row["id"], row["role"]) for row in rows]
+        self.user_ids = [user_id for user_id, _ in everyone]
+        # A small core of very active users does most of the work
+        order = list(everyone)
+        rng.shuffle(order)
+        self.users = Weighted([user_id for user_id, _ in order], zipf_weights(len(order), 0.9))
+        editors = [user_id for user_id, role in order if role != UserRole.VIEWER] or self.user_ids
+        self.editors = Weighted(editors, zipf_weights(len(editors), 0.9))
+        return rows
+
+    def tag_rows(self, existing: Dict[str, int]) -> List[dict]:
+        rows = []
+        for name in TAG_NAMES:
+            if name not in existing:
+                tag_id = self._id("tags")
+                existing[name] = tag_id
+                rows.append({
+                    "id": tag_id,
+                    "name": name,
+                    "color": self.rng.choice(TAG_COLORS),
+                    "created_by": self.editors.pick(self.rng),
+                    "created_at": self.now - timedelta(days=365 * self.args.years),
+                })
+        ids = [existing[name] for name in TAG_NAMES]
+        self.tags = Weighted(ids, zipf_weights(len(ids), 1.2))
+        return rows
+
+    # ---------- projects ----------
+
+    def project_chunk(self, count: int) -> Dict[type, List[dict]]:
+        """One chunk of projects and everything that hangs off them"""
+        rng = self.rng
+        out = {model: [] for model in (
+            Project, ProjectHistory, ProjectTag, Comment, Notification, ActivityLog,
+        )}
+        span_days = 365 * self.args.years
+
+        for _ in range(count):
+            project_id = self._id("projects")
+            province, municipality, barangay, district, lat, lng = self.geography.places.pick(rng)
+            # Growth: recent years hold more projects than early ones
+            age_days = span_days * (rng.random() ** 1.5)
+            activated_at = self.now - timedelta(days=age_days)
+            created_at = activated_at - timedelta(days=rng.randint(1, 60))
+            creator = self.editors.pick(rng)
+            assignee = self.editors.pick(rng) if rng.random() < 0.6 else None
+
+            status, history = self._lifecycle(project_id, created_at, creator, assignee, out)
+            completion = history[-1]["created_at"].date() if status == ProjectStatus.DONE else None
+            if status == ProjectStatus.DONE:
+                progress = 100
+            elif status == ProjectStatus.PLANNING:
+                progress = 0
+            else:
+                progress = rng.randint(5, 95)
+
+            kind = rng.choice(PROJECT_KINDS)
+            out[Project].append({
+                "id": project_id,
+                "site_code": f"SYN-{project_id:08d}",
+                "project_name": f"{kind} - {barangay}, {municipality}",
+                "site_name": f"{barangay} {kind.split()[0]} Site",
+                "barangay": barangay,
+                "municipality": municipality,
+                "province": province,
+                "district": district,
+                "latitude": round(rng.gauss(lat, 0.004), 6),
+                "longitude": round(rng.gauss(lng, 0.004), 6),
+                "activation_date": activated_at.date(),
+                "completion_date": completion,
+                "status": status,
+                "notes": None,
+                "progress": progress,
+                "created_by": creator,
+                "assigned_to": assignee,
+                "created_at": created_at,
+                "updated_at": history[-1]["created_at"],
+            })
+
+            for tag_id in {self.tags.pick(rng) for _ in range(int(rng.expovariate(0.8)))}:
+                out[ProjectTag].append(
+                    {"project_id": project_id, "tag_id": tag_id, "created_at": created_at}
+                )
+
+            self._comments(project_id, created_at, creator, out)
+
+        return out
+
+    def _lifecycle(self, project_id, created_at, creator, assignee, out):
+        """Walk status transitions from creation up to now"""
+        rng = self.rng
+        status = ProjectStatus.PLANNING
+        history = [{
+            "id": self._id("project_history"),
+            "project_id": project_id,
+            "old_status": None,
+            "new_status": status.value,
+            "old_assigned_to": None,
+            "new_assigned_to": assignee,
+            "changed_fields": None,
+            "changed_by": creator,
+            "change_reason": "Project created",
+            "created_at": created_at,
+        }]
+        self._activity(creator, "create_project", "projects", project_id, created_at, out)
+
+        moment = created_at
+        while status in TRANSITIONS:
+            moment += timedelta(days=rng.expovariate(1 / MEAN_DWELL_DAYS))
+            if moment >= self.now:
+                break
+            weights = TRANSITIONS[status]
+            new_status = rng.choices(list(weights), weights=list(weights.values()))[0]
+            actor = assignee or self.editors.pick(rng)
+            history.append({
+                "id": self._id("project_history"),
+                "project_id": project_id,
+                "old_status": status.value,
+                "new_status": new_status.value,
+                "old_assigned_to": assignee,
+                "new_assigned_to": assignee,
+                "changed_fields": {"status": {"old": status.value, "new": new_status.value}},
+                "changed_by": actor,
+                "change_reason": None,
+                "created_at": moment,
+            })
+            self._activity(actor, "update_project", "projects", project_id, moment, out)
+            if assignee and assignee != actor:
+                self._notify(
+                    assignee,
+                    NotificationType.PROJECT_COMPLETED if new_status == ProjectStatus.DONE
+                    else NotificationType.PROJECT_STATUS_CHANGED,
+                    "Project status changed",
+                    f"Status changed from {status.value} to {new_status.value}",
+                    project_id, moment, out,
+                )
+            status = new_status
+
+        out[ProjectHistory].extend(history)
+        return status, history
+
+    def _comments(self, project_id, created_at, creator, out):
+        rng = self.rng
+        count = int(rng.expovariate(1 / self.args.comments_per_project) + 0.5) \
+            if self.args.comments_per_project > 0 else 0
+        if not count:
+            return
+        window = max(1.0, (self.now - created_at).total_seconds())
+        moments = sorted(created_at + timedelta(seconds=rng.random() * window) for _ in range(count))
+        comment_ids = []
+        for moment in moments:
+            comment_id = self._id("comments")
+            author = self.users.pick(rng)
+            parent = rng.choice(comment_ids) if comment_ids and rng.random() < 0.25 else None
+            out[Comment].append({
+                "id": comment_id,
+                "project_id": project_id,
+                "user_id": author,
+                "content": rng.choice(COMMENT_PHRASES),
+                "parent_id": parent,
+                "mentions": None,
+                "is_edited": rng.random() < 0.05,
+                "created_at": moment,
+                "updated_at": moment,
+            })
+            comment_ids.append(comment_id)
+            self._activity(author, "create_comment", "comments", comment_id, moment, out)
+            if author != creator:
+                self._notify(
+                    creator, NotificationType.COMMENT_ADDED, "New comment",
+                    "A comment was added to your project", project_id, moment, out,
+                )
+
+    def _notify(self, user_id, kind, title, message, project_id, moment, out):
+        # Old notifications have almost all been read
+        is_read = self.rng.random() < (0.97 if (self.now - moment).days > 30 else 0.4)
+        out[Notification].append({
+            "id": self._id("notifications"),
+            "user_id": user_id,
+            "type": kind,
+            "title": title,
+            "message": message,
+            "data": {"project_id": project_id},
+            "is_read": is_read,
+            "read_at": moment + timedelta(hours=self.rng.randint(1, 72)) if is_read else None,
+            "created_at": moment,
+        })
+
+    def _activity(self, user_id, action, entity_type, entity_id, moment, out):
+        if not self.args.activity:
+            return
+        out[ActivityLog].append({
+            "id": self._id("activity_log"),
+            "user_id": user_id,
+            "action": action,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "details": {"status_code": 200},
+            "ip_address": f"10.{self.rng.randint(0, 255)}.{self.rng.randint(0, 255)}.{self.rng.randint(1, 254)}",
+            "user_agent": None,
+            "created_at": moment,
+        })
+
+
+async def _max_ids(conn: AsyncConnection) -> Dict[str, int]:
+    ids = {}
+    for model in (User, Tag, Project, ProjectHistory, Comment, Notification, ActivityLog):
+        result = await conn.execute(select(func.max(model.id)))
+        ids[model.__tablename__] = result.scalar() or 0
+    return ids
+
+
+async def generate(args) -> None:
+    url = args.database_url or settings.DATABASE_URL
+    is_mysql = url.startswith("mysql")
+    if args.load_data and not is_mysql:
+        raise SystemExit("--load-data requires a MySQL database")
+
+    engine = create_async_engine(
+        url, connect_args={"local_infile": True} if args.load_data else {}
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+
+    async with engine.connect() as conn:
+        if is_mysql:
+            # Keys are generated consistently; skip per-row checks while loading
+            await conn.exec_driver_sql("SET foreign_key_checks = 0, unique_checks = 0")
+        elif url.startswith("sqlite"):
+            await conn.exec_driver_sql("PRAGMA synchronous = OFF")
+
+        loader = Loader(conn, args.chunk_size, args.load_data)
+        generator = DatasetGenerator(args, rng, await _max_ids(conn))
+
+        existing_users = (await conn.execute(select(User.id, User.role))).all()
+        await loader.load(User, generator.users_rows(args.users, [tuple(u) for u in existing_users]))
+        existing_tags = dict((await conn.execute(select(Tag.name, Tag.id))).all())
+        await loader.load(Tag, generator.tag_rows(existing_tags))
+        await conn.commit()
+
+        done = 0
+        while done < args.projects:
+            count = min(args.batch_projects, args.projects - done)
+            chunk = generator.project_chunk(count)
+            for model, rows in chunk.items():
+                await loader.load(model, rows)
+            await conn.commit()
+            done += count
+            elapsed = time.perf_counter() - started
+            logger.info(f"{done}/{args.projects} projects ({done / elapsed:.0f}/s)")
+
+        # Denormalized unread counters (see app.services.notifications)
+        unread = (
+            select(func.count())
+            .where(Notification.user_id == User.id, Notification.is_read == False)
+            .scalar_subquery()
+        )
+        await conn.execute(update(User).values(unread_notifications=unread))
+        if is_mysql:
+            await conn.exec_driver_sql("SET foreign_key_checks = 1, unique_checks = 1")
+        await conn.commit()
+
+    await engine.dispose()
+
+    elapsed = time.perf_counter() - started
+    for table, rows in loader.rows_loaded.items():
+        logger.info(f"{table}: {rows} rows")
+    total = sum(loader.rows_loaded.values())
+    logger.info(f"Loaded {total} rows in {elapsed:.1f}s ({total / elapsed:.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", help="defaults to DATABASE_URL")
+    parser.add_argument("--projects", type=int, default=100000)
+    parser.add_argument("--users", type=int, default=500, help="users to add")
+    parser.add_argument("--years", type=int, default=4, help="span of activation dates")
+    parser.add_argument("--comments-per-project", type=float, default=1.0)
+    parser.add_argument("--no-activity", dest="activity", action="store_false",
+                        help="skip activity_log rows")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--batch-projects", type=int, default=10000,
+                        help="projects generated and committed per transaction")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="rows per INSERT")
+    parser.add_argument("--load-data", action="store_true",
+                        help="MySQL: bulk-load through LOAD DATA LOCAL INFILE")
+    asyncio.run(generate(parser.parse_args()))
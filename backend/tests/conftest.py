@@ -0,0 +1,110 @@
+"""
+Shared fixtures: the API runs in-process against a temporary SQLite database
+"""
+
+import asyncio
+import itertools
+import os
+import tempfile
+from datetime import date
+
+# Settings are read at import time, so configure them before importing app
+_workdir = tempfile.mkdtemp(prefix="atlas-tests-")
+os.makedirs(os.path.join(_workdir, "uploads"))
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_workdir}/test.db"
+os.environ["UPLOAD_DIR"] = os.path.join(_workdir, "uploads")
+os.environ["WARMUP_ENABLED"] = "false"
+# Requests over their query budget fail instead of logging a warning
+os.environ["SQL_PROFILER_STRICT"] = "true"
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+import pytest_asyncio  # noqa: E402
+
+from app.core.security import create_access_token  # noqa: E402
+from app.db.session import AsyncSessionLocal  # noqa: E402
+# app.main mounts ./uploads relative to the working directory
+_cwd = os.getcwd()
+os.chdir(_workdir)
+from app.main import app  # noqa: E402
+
+os.chdir(_cwd)
+from app.models.models import Project, ProjectStatus, User, UserRole  # noqa: E402
+
+_ids = itertools.count(1)
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def started_app():
+    await app.router.startup()
+    yield app
+    await app.router.shutdown()
+
+
+@pytest_asyncio.fixture
+async def client(started_app):
+    transport = httpx.ASGITransport(app=started_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest.fixture
+def make_user(started_app):
+    async def factory(role: UserRole = UserRole.ADMIN, is_active: bool = True) -> User:
+        n = next(_ids)
+        async with AsyncSessionLocal() as db:
+            user = User(
+                username=f"user{n}",
+                email=f"user{n}@example.com",
+                password_hash="not-a-bcrypt-hash",
+                full_name=f"User {n}",
+                role=role,
+                is_active=is_active,
+            )
+            db.add(user)
+            await db.commit()
+            return user
+
+    return factory
+
+
+@pytest.fixture
+def make_project(started_app):
+    async def factory(creator: User, **values) -> Project:
+        n = next(_ids)
+        async with AsyncSessionLocal() as db:
+            project = Project(
+                site_code=f"SITE-{n}",
+                project_name=f"Project {n}",
+                site_name=f"Site {n}",
+                barangay="Centro",
+                municipality="Tuguegarao",
+                province="Cagayan",
+                latitude=17.6,
+                longitude=121.7,
+                activation_date=date(2024, 1, 1),
+                status=ProjectStatus.PLANNING,
+                created_by=creator.id,
+                **values,
+            )
+            db.add(project)
+            await db.commit()
+            return project
+
+    return factory
+
+
+@pytest.fixture
+def auth_headers():
+    def headers(user: User) -> dict:
+        token = create_access_token({"sub": str(user.id)})
+        return {"Authorization": f"Bearer {token}"}
+
+    return headers
@@ -0,0 +1,85 @@
+"""
+Activity rows captured by ActivityLogMiddleware
+"""
+
+import asyncio
+import ipaddress
+
+import pytest
+from sqlalchemy import select
+
+from app.core.middleware import _client_ip
+from app.db.session import AsyncSessionLocal
+from app.models.models import ActivityLog
+
+
+async def _activity(user_id: int, expected: int, timeout: float = 5.0) -> list:
+    """Rows of one user, once the recorder has flushed them"""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(
+                select(ActivityLog).where(ActivityLog.user_id == user_id)
+            )).scalars().all()
+        if len(rows) >= expected or asyncio.get_running_loop().time() > deadline:
+            return rows
+        await asyncio.sleep(0.1)
+
+
+async def test_bulk_action_records_one_row_per_project(
+    client, make_user, make_project, auth_headers
+):
+    admin = await make_user()
+    projects = [await make_project(admin) for _ in range(3)]
+
+    response = await client.post(
+        "/api/v1/projects/bulk",
+        json={
+            "project_ids": [p.id for p in projects] + [10**9],
+            "action": "update_status",
+            "data": {"status": "done"},
+        },
+        headers=auth_headers(admin),
+    )
+    assert response.status_code == 200
+
+    rows = await _activity(admin.id, expected=3)
+    assert sorted(row.entity_id for row in rows) == [p.id for p in projects]
+    assert {row.entity_type for row in rows} == {"project"}
+    assert all(row.details["bulk_action"] == "update_status" for row in rows)
+
+
+async def test_bulk_action_without_matches_records_nothing(client, make_user, auth_headers):
+    admin = await make_user()
+
+    response = await client.post(
+        "/api/v1/projects/bulk",
+        json={"project_ids": [10**9], "action": "delete"},
+        headers=auth_headers(admin),
+    )
+    assert response.status_code == 200
+
+    assert await _activity(admin.id, expected=1, timeout=1.5) == []
+
+
+def _scope(peer: str, forwarded: str = None) -> dict:
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return {"client": (peer, 50000), "headers": headers}
+
+
+TRUSTED = (ipaddress.ip_network("10.0.0.0/8"),)
+
+
+@pytest.mark.parametrize(
+    "peer, forwarded, expected",
+    [
+        # Forged header straight from a client is ignored
+        ("203.0.113.7", "198.51.100.1", "203.0.113.7"),
+        ("10.0.0.2", "198.51.100.1", "198.51.100.1"),
+        # A client-supplied hop left of the real one is skipped
+        ("10.0.0.2", "192.0.2.9, 198.51.100.1, 10.0.0.3", "198.51.100.1"),
+        ("10.0.0.2", None, "10.0.0.2"),
+    ],
+)
+def test_client_ip_trusts_forwarded_for_only_from_proxies(peer, forwarded, expected):
+    assert _client_ip(_scope(peer, forwarded), TRUSTED) == expected
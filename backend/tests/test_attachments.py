@@ -0,0 +1,73 @@
+"""
+Attachment uploads
+"""
+
+import os
+
+from app.core.config import get_settings
+from app.core.middleware import RequestSizeLimitMiddleware
+
+settings = get_settings()
+
+
+async def test_upload_is_stored_with_checksum(client, make_user, make_project, auth_headers):
+    admin = await make_user()
+    project = await make_project(admin)
+
+    response = await client.post(
+        "/api/v1/attachments/upload",
+        data={"project_id": str(project.id)},
+        files={"file": ("sites.csv", b"site_code\nSITE-1\n", "text/csv")},
+        headers=auth_headers(admin),
+    )
+
+    assert response.status_code == 201
+    attachment = response.json()
+    assert attachment["file_size"] == 17
+    assert os.path.exists(attachment["file_path"])
+
+
+async def test_oversized_upload_refused_from_content_length(
+    client, make_user, make_project, auth_headers
+):
+    admin = await make_user()
+    project = await make_project(admin)
+    body = b"x" * (settings.MAX_FILE_SIZE + settings.UPLOAD_FORM_OVERHEAD + 1)
+
+    response = await client.post(
+        "/api/v1/attachments/upload",
+        data={"project_id": str(project.id)},
+        files={"file": ("big.csv", body, "text/csv")},
+        headers=auth_headers(admin),
+    )
+
+    assert response.status_code == 413
+    upload_dir = os.path.join(settings.UPLOAD_DIR, "projects", str(project.id))
+    assert not os.path.exists(upload_dir)
+
+
+async def _call(middleware, headers):
+    messages = []
+
+    async def receive():
+        raise AssertionError("body read")
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "POST", "path": "/upload", "headers": headers}
+    await middleware(scope, receive, send)
+    return messages[0]["status"]
+
+
+async def test_size_limit_never_reads_refused_bodies():
+    async def endpoint(scope, receive, send):
+        await send({"type": "http.response.start", "status": 201, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    middleware = RequestSizeLimitMiddleware(endpoint, limits={"/upload": 100})
+
+    assert await _call(middleware, [(b"content-length", b"101")]) == 413
+    # Chunked bodies have no declared size
+    assert await _call(middleware, [(b"transfer-encoding", b"chunked")]) == 411
+    assert await _call(middleware, [(b"content-length", b"100")]) == 201
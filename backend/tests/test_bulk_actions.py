@@ -0,0 +1,92 @@
+"""
+POST /api/v1/projects/bulk
+"""
+
+import os
+
+from sqlalchemy import func, select
+
+from app.core.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.models.models import Attachment, Comment, ProjectHistory, ProjectTag, Tag, UserRole
+
+settings = get_settings()
+
+
+async def _count(model, project_id: int) -> int:
+    async with AsyncSessionLocal() as db:
+        return (await db.execute(
+            select(func.count()).select_from(model).where(model.project_id == project_id)
+        )).scalar()
+
+
+async def test_delete_removes_children_and_files(client, make_user, make_project, auth_headers):
+    admin = await make_user()
+    project = await make_project(admin)
+    file_path = os.path.join(settings.UPLOAD_DIR, f"bulk-{project.id}.pdf")
+    with open(file_path, "wb") as f:
+        f.write(b"%PDF")
+
+    async with AsyncSessionLocal() as db:
+        tag = Tag(name=f"bulk-{project.id}", created_by=admin.id)
+        db.add(tag)
+        await db.flush()
+        db.add_all([
+            ProjectTag(project_id=project.id, tag_id=tag.id),
+            ProjectHistory(project_id=project.id, changed_by=admin.id, change_reason="test"),
+            Comment(project_id=project.id, user_id=admin.id, content="hello"),
+            Attachment(
+                project_id=project.id,
+                filename="a.pdf",
+                original_filename="a.pdf",
+                file_path=file_path,
+                file_size=4,
+                file_type="application/pdf",
+                uploaded_by=admin.id,
+            ),
+        ])
+        await db.commit()
+
+    response = await client.post(
+        "/api/v1/projects/bulk",
+        json={"project_ids": [project.id], "action": "delete"},
+        headers=auth_headers(admin),
+    )
+
+    assert response.status_code == 200
+    assert response.json()["success_count"] == 1
+    for model in (ProjectHistory, ProjectTag, Comment, Attachment):
+        assert await _count(model, project.id) == 0
+    assert not os.path.exists(file_path)
+
+
+async def test_assign_rejects_unknown_or_inactive_user(client, make_user, make_project, auth_headers):
+    admin = await make_user()
+    inactive = await make_user(role=UserRole.EDITOR, is_active=False)
+    project = await make_project(admin)
+
+    for assigned_to in (inactive.id, 10**9, "1"):
+        response = await client.post(
+            "/api/v1/projects/bulk",
+            json={
+                "project_ids": [project.id],
+                "action": "assign",
+                "data": {"assigned_to": assigned_to},
+            },
+            headers=auth_headers(admin),
+        )
+        assert response.status_code == 422
+    assert await _count(ProjectHistory, project.id) == 0
+
+
+async def test_add_tags_rejects_non_id_values(client, make_user, make_project, auth_headers):
+    admin = await make_user()
+    project = await make_project(admin)
+
+    for tag_ids in ("1,2", [1, "x"], [True]):
+        response = await client.post(
+            "/api/v1/projects/bulk",
+            json={"project_ids": [project.id], "action": "add_tags", "data": {"tag_ids": tag_ids}},
+            headers=auth_headers(admin),
+        )
+        assert response.status_code == 422
@@ -0,0 +1,72 @@
+"""
+POST /api/v1/comments
+"""
+
+import asyncio
+
+from sqlalchemy import select
+
+from app.db.session import AsyncSessionLocal
+from app.models.models import Notification, NotificationType, UserRole
+
+
+async def _notifications(user_id: int, timeout: float = 5.0) -> list:
+    """Notifications of one user, once the fan-out has flushed them"""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(
+                select(Notification).where(Notification.user_id == user_id)
+            )).scalars().all()
+        if rows or asyncio.get_running_loop().time() > deadline:
+            return rows
+        await asyncio.sleep(0.1)
+
+
+async def test_comment_with_mention(client, make_user, make_project, auth_headers):
+    author = await make_user(role=UserRole.EDITOR)
+    mentioned = await make_user(role=UserRole.VIEWER)
+    project = await make_project(author)
+
+    response = await client.post(
+        "/api/v1/comments",
+        json={"project_id": project.id, "content": f"@{mentioned.username} please check"},
+        headers=auth_headers(author),
+    )
+
+    assert response.status_code == 201
+    body = response.json()
+    assert body["mentions"] == [mentioned.id]
+    assert body["user"]["id"] == author.id
+    assert body["replies"] == []
+
+    notifications = await _notifications(mentioned.id)
+    assert [n.type for n in notifications] == [NotificationType.COMMENT_ADDED]
+    assert notifications[0].data["comment_id"] == body["id"]
+
+
+async def test_reply_appears_in_thread(client, make_user, make_project, auth_headers):
+    author = await make_user(role=UserRole.EDITOR)
+    project = await make_project(author)
+    headers = auth_headers(author)
+
+    parent = (await client.post(
+        "/api/v1/comments", json={"project_id": project.id, "content": "first"}, headers=headers
+    )).json()
+    reply = await client.post(
+        "/api/v1/comments",
+        json={"project_id": project.id, "content": "second", "parent_id": parent["id"]},
+        headers=headers,
+    )
+    assert reply.status_code == 201
+
+    response = await client.put(
+        f"/api/v1/comments/{parent['id']}", json={"content": "first, edited"}, headers=headers
+    )
+    assert response.status_code == 200
+    assert [r["id"] for r in response.json()["replies"]] == [reply.json()["id"]]
+
+    thread = await client.get(f"/api/v1/comments/project/{project.id}", headers=headers)
+    assert thread.status_code == 200
+    assert [c["id"] for c in thread.json()] == [parent["id"]]
+    assert thread.json()[0]["replies"][0]["user"]["id"] == author.id
@@ -0,0 +1,89 @@
+"""
+Live update WebSocket handler, driven through an in-memory socket
+"""
+
+import asyncio
+import json
+
+from fastapi import status
+
+from app.api.endpoints.live import project_updates
+from app.core.security import create_access_token
+from app.services.realtime import PROJECT_UPDATED, HubClient, project_hub
+
+
+class FakeWebSocket:
+    """Plays queued client frames and records what the server sends"""
+
+    def __init__(self, frames, send_delay: float = 0.0):
+        self.frames = asyncio.Queue()
+        for frame in frames:
+            self.frames.put_nowait(frame)
+        self.send_delay = send_delay
+        self.sent = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.closed_with = None
+
+    async def accept(self):
+        pass
+
+    async def receive(self):
+        return await self.frames.get()
+
+    async def send_text(self, message: str):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.send_delay)
+        self.in_flight -= 1
+        self.sent.append(json.loads(message))
+
+    async def close(self, code: int = 1000, reason: str = None):
+        self.closed_with = code
+        self.frames.put_nowait({"type": "websocket.disconnect", "code": code})
+
+
+def _text(message: dict) -> dict:
+    return {"type": "websocket.receive", "text": json.dumps(message)}
+
+
+async def test_binary_frame_closes_with_unsupported_data(started_app, make_user):
+    user = await make_user()
+    websocket = FakeWebSocket([{"type": "websocket.receive", "bytes": b"\x00\x01"}])
+
+    token = create_access_token({"sub": str(user.id)})
+    await asyncio.wait_for(project_updates(websocket, token), 5)
+
+    assert websocket.closed_with == status.WS_1003_UNSUPPORTED_DATA
+
+
+async def test_replies_and_deltas_share_one_writer(started_app, make_user):
+    user = await make_user()
+    websocket = FakeWebSocket([_text({"action": "subscribe"})], send_delay=0.001)
+    token = create_access_token({"sub": str(user.id)})
+    handler = asyncio.create_task(project_updates(websocket, token))
+
+    while not any(message["type"] == "subscribed" for message in websocket.sent):
+        await asyncio.sleep(0.001)
+    for project_id in range(1, 6):
+        project_hub.publish(PROJECT_UPDATED, {"id": project_id, "province": "Cagayan"})
+        websocket.frames.put_nowait(_text({"action": "bogus"}))
+    await asyncio.sleep(0.05)
+    websocket.frames.put_nowait({"type": "websocket.disconnect", "code": 1000})
+    await asyncio.wait_for(handler, 5)
+
+    types = [message["type"] for message in websocket.sent]
+    assert types.count(PROJECT_UPDATED) == 5
+    assert types.count("error") == 5
+    assert websocket.max_in_flight == 1
+
+
+async def test_stalled_send_drops_client():
+    websocket = FakeWebSocket([], send_delay=3600)
+    client = HubClient(websocket, max_pending=10, send_timeout=0.05)
+    client.offer(1, json.dumps({"type": PROJECT_UPDATED}))
+
+    await asyncio.wait_for(client.run_writer(), 5)
+
+    assert client.overflowed
+    assert websocket.closed_with == status.WS_1013_TRY_AGAIN_LATER
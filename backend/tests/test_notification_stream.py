@@ -0,0 +1,75 @@
+"""
+Notification stream authorization while it is open
+"""
+
+import asyncio
+from datetime import timedelta
+
+import pytest_asyncio
+from sqlalchemy import update
+
+from app.api.endpoints import notifications
+from app.core.principal_cache import principal_cache
+from app.core.security import create_access_token, decode_token
+from app.db.session import AsyncSessionLocal
+from app.models.models import User
+from app.services.token_revocation import revoke_token
+
+
+@pytest_asyncio.fixture
+async def open_stream(started_app, monkeypatch):
+    monkeypatch.setattr(notifications.settings, "NOTIFICATION_STREAM_HEARTBEAT", 0.05)
+    streams = []
+
+    async def factory(token: str):
+        stream = notifications._notification_events(token, decode_token(token), None)
+        streams.append(stream)
+        assert (await stream.__anext__()).startswith("retry:")
+        assert (await stream.__anext__()).startswith("event: unread_count")
+        return stream
+
+    yield factory
+    for stream in streams:
+        await stream.aclose()
+
+
+async def _events_until_closed(stream) -> list:
+    async def collect():
+        return [event async for event in stream]
+
+    return await asyncio.wait_for(collect(), 5)
+
+
+async def test_stream_ends_when_token_expires(make_user, open_stream):
+    user = await make_user()
+    token = create_access_token({"sub": str(user.id)}, timedelta(seconds=1))
+    stream = await open_stream(token)
+
+    events = await _events_until_closed(stream)
+    assert events[-1].startswith("event: unauthorized")
+
+
+async def test_stream_ends_when_token_revoked(make_user, open_stream):
+    user = await make_user()
+    token = create_access_token({"sub": str(user.id)})
+    stream = await open_stream(token)
+
+    async with AsyncSessionLocal() as db:
+        await revoke_token(db, decode_token(token))
+
+    events = await _events_until_closed(stream)
+    assert events[-1].startswith("event: unauthorized")
+
+
+async def test_stream_ends_when_user_deactivated(make_user, open_stream):
+    user = await make_user()
+    token = create_access_token({"sub": str(user.id)})
+    stream = await open_stream(token)
+
+    async with AsyncSessionLocal() as db:
+        await db.execute(update(User).where(User.id == user.id).values(is_active=False))
+        await db.commit()
+    await principal_cache.invalidate(user.id)
+
+    events = await _events_until_closed(stream)
+    assert events[-1].startswith("event: unauthorized")
@@ -0,0 +1,42 @@
+"""
+Admission control of the bcrypt pool
+"""
+
+import asyncio
+import threading
+
+from app.core.password_hashing import password_hasher
+
+
+async def test_saturated_pool_answers_503_with_retry_after(
+    client, make_user, monkeypatch
+):
+    user = await make_user()
+    monkeypatch.setattr(password_hasher, "max_pending", 1)
+
+    # Occupy the only admission slot with a hash that blocks until released
+    release = threading.Event()
+    busy = asyncio.create_task(password_hasher.run(release.wait, 5))
+    while password_hasher.pending < 1:
+        await asyncio.sleep(0.01)
+
+    try:
+        response = await client.post(
+            "/api/v1/auth/login",
+            json={"username_or_email": user.username, "password": "anything"},
+        )
+    finally:
+        release.set()
+        await busy
+
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+async def test_unauthorized_keeps_www_authenticate(client):
+    response = await client.get(
+        "/api/v1/auth/me", headers={"Authorization": "Bearer not-a-token"}
+    )
+
+    assert response.status_code == 401
+    assert response.headers["WWW-Authenticate"] == "Bearer"
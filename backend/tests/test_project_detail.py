@@ -0,0 +1,34 @@
+"""
+GET /api/v1/projects/{project_id}
+"""
+
+from app.db.session import AsyncSessionLocal
+from app.models.models import ProjectHistory
+
+
+async def test_detail_includes_latest_history(client, make_user, make_project, auth_headers):
+    admin = await make_user()
+    project = await make_project(admin)
+    async with AsyncSessionLocal() as db:
+        db.add_all(
+            ProjectHistory(project_id=project.id, changed_by=admin.id, change_reason=f"change {n}")
+            for n in range(25)
+        )
+        await db.commit()
+
+    response = await client.get(f"/api/v1/projects/{project.id}", headers=auth_headers(admin))
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["site_code"] == project.site_code
+    assert body["creator"]["id"] == admin.id
+    assert len(body["history"]) == 20
+    assert {item["changer"]["id"] for item in body["history"]} == {admin.id}
+
+
+async def test_detail_of_missing_project(client, make_user, auth_headers):
+    admin = await make_user()
+
+    response = await client.get("/api/v1/projects/999999999", headers=auth_headers(admin))
+
+    assert response.status_code == 404
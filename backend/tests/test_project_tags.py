@@ -0,0 +1,111 @@
+"""
+Project tags referencing deleted tags
+"""
+
+from sqlalchemy import delete, select
+
+from app.db.session import AsyncSessionLocal
+from app.models.models import ProjectTag, Tag
+
+
+async def _tag(user, name: str) -> Tag:
+    async with AsyncSessionLocal() as db:
+        tag = Tag(name=name, created_by=user.id)
+        db.add(tag)
+        await db.commit()
+        return tag
+
+
+async def _delete(tag: Tag) -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Tag).where(Tag.id == tag.id))
+        await db.commit()
+
+
+async def _linked_tag_ids(project_id: int) -> list:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(ProjectTag.tag_id).where(ProjectTag.project_id == project_id)
+        )
+        return result.scalars().all()
+
+
+async def test_create_skips_tag_deleted_by_another_worker(client, make_user, auth_headers):
+    admin = await make_user()
+    kept = await _tag(admin, "create-kept")
+    deleted = await _tag(admin, "create-deleted")
+    await _delete(deleted)
+
+    response = await client.post(
+        "/api/v1/projects",
+        json={
+            "site_code": "TAG-CREATE",
+            "project_name": "Tagged",
+            "site_name": "Tagged",
+            "barangay": "Centro",
+            "municipality": "Tuguegarao",
+            "province": "Cagayan",
+            "latitude": 17.6,
+            "longitude": 121.7,
+            "activation_date": "2024-01-01",
+            "tags": [kept.id, deleted.id],
+        },
+        headers=auth_headers(admin),
+    )
+
+    assert response.status_code == 201
+    assert [tag["id"] for tag in response.json()["tags"]] == [kept.id]
+    assert await _linked_tag_ids(response.json()["id"]) == [kept.id]
+
+
+async def test_update_skips_tag_deleted_by_another_worker(
+    client, make_user, make_project, auth_headers
+):
+    admin = await make_user()
+    project = await make_project(admin)
+    deleted = await _tag(admin, "update-deleted")
+    await _delete(deleted)
+
+    response = await client.put(
+        f"/api/v1/projects/{project.id}",
+        json={"tags": [deleted.id]},
+        headers=auth_headers(admin),
+    )
+
+    assert response.status_code == 200
+    assert response.json()["tags"] == []
+    assert await _linked_tag_ids(project.id) == []
+
+
+async def test_tag_projects_sees_created_and_deleted_tags(client, make_user, auth_headers):
+    admin = await make_user()
+    tag = await _tag(admin, "listed")
+
+    response = await client.get(f"/api/v1/tags/{tag.id}/projects", headers=auth_headers(admin))
+    assert response.status_code == 200
+    assert response.json() == []
+
+    await _delete(tag)
+    response = await client.get(f"/api/v1/tags/{tag.id}/projects", headers=auth_headers(admin))
+    assert response.status_code == 404
+
+
+async def test_bulk_add_tags_skips_deleted_tag(client, make_user, make_project, auth_headers):
+    admin = await make_user()
+    project = await make_project(admin)
+    kept = await _tag(admin, "bulk-kept")
+    deleted = await _tag(admin, "bulk-deleted")
+    await _delete(deleted)
+
+    response = await client.post(
+        "/api/v1/projects/bulk",
+        json={
+            "project_ids": [project.id],
+            "action": "add_tags",
+            "data": {"tag_ids": [kept.id, deleted.id, kept.id]},
+        },
+        headers=auth_headers(admin),
+    )
+
+    assert response.status_code == 200
+    assert await _linked_tag_ids(project.id) == [kept.id]
@@ -0,0 +1,51 @@
+"""
+Per-route SQL statement budgets (the suite runs with SQL_PROFILER_STRICT)
+"""
+
+import pytest
+
+from app.api.endpoints.analytics import get_dashboard_stats
+from app.core.principal_cache import principal_cache
+from app.core.sql_profiler import QueryBudgetExceeded
+from app.db.session import AsyncSessionLocal
+from app.models.models import ProjectHistory, ProjectStatus, ProjectTag, Tag
+
+
+async def test_hot_routes_stay_within_budget(client, make_user, make_project, auth_headers):
+    admin = await make_user()
+    editor = await make_user()
+    projects = [await make_project(admin, assigned_to=editor.id) for _ in range(5)]
+    async with AsyncSessionLocal() as db:
+        tag = Tag(name="budget", created_by=admin.id)
+        db.add(tag)
+        await db.flush()
+        for project in projects:
+            db.add(ProjectTag(project_id=project.id, tag_id=tag.id))
+            db.add_all(
+                ProjectHistory(
+                    project_id=project.id,
+                    changed_by=changer.id,
+                    new_status=ProjectStatus.IN_PROGRESS.value,
+                )
+                for changer in (admin, editor)
+            )
+        await db.commit()
+
+    for path in (
+        "/api/v1/projects",
+        "/api/v1/projects?status=planning&search=Project&sort_by=site_code",
+        f"/api/v1/projects/{projects[0].id}",
+        "/api/v1/analytics/dashboard",
+    ):
+        # Cold principal cache: the lookup counts against the budget too
+        await principal_cache.invalidate(admin.id)
+        response = await client.get(path, headers=auth_headers(admin))
+        assert response.status_code == 200, path
+
+
+async def test_over_budget_fails_in_strict_mode(client, make_user, auth_headers, monkeypatch):
+    admin = await make_user()
+    monkeypatch.setattr(get_dashboard_stats, "__query_budget__", 1)
+
+    with pytest.raises(QueryBudgetExceeded, match=r"/api/v1/analytics/dashboard .*\(budget 1\)"):
+        await client.get("/api/v1/analytics/dashboard", headers=auth_headers(admin))
@@ -0,0 +1,118 @@
+"""
+Read replica routing, with SQLite files standing in for the replicas
+"""
+
+import os
+
+import httpx
+import pytest_asyncio
+
+from app.db import replicas
+from app.db.replicas import READ_YOUR_WRITES_COOKIE, ReadYourWritesMiddleware, ReplicaRouter
+
+
+@pytest_asyncio.fixture
+async def make_router(tmp_path):
+    routers = []
+
+    def factory(count: int = 2, urls=None, **options) -> ReplicaRouter:
+        urls = urls or [f"sqlite+aiosqlite:///{tmp_path}/replica{i}.db" for i in range(count)]
+        router = ReplicaRouter(urls, **options)
+        routers.append(router)
+        return router
+
+    yield factory
+    for router in routers:
+        await router.dispose()
+
+
+async def test_round_robin_rotates_replicas(make_router):
+    router = make_router(3, selection="round_robin")
+    chosen = [router.choose() for _ in range(6)]
+    assert chosen == router.replicas * 2
+
+
+async def test_least_connections_prefers_idle_replica(make_router):
+    router = make_router(2)
+    busy, idle = router.replicas
+    busy.in_use = 3
+    assert {router.choose() for _ in range(4)} == {idle}
+
+
+async def test_lagging_and_unreachable_replicas_are_skipped(make_router):
+    router = make_router(2, max_lag=5.0)
+    lagging, healthy = router.replicas
+    lagging.lag = 30.0
+    assert router.eligible() == [healthy]
+    assert {router.choose() for _ in range(4)} == {healthy}
+
+    # A lag check that finds the replica caught up puts it back in rotation
+    await router.check_lag()
+    assert router.eligible() == [lagging, healthy]
+
+    async def unreachable():
+        raise ConnectionError("replica down")
+
+    healthy.measure_lag = unreachable
+    await router.check_lag()
+    assert not healthy.reachable
+    assert router.eligible() == [lagging]
+
+    lagging.lag = None  # replication stopped
+    assert router.choose() is None
+
+
+async def test_writer_reads_from_primary_within_window(make_router):
+    router = make_router(1, sticky_window=30.0)
+    router.note_write(7)
+    assert router.choose(7) is None
+    assert router.choose(8) is router.replicas[0]
+
+    router._recent_writers[7] = 0.0  # window over
+    assert router.choose(7) is router.replicas[0]
+
+
+async def test_stickiness_cookie_is_honoured_by_other_workers(make_router, monkeypatch):
+    cookie = make_router(1, sticky_window=30.0).note_write(7)
+    other_worker = make_router(1, sticky_window=30.0)
+
+    assert other_worker.choose(7, cookie) is None
+    # Only for the user it was issued to, and only while signed and unexpired
+    assert other_worker.choose(8, cookie) is not None
+    user, until, signature = cookie.split(":")
+    assert other_worker.choose(7, f"{user}:{int(until) + 60}:{signature}") is not None
+    assert other_worker.choose(7, "garbage") is not None
+    monkeypatch.setattr(replicas.time, "time", lambda: int(until) + 1)
+    assert other_worker.choose(7, cookie) is not None
+
+
+async def test_write_cookie_routes_next_read_to_primary(
+    started_app, make_router, make_user, auth_headers, monkeypatch
+):
+    user = await make_user()
+    # Two workers: one takes the write, the other serves the following reads
+    writer = make_router(1, sticky_window=30.0)
+    reader = make_router(urls=[os.environ["DATABASE_URL"]], sticky_window=30.0)
+    monkeypatch.setattr(replicas, "replica_router", reader)
+
+    transport = httpx.ASGITransport(app=ReadYourWritesMiddleware(started_app, writer))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/api/v1/tags", json={"name": "replicated"}, headers=auth_headers(user)
+        )
+        assert response.status_code == 201
+        cookie = response.cookies[READ_YOUR_WRITES_COOKIE]
+
+        response = await client.get(
+            "/api/v1/analytics/dashboard",
+            headers=auth_headers(user),
+            cookies={READ_YOUR_WRITES_COOKIE: cookie},
+        )
+        assert response.status_code == 200
+        assert reader.primary_reads == 1
+        assert reader.replicas[0].reads == 0
+
+        client.cookies.clear()
+        response = await client.get("/api/v1/analytics/dashboard", headers=auth_headers(user))
+        assert response.status_code == 200
+        assert reader.replicas[0].reads == 1
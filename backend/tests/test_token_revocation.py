@@ -0,0 +1,100 @@
+"""
+Revocation list refresh and rebuild
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+from app.core.security import create_access_token, decode_token
+from app.db.session import AsyncSessionLocal
+from app.models.models import RevokedToken
+from app.services.token_revocation import (
+    new_jti,
+    prune_revoked_tokens,
+    revocation_list,
+    revoke_token,
+)
+
+
+async def _insert_revocation(user_id: int, expires_at: datetime, id: int = None) -> str:
+    jti = new_jti()
+    async with AsyncSessionLocal() as db:
+        db.add(RevokedToken(id=id, jti=jti, user_id=user_id, expires_at=expires_at))
+        await db.commit()
+    return jti
+
+
+async def test_revoked_token_rejected_during_and_after_rebuild(
+    client, make_user, monkeypatch
+):
+    user = await make_user()
+    token = create_access_token({"sub": str(user.id)})
+    headers = {"Authorization": f"Bearer {token}"}
+    async with AsyncSessionLocal() as db:
+        await revoke_token(db, decode_token(token))
+    await revocation_list.refresh()
+    # Something for the prune to delete, so it rebuilds the filter
+    await _insert_revocation(user.id, datetime.utcnow() - timedelta(minutes=1))
+
+    # Hold the rebuild after it has started loading its new filter
+    loading, release = asyncio.Event(), asyncio.Event()
+    load = revocation_list._load
+
+    async def paused_load(db, bloom, after_id):
+        if after_id == 0:
+            loading.set()
+            await release.wait()
+        return await load(db, bloom, after_id)
+
+    monkeypatch.setattr(revocation_list, "_load", paused_load)
+    prune = asyncio.create_task(prune_revoked_tokens())
+    await asyncio.wait_for(loading.wait(), 5)
+
+    try:
+        during = await client.get("/api/v1/auth/me", headers=headers)
+    finally:
+        release.set()
+        assert await prune >= 1
+    after = await client.get("/api/v1/auth/me", headers=headers)
+
+    assert during.status_code == 401
+    assert after.status_code == 401
+
+
+async def test_refresh_reads_revocations_committed_out_of_id_order(client, make_user):
+    user = await make_user()
+    expires_at = datetime.utcnow() + timedelta(minutes=30)
+    await revocation_list.refresh()
+    high = revocation_list._last_id
+
+    await _insert_revocation(user.id, expires_at, id=high + 10)
+    await revocation_list.refresh()
+    # Allocated before high + 10 but committed after it was seen
+    late = await _insert_revocation(user.id, expires_at, id=high + 5)
+    await revocation_list.refresh()
+
+    async with AsyncSessionLocal() as db:
+        assert await revocation_list.is_revoked({"sub": str(user.id), "jti": late}, db)
+
+
+async def test_refresh_rebuilds_only_when_current_filter_is_full(client, make_user, monkeypatch):
+    user = await make_user()
+    expires_at = datetime.utcnow() + timedelta(minutes=30)
+    for _ in range(3):
+        await _insert_revocation(user.id, expires_at)
+    # Live revocations now exceed the configured capacity
+    monkeypatch.setattr(revocation_list, "capacity", 2)
+    await revocation_list.rebuild()
+    assert revocation_list._bloom.capacity >= 2 * revocation_list._bloom.count
+
+    rebuilds = []
+    rebuild = revocation_list.rebuild
+
+    async def counted_rebuild():
+        rebuilds.append(1)
+        await rebuild()
+
+    monkeypatch.setattr(revocation_list, "rebuild", counted_rebuild)
+    await revocation_list.refresh()
+    await revocation_list.refresh()
+    assert rebuilds == []
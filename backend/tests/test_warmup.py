@@ -0,0 +1,27 @@
+"""
+Worker warm-up steps
+"""
+
+from app.services.project_queries import project_list_queries
+from app.services.warmup import WARMUP_PROJECT_LISTS, WarmUp
+
+
+async def test_warmup_builds_hot_list_statements(make_user, make_project):
+    admin = await make_user()
+    await make_project(admin)
+
+    warmup = WarmUp(timeout=10, principals=10)
+    await warmup.run_steps()
+
+    assert {name: step["ok"] for name, step in warmup.steps.items()} == {
+        "pool": True,
+        "caches": True,
+        "queries": True,
+    }
+    assert warmup.steps["queries"]["statements"] == 2 * len(WARMUP_PROJECT_LISTS)
+
+    # The first real request for a warmed view reuses its statement
+    hits = project_list_queries.hits
+    filters, sort_by, sort_desc = WARMUP_PROJECT_LISTS[1]
+    project_list_queries.build(filters, sort_by, sort_desc, offset=20, limit=20)
+    assert project_list_queries.hits == hits + 1